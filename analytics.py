@@ -0,0 +1,385 @@
+"""
+Vectorized cost and progress analytics for the whole project portfolio.
+Loads projects, per-trade hours, sector wages and per-project totals of the
+time_entries log into columnar NumPy arrays and computes every metric with
+whole-array operations, so the cost per project is a few machine
+instructions rather than a Python loop iteration. The log's recorded_at
+timestamps give hours and wages per day and projected completion dates.
+
+Can read a columnar snapshot (see snapshot.py) instead of the live
+database, so reports do not compete with writes.
+
+Requires numpy (optional dependency, see requirements.txt).
+
+Usage:
+    python analytics.py [--db iscon.db | --snapshot DIR] [--top 10]
+"""
+
+import argparse
+import logging
+import os
+import sqlite3
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from migrations import TRADE_COLUMNS
+from models import DatabaseManager
+from snapshot import MANIFEST, Snapshot
+
+logger = logging.getLogger(__name__)
+
+# Per-trade estimate columns of projects, in TRADE_COLUMNS order
+ESTIMATE_COLUMNS = tuple(f"{trade.lower()}_manhours" for trade in TRADE_COLUMNS)
+
+# Columns of projects a Portfolio is built from
+PROJECT_COLUMNS = ('project_number', 'price', 'estimated_man_hours', 'current_manhours',
+                   'percentage_completion', 'wages_payable') + ESTIMATE_COLUMNS
+
+SECONDS_PER_DAY = 86400.0
+
+# julianday() of 1970-01-01T00:00:00Z, to turn SQLite julian days into Unix time
+UNIX_EPOCH_JULIAN_DAY = 2440587.5
+
+# Per project: hours and wages logged in time_entries and the Unix time of the
+# first entry. Opening balances (entries without an employee) carry the
+# migration time rather than when the work was done, so they are left out.
+LOGGED_ACTIVITY = f"""
+    SELECT project_number, SUM(hours), SUM(wages),
+           (MIN(julianday(recorded_at)) - {UNIX_EPOCH_JULIAN_DAY}) * {SECONDS_PER_DAY}
+    FROM time_entries
+    WHERE project_number IS NOT NULL AND employee_id IS NOT NULL
+    GROUP BY project_number
+"""
+
+class Portfolio:
+    """Columnar snapshot of every project, one array per column.
+    
+    Per-project arrays have shape (n,); per-trade arrays have shape
+    (n, len(TRADE_COLUMNS)). Missing values are NaN. Times are Unix
+    seconds; as_of is the moment the data was read.
+    """
+    
+    def __init__(self, project_number: np.ndarray, price: np.ndarray,
+                 estimated_man_hours: np.ndarray, current_manhours: np.ndarray,
+                 percentage_completion: np.ndarray, wages_payable: np.ndarray,
+                 trade_estimated: np.ndarray, trade_actual: np.ndarray,
+                 trade_wage: np.ndarray, logged_hours: np.ndarray,
+                 logged_wages: np.ndarray, first_logged_at: np.ndarray, as_of: float):
+        self.project_number = project_number
+        self.price = price
+        self.estimated_man_hours = estimated_man_hours
+        self.current_manhours = current_manhours
+        self.percentage_completion = percentage_completion
+        self.wages_payable = wages_payable
+        self.trade_estimated = trade_estimated
+        self.trade_actual = trade_actual
+        self.trade_wage = trade_wage
+        self.logged_hours = logged_hours
+        self.logged_wages = logged_wages
+        self.first_logged_at = first_logged_at
+        self.as_of = as_of
+    
+    def __len__(self) -> int:
+        return len(self.project_number)
+
+def _align(project_number: np.ndarray, keys: np.ndarray, rows: np.ndarray,
+           fill: float) -> np.ndarray:
+    """Place rows keyed by project number in the order of the sorted project_number.
+    
+    Projects without a row get fill; rows of unknown projects are dropped.
+    """
+    aligned = np.full((len(project_number),) + rows.shape[1:], fill)
+    if len(rows) and len(project_number):
+        index = np.searchsorted(project_number, keys)
+        index = np.minimum(index, len(project_number) - 1)
+        found = project_number[index] == keys
+        aligned[index[found]] = rows[found]
+    return aligned
+
+def _build_portfolio(projects: Dict[str, np.ndarray], hours_project: np.ndarray,
+                     hours: np.ndarray, wages: Dict[str, float], activity_project: np.ndarray,
+                     activity: np.ndarray, as_of: float) -> Portfolio:
+    """Assemble a Portfolio from project columns sorted by project number.
+    
+    hours holds the per-trade actual hours of the projects in hours_project,
+    in any order; wages maps lower-case sector names to their wage.
+    activity holds (logged hours, logged wages, first entry time) rows of
+    the projects in activity_project (see LOGGED_ACTIVITY).
+    """
+    project_number = projects['project_number'].astype(np.int64)
+    trade_actual = _align(project_number, hours_project, np.nan_to_num(hours), 0.0)
+    logged = _align(project_number, activity_project, activity.reshape(-1, 3), np.nan)
+    
+    trade_wage = np.array([wages.get(trade.lower(), np.nan) for trade in TRADE_COLUMNS],
+                          dtype=np.float64)
+    
+    return Portfolio(
+        project_number=project_number,
+        price=projects['price'],
+        estimated_man_hours=projects['estimated_man_hours'],
+        current_manhours=np.nan_to_num(projects['current_manhours']),
+        percentage_completion=projects['percentage_completion'],
+        wages_payable=np.nan_to_num(projects['wages_payable']),
+        trade_estimated=np.column_stack([projects[column] for column in ESTIMATE_COLUMNS]),
+        trade_actual=trade_actual,
+        trade_wage=trade_wage,
+        logged_hours=np.nan_to_num(logged[:, 0]),
+        logged_wages=np.nan_to_num(logged[:, 1]),
+        first_logged_at=logged[:, 2],
+        as_of=as_of,
+    )
+
+def load_portfolio(db_manager: DatabaseManager, as_of: Optional[float] = None) -> Optional[Portfolio]:
+    """Read projects, specific_man_hours, sector and time_entries into a Portfolio.
+    
+    Daily rates are measured up to as_of (Unix time), by default now.
+    """
+    as_of = time.time() if as_of is None else as_of
+    try:
+        with db_manager.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"""
+                SELECT {', '.join(PROJECT_COLUMNS)} FROM projects
+                WHERE project_number IS NOT NULL
+                ORDER BY project_number
+            """)
+            # NULLs become NaN in a float array
+            projects = np.array(cursor.fetchall(), dtype=np.float64).reshape(-1, len(PROJECT_COLUMNS))
+            
+            cursor.execute(f"""
+                SELECT project_number, {', '.join(TRADE_COLUMNS)} FROM specific_man_hours
+                WHERE project_number IS NOT NULL
+            """)
+            hours = np.array(cursor.fetchall(), dtype=np.float64).reshape(-1, len(TRADE_COLUMNS) + 1)
+            
+            cursor.execute("SELECT sector_name, sector_wage FROM sector ORDER BY sector_id")
+            wages: Dict[str, float] = {}
+            for name, wage in cursor.fetchall():
+                # First sector of each name wins, as in the specific_man_hours view
+                if name is not None:
+                    wages.setdefault(name.lower(), wage)
+            
+            cursor.execute(LOGGED_ACTIVITY)
+            activity = np.array(cursor.fetchall(), dtype=np.float64).reshape(-1, 4)
+    except sqlite3.Error as e:
+        logger.error("Failed to load portfolio: %s", e)
+        return None
+    
+    return _build_portfolio(dict(zip(PROJECT_COLUMNS, projects.T)), hours[:, 0], hours[:, 1:],
+                            wages, activity[:, 0], activity[:, 1:], as_of)
+
+def _logged_activity(snapshot: Snapshot) -> Tuple[np.ndarray, np.ndarray]:
+    """Group the snapshot's time_entries columns per project, as LOGGED_ACTIVITY does."""
+    empty = np.zeros(0), np.zeros((0, 3))
+    if 'time_entries' not in snapshot.tables:
+        # Exported before the snapshot carried the log
+        return empty
+    entries = snapshot.table('time_entries')
+    project = np.asarray(entries['project_number'], dtype=np.float64)
+    logged = ~np.isnan(project) & ~np.isnan(np.asarray(entries['employee_id'], dtype=np.float64))
+    if not logged.any():
+        # An empty recorded_at column is not stored as text
+        return empty
+    keys, inverse = np.unique(project[logged], return_inverse=True)
+    
+    # recorded_at is ISO 8601 UTC text; numpy parses it without the 'Z'
+    recorded = np.char.rstrip(np.asarray(entries['recorded_at'])[logged], 'Z')
+    recorded = recorded.astype('datetime64[ms]').astype(np.int64) / 1000.0
+    first = np.full(len(keys), np.inf)
+    np.minimum.at(first, inverse, recorded)
+    
+    activity = np.column_stack([
+        np.bincount(inverse, weights=np.asarray(entries['hours'], dtype=np.float64)[logged],
+                    minlength=len(keys)),
+        np.bincount(inverse, weights=np.asarray(entries['wages'], dtype=np.float64)[logged],
+                    minlength=len(keys)),
+        first,
+    ])
+    return keys, activity
+
+def _snapshot_time(snapshot: Snapshot) -> float:
+    """Unix time a snapshot was created, from its manifest."""
+    try:
+        return datetime.strptime(snapshot.manifest['created_at'], '%Y-%m-%dT%H:%M:%S%z').timestamp()
+    except (KeyError, ValueError):
+        return os.path.getmtime(os.path.join(snapshot.directory, MANIFEST))
+
+def load_portfolio_from_snapshot(snapshot: Snapshot, as_of: Optional[float] = None) -> Portfolio:
+    """Build a Portfolio from the memory-mapped columns of a snapshot (see snapshot.py).
+    
+    Float columns are used in place; only integer columns and the per-trade
+    matrices are copied into new arrays. Daily rates are measured up to
+    as_of, by default the time the snapshot was created.
+    """
+    projects = {name: np.asarray(snapshot.column('projects', name), dtype=np.float64)
+                for name in PROJECT_COLUMNS}
+    known = ~np.isnan(projects['project_number'])
+    if not known.all():
+        projects = {name: column[known] for name, column in projects.items()}
+    
+    hours_project = np.asarray(snapshot.column('specific_man_hours', 'project_number'), dtype=np.float64)
+    hours = np.zeros((len(hours_project), len(TRADE_COLUMNS)))
+    for i, trade in enumerate(TRADE_COLUMNS):
+        hours[:, i] = snapshot.column('specific_man_hours', trade)
+    
+    wages: Dict[str, float] = {}
+    # Rows are in sector_id order, so the first sector of each name wins as above
+    for name, wage in zip(snapshot.column('sector', 'sector_name').tolist(),
+                          snapshot.column('sector', 'sector_wage').tolist()):
+        if name:
+            wages.setdefault(name.lower(), wage)
+    
+    activity_project, activity = _logged_activity(snapshot)
+    as_of = _snapshot_time(snapshot) if as_of is None else as_of
+    return _build_portfolio(projects, hours_project, hours, wages, activity_project, activity, as_of)
+
+def compute_metrics(portfolio: Portfolio) -> Dict[str, np.ndarray]:
+    """Compute every per-project and per-trade metric in one vectorized pass.
+    
+    Ratios whose denominator is zero or missing are NaN. The "at
+    completion" figures extrapolate from percentage_completion; the daily
+    rates are measured over the days from the first logged time entry to
+    as_of, counted as at least one day. Per project:
+    
+    - manhour_variance: current_manhours - estimated_man_hours
+    - wage_overrun: wages_payable - price, positive when over budget
+    - budget_used: wages_payable / price
+    - cost_progress_ratio: budget_used / progress; 1.0 spends the price
+      exactly at completion, above 1.0 spends budget faster than work
+      gets done
+    - manhours_at_completion, cost_at_completion: current totals divided
+      by progress
+    - overrun_at_completion: cost_at_completion - price
+    - remaining_manhours: manhours_at_completion - current_manhours
+    - hours_per_day, burn_rate: logged hours and wages per day
+    - days_to_completion: remaining_manhours at hours_per_day
+    - projected_completion: Unix time as_of + days_to_completion
+    - hours_completion: current_manhours / estimated_man_hours, progress
+      implied by hours, to compare with percentage_completion
+    
+    Per project and trade, shaped (n, len(TRADE_COLUMNS)):
+    
+    - trade_variance: actual - estimated hours
+    - trade_ratio: actual / estimated hours
+    - trade_cost, trade_budget: actual and estimated hours at the trade wage
+    """
+    p = portfolio
+    with np.errstate(divide='ignore', invalid='ignore'):
+        progress = p.percentage_completion / 100.0
+        progress = np.where(progress > 0, progress, np.nan)
+        
+        budget_used = p.wages_payable / p.price
+        manhours_at_completion = p.current_manhours / progress
+        cost_at_completion = p.wages_payable / progress
+        
+        remaining_manhours = manhours_at_completion - p.current_manhours
+        
+        # NaN for projects without logged entries
+        days_logged = np.maximum((p.as_of - p.first_logged_at) / SECONDS_PER_DAY, 1.0)
+        hours_per_day = p.logged_hours / days_logged
+        days_to_completion = (np.maximum(remaining_manhours, 0)
+                              / np.where(hours_per_day > 0, hours_per_day, np.nan))
+        
+        trade_ratio = p.trade_actual / p.trade_estimated
+        trade_ratio[p.trade_estimated == 0] = np.nan
+        
+        return {
+            'manhour_variance': p.current_manhours - p.estimated_man_hours,
+            'wage_overrun': p.wages_payable - p.price,
+            'budget_used': np.where(p.price > 0, budget_used, np.nan),
+            'cost_progress_ratio': np.where(p.price > 0, budget_used / progress, np.nan),
+            'manhours_at_completion': manhours_at_completion,
+            'cost_at_completion': cost_at_completion,
+            'overrun_at_completion': cost_at_completion - p.price,
+            'remaining_manhours': remaining_manhours,
+            'hours_per_day': hours_per_day,
+            'burn_rate': p.logged_wages / days_logged,
+            'days_to_completion': days_to_completion,
+            'projected_completion': p.as_of + days_to_completion * SECONDS_PER_DAY,
+            'hours_completion': np.where(p.estimated_man_hours > 0,
+                                         p.current_manhours / p.estimated_man_hours, np.nan),
+            'trade_variance': p.trade_actual - p.trade_estimated,
+            'trade_ratio': trade_ratio,
+            'trade_cost': p.trade_actual * p.trade_wage,
+            'trade_budget': p.trade_estimated * p.trade_wage,
+        }
+
+def _iso_date(seconds: float) -> Optional[str]:
+    """Format a Unix time as a UTC date, or None if it is NaN."""
+    if not np.isfinite(seconds):
+        return None
+    return datetime.fromtimestamp(seconds, timezone.utc).date().isoformat()
+
+def summarize(portfolio: Portfolio, metrics: Dict[str, np.ndarray]) -> Dict:
+    """Aggregate the metrics into portfolio-wide figures."""
+    over_budget = np.nan_to_num(metrics['overrun_at_completion']) > 0
+    return {
+        'projects': len(portfolio),
+        'total_price': float(np.nansum(portfolio.price)),
+        'total_wages': float(np.nansum(portfolio.wages_payable)),
+        'total_manhours': float(np.nansum(portfolio.current_manhours)),
+        'over_budget_at_completion': int(np.count_nonzero(over_budget)),
+        'median_cost_progress_ratio': float(np.nanmedian(metrics['cost_progress_ratio']))
+            if np.any(~np.isnan(metrics['cost_progress_ratio'])) else None,
+        'hours_per_day': float(np.nansum(metrics['hours_per_day'])),
+        'burn_rate': float(np.nansum(metrics['burn_rate'])),
+        'last_projected_completion': _iso_date(np.nanmax(metrics['projected_completion']))
+            if np.any(~np.isnan(metrics['projected_completion'])) else None,
+        'trade_hours': dict(zip(TRADE_COLUMNS, np.nansum(portfolio.trade_actual, axis=0).tolist())),
+        'trade_variance': dict(zip(TRADE_COLUMNS,
+                                   np.nansum(metrics['trade_variance'], axis=0).tolist())),
+    }
+
+def top_overruns(portfolio: Portfolio, metrics: Dict[str, np.ndarray], count: int = 10) -> List[Dict]:
+    """Get the projects with the largest overrun at completion, largest first."""
+    overrun = np.nan_to_num(metrics['overrun_at_completion'], nan=-np.inf)
+    count = min(count, int(np.count_nonzero(overrun > 0)))
+    if count <= 0:
+        return []
+    # argpartition avoids sorting the whole portfolio for a short list
+    top = np.argpartition(-overrun, count - 1)[:count]
+    top = top[np.argsort(-overrun[top])]
+    return [
+        {
+            'project_number': int(portfolio.project_number[i]),
+            'overrun_at_completion': float(overrun[i]),
+            'cost_progress_ratio': float(metrics['cost_progress_ratio'][i]),
+            'burn_rate': float(metrics['burn_rate'][i]),
+            'projected_completion': _iso_date(metrics['projected_completion'][i]),
+            'percentage_completion': float(portfolio.percentage_completion[i]),
+        }
+        for i in top
+    ]
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Portfolio cost and progress analytics.")
+    parser.add_argument('--db', default='iscon.db', help="database file (default: iscon.db)")
+    parser.add_argument('--snapshot', help="read this snapshot directory instead of the database")
+    parser.add_argument('--top', type=int, default=10, help="projects to list by overrun at completion")
+    args = parser.parse_args(argv)
+    
+    if args.snapshot:
+        portfolio = load_portfolio_from_snapshot(Snapshot(args.snapshot))
+    else:
+        db_manager = DatabaseManager(args.db)
+        try:
+            portfolio = load_portfolio(db_manager)
+        finally:
+            db_manager.close()
+    if portfolio is None:
+        return 1
+    
+    metrics = compute_metrics(portfolio)
+    for key, value in summarize(portfolio, metrics).items():
+        print(f"{key}: {value}")
+    for row in top_overruns(portfolio, metrics, args.top):
+        print(row)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
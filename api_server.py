@@ -0,0 +1,539 @@
+"""
+HTTP/JSON API over the models layer, for clients such as handheld scanners
+that cannot run the Tkinter application.
+Built on asyncio streams only: HTTP/1.1 with keep-alive and JSON bodies.
+Model calls run on a thread pool as large as the connection pool, and time
+entries go through a GroupCommitWriter, so entries posted concurrently are
+committed together in one transaction.
+
+Usage:
+    python api_server.py [--db iscon.db] [--host 127.0.0.1] [--port 8080]
+                         [--backup-dir backups] [--backup-interval 3600] [--backup-keep 7]
+
+Endpoints:
+    GET  /health
+    GET  /employees?after=&limit=           POST /employees
+    GET  /employees/search?q=&limit=
+    GET  /employees/{id_number}             PUT  /employees/{id_number}
+    GET  /sectors                           POST /sectors
+    GET  /sectors/{sector_id}               PUT  /sectors/{sector_id}
+    POST /projects
+    GET  /projects/{project_number}         PUT  /projects/{project_number}/percentage
+    GET  /projects/{project_number}/manhours
+    GET  /time-entries?employee_id=&project_number=&limit=
+    POST /time-entries                      {"employee_id", "project_number", "hours"}
+    POST /time-entries/bulk                 {"entries": [{...}, ...]}
+"""
+
+import argparse
+import asyncio
+import functools
+import json
+import logging
+import re
+import signal
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from logging_config import setup_logging, stop_logging
+from migrations import migrate
+from models import (
+    DatabaseManager, Employee, GroupCommitWriter, Project, Sector, TimeTracking,
+    validate_employee_data, validate_sector_data, validate_time_entry_data
+)
+
+logger = logging.getLogger(__name__)
+
+MAX_HEADER_BYTES = 16 * 1024
+MAX_BODY_BYTES = 4 * 1024 * 1024
+MAX_PAGE_SIZE = 1000
+MAX_BULK_ENTRIES = 10000
+
+PROJECT_FIELDS = (
+    'price', 'estimated_man_hours', 'project_number',
+    'welder_manhours', 'builder_manhours', 'painter_manhours',
+    'engineer_manhours', 'manager_manhours', 'fitter_manhours',
+)
+
+class HTTPError(Exception):
+    """An error answered with its status code and a JSON error message."""
+    
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+class Request:
+    """One parsed HTTP request."""
+    
+    def __init__(self, method: str, target: str, version: str,
+                 headers: Dict[str, str], body: bytes = b''):
+        url = urlsplit(target)
+        self.method = method
+        self.path = unquote(url.path)
+        self.query = {name: values[-1] for name, values in parse_qs(url.query).items()}
+        self.version = version
+        self.headers = headers
+        self.body = body
+    
+    @property
+    def keep_alive(self) -> bool:
+        """Whether the client wants the connection kept open after this request."""
+        connection = self.headers.get('connection', '').lower()
+        if self.version == 'HTTP/1.0':
+            return connection == 'keep-alive'
+        return connection != 'close'
+    
+    def json(self) -> Any:
+        """Decode the JSON body."""
+        if not self.body:
+            raise HTTPError(400, "Request body required")
+        try:
+            return json.loads(self.body)
+        except ValueError as e:
+            raise HTTPError(400, f"Invalid JSON body: {e}")
+    
+    def json_object(self) -> Dict:
+        """Decode a JSON body that must be an object."""
+        data = self.json()
+        if not isinstance(data, dict):
+            raise HTTPError(400, "Request body must be a JSON object")
+        return data
+    
+    def int_param(self, name: str, default: Optional[int] = None,
+                  maximum: Optional[int] = None) -> Optional[int]:
+        """Read an integer query parameter, capped at maximum."""
+        value = self.query.get(name)
+        if value is None:
+            return default
+        try:
+            number = int(value)
+        except ValueError:
+            raise HTTPError(400, f"Query parameter {name} must be an integer")
+        return min(number, maximum) if maximum is not None else number
+
+async def read_request(reader: asyncio.StreamReader) -> Optional[Request]:
+    """Read one request from a connection, or None once the client has closed it."""
+    try:
+        head = await reader.readuntil(b'\r\n\r\n')
+    except asyncio.IncompleteReadError as e:
+        if not e.partial.strip():
+            return None
+        raise HTTPError(400, "Incomplete request")
+    except asyncio.LimitOverrunError:
+        raise HTTPError(431, "Request headers too large")
+    
+    lines = head.decode('latin-1').split('\r\n')
+    parts = lines[0].split(' ')
+    if len(parts) != 3 or not parts[2].startswith('HTTP/1.'):
+        raise HTTPError(400, "Malformed request line")
+    method, target, version = parts
+    headers: Dict[str, str] = {}
+    for line in lines[1:]:
+        if not line:
+            continue
+        name, separator, value = line.partition(':')
+        if not separator:
+            raise HTTPError(400, "Malformed header")
+        headers[name.strip().lower()] = value.strip()
+    
+    if 'transfer-encoding' in headers:
+        raise HTTPError(411, "Chunked bodies are not supported; send Content-Length")
+    try:
+        length = int(headers.get('content-length', 0))
+    except ValueError:
+        raise HTTPError(400, "Invalid Content-Length")
+    if length < 0:
+        raise HTTPError(400, "Invalid Content-Length")
+    if length > MAX_BODY_BYTES:
+        raise HTTPError(413, "Request body too large")
+    body = await reader.readexactly(length) if length else b''
+    return Request(method, target, version, headers, body)
+
+def encode_response(status: int, payload: Any, keep_alive: bool = True) -> bytes:
+    """Serialize a JSON response, head and body."""
+    body = json.dumps(payload, separators=(',', ':'), default=str).encode()
+    head = (
+        f"HTTP/1.1 {status} {HTTPStatus(status).phrase}\r\n"
+        "Content-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+        "\r\n"
+    )
+    return head.encode('ascii') + body
+
+def _entry_tuple(data: Any) -> Tuple[int, int, int]:
+    """Validate one time entry object and return it as (employee_id, project_number, hours)."""
+    if not isinstance(data, dict):
+        raise HTTPError(400, "Time entry must be a JSON object")
+    is_valid, message = validate_time_entry_data(data)
+    if not is_valid:
+        raise HTTPError(400, message)
+    return int(data['employee_id']), int(data['project_number']), int(data['hours'])
+
+def _validated(validate: Callable[[Dict], Tuple[bool, str]], data: Dict) -> Dict:
+    """Run a models validation function, answering 400 on failure."""
+    try:
+        is_valid, message = validate(data)
+    except TypeError:
+        is_valid, message = False, "Invalid field types"
+    if not is_valid:
+        raise HTTPError(400, message)
+    return data
+
+class ApiServer:
+    """HTTP/1.1 JSON server exposing the models layer."""
+    
+    def __init__(self, db_manager: DatabaseManager, host: str = '127.0.0.1', port: int = 8080,
+                 commit_delay: float = 0.0, max_batch: int = 500,
+                 idle_timeout: float = 30.0, auto_completion: bool = False):
+        self.db = db_manager
+        self.host = host
+        self.port = port
+        self.idle_timeout = idle_timeout
+        self.employee = Employee(db_manager)
+        self.sector = Sector(db_manager)
+        self.project = Project(db_manager)
+        self.time_tracking = TimeTracking(db_manager, auto_completion=auto_completion)
+        # One thread per pooled connection, so no call waits on the pool
+        self.executor = ThreadPoolExecutor(max_workers=db_manager.pool.size,
+                                           thread_name_prefix='api-db')
+        self.writer = GroupCommitWriter(self.time_tracking, commit_delay, max_batch)
+        self.requests = 0
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._connections: Dict[asyncio.StreamWriter, asyncio.Task] = {}
+        self._closing = False
+        self.routes = [
+            ('GET', r'/health', self.health),
+            ('GET', r'/employees', self.list_employees),
+            ('POST', r'/employees', self.create_employee),
+            ('GET', r'/employees/search', self.search_employees),
+            ('GET', r'/employees/(\d+)', self.get_employee),
+            ('PUT', r'/employees/(\d+)', self.update_employee),
+            ('GET', r'/sectors', self.list_sectors),
+            ('POST', r'/sectors', self.create_sector),
+            ('GET', r'/sectors/(\d+)', self.get_sector),
+            ('PUT', r'/sectors/(\d+)', self.update_sector),
+            ('POST', r'/projects', self.create_project),
+            ('GET', r'/projects/(\d+)', self.get_project),
+            ('GET', r'/projects/(\d+)/manhours', self.get_project_manhours),
+            ('PUT', r'/projects/(\d+)/percentage', self.update_project_percentage),
+            ('GET', r'/time-entries', self.list_time_entries),
+            ('POST', r'/time-entries', self.record_time_entry),
+            ('POST', r'/time-entries/bulk', self.record_time_entries),
+        ]
+        self.routes = [(method, re.compile(pattern), handler) for method, pattern, handler in self.routes]
+    
+    async def start(self):
+        """Start listening; with port=0 the chosen port is stored in self.port.
+        
+        With auto_completion, percentage_completion is first recomputed from
+        the recorded hours, so the increments start from consistent values
+        rather than manual or stale ones.
+        """
+        if self.time_tracking.auto_completion and not await self.call(self.project.recompute_completion):
+            raise RuntimeError("Could not recompute project completion for auto-completion")
+        self._server = await asyncio.start_server(
+            self.handle_connection, self.host, self.port, limit=MAX_HEADER_BYTES
+        )
+        self.port = self._server.sockets[0].getsockname()[1]
+    
+    async def serve_forever(self):
+        """Serve until cancelled."""
+        await self._server.serve_forever()
+    
+    async def close(self):
+        """Stop accepting connections, close open ones and commit queued entries."""
+        self._closing = True
+        if self._server is not None:
+            self._server.close()
+        handlers = list(self._connections.values())
+        for writer in list(self._connections):
+            writer.close()
+        # Closed connections read EOF, so their handlers return promptly
+        await asyncio.gather(*handlers, return_exceptions=True)
+        if self._server is not None:
+            await self._server.wait_closed()
+        # Commits every entry already accepted before the writer stops
+        await self.call(self.writer.close)
+        self.executor.shutdown(wait=True)
+    
+    async def call(self, function: Callable, *args) -> Any:
+        """Run a blocking model call on the database thread pool."""
+        return await asyncio.get_running_loop().run_in_executor(
+            self.executor, functools.partial(function, *args)
+        )
+    
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Serve requests on one connection until either side closes it."""
+        self._connections[writer] = asyncio.current_task()
+        try:
+            while not self._closing:
+                try:
+                    request = await asyncio.wait_for(read_request(reader), self.idle_timeout)
+                except asyncio.TimeoutError:
+                    break
+                except HTTPError as e:
+                    # The stream cannot be trusted after a malformed request
+                    writer.write(encode_response(e.status, {'error': e.message}, keep_alive=False))
+                    await writer.drain()
+                    break
+                if request is None:
+                    break
+                status, payload = await self.dispatch(request)
+                keep_alive = request.keep_alive and not self._closing
+                writer.write(encode_response(status, payload, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._connections.pop(writer, None)
+            writer.close()
+    
+    async def dispatch(self, request: Request) -> Tuple[int, Any]:
+        """Route a request to its handler and turn errors into responses."""
+        self.requests += 1
+        method_allowed = False
+        for method, pattern, handler in self.routes:
+            match = pattern.fullmatch(request.path)
+            if match is None:
+                continue
+            if method != request.method:
+                method_allowed = True
+                continue
+            try:
+                return await handler(request, *(int(group) for group in match.groups()))
+            except HTTPError as e:
+                return e.status, {'error': e.message}
+            except Exception:
+                logger.exception("Unhandled error in %s %s", request.method, request.path)
+                return 500, {'error': "Internal server error"}
+        if method_allowed:
+            return 405, {'error': f"Method {request.method} not allowed on {request.path}"}
+        return 404, {'error': f"No route for {request.path}"}
+    
+    async def health(self, request: Request) -> Tuple[int, Any]:
+        return 200, {
+            'status': 'ok',
+            'requests': self.requests,
+            'connections': len(self._connections),
+            'pool': self.db.pool_stats(),
+            'group_commit': self.writer.stats(),
+            'backups': self.db.backup_scheduler.stats() if self.db.backup_scheduler else None,
+        }
+    
+    # Employees
+    
+    async def list_employees(self, request: Request) -> Tuple[int, Any]:
+        limit = request.int_param('limit', 100, MAX_PAGE_SIZE)
+        employees = await self.call(self.employee.get_page, request.int_param('after'), limit)
+        return 200, {
+            'employees': employees,
+            'next_after': employees[-1]['id_number'] if len(employees) == limit else None,
+        }
+    
+    async def search_employees(self, request: Request) -> Tuple[int, Any]:
+        limit = request.int_param('limit', 50, MAX_PAGE_SIZE)
+        return 200, {'employees': await self.call(self.employee.search, request.query.get('q', ''), limit)}
+    
+    async def get_employee(self, request: Request, employee_id: int) -> Tuple[int, Any]:
+        employee = await self.call(self.employee.get_by_id, employee_id)
+        if employee is None:
+            raise HTTPError(404, f"Employee {employee_id} not found")
+        return 200, employee
+    
+    async def _require_project(self, project_number: int):
+        """Answer 400 for an unknown project, which the employees foreign key would reject."""
+        if await self.call(self.project.get_by_number, int(project_number)) is None:
+            raise HTTPError(400, f"Project {project_number} does not exist")
+    
+    async def create_employee(self, request: Request) -> Tuple[int, Any]:
+        data = _validated(validate_employee_data, request.json_object())
+        if await self.call(self.employee.get_by_id, data['id_number']) is not None:
+            raise HTTPError(409, f"Employee {data['id_number']} already exists")
+        await self._require_project(data['project_number'])
+        if not await self.call(self.employee.create, data):
+            raise HTTPError(500, "Failed to create employee")
+        return 201, await self.call(self.employee.get_by_id, data['id_number'])
+    
+    async def update_employee(self, request: Request, employee_id: int) -> Tuple[int, Any]:
+        existing = await self.call(self.employee.get_by_id, employee_id)
+        if existing is None:
+            raise HTTPError(404, f"Employee {employee_id} not found")
+        data = _validated(validate_employee_data, dict(existing, **request.json_object()))
+        await self._require_project(data['project_number'])
+        if int(data['id_number']) != employee_id and await self.call(
+                self.time_tracking.get_entries, employee_id, None, 1):
+            raise HTTPError(409, f"Employee {employee_id} has time entries; id_number cannot change")
+        if not await self.call(self.employee.update, employee_id, data):
+            raise HTTPError(500, f"Failed to update employee {employee_id}")
+        return 200, await self.call(self.employee.get_by_id, data['id_number'])
+    
+    # Sectors
+    
+    async def list_sectors(self, request: Request) -> Tuple[int, Any]:
+        sectors = await self.call(self.sector.by_name)
+        return 200, {'sectors': sorted(sectors.values(), key=lambda sector: sector['sector_id'])}
+    
+    async def get_sector(self, request: Request, sector_id: int) -> Tuple[int, Any]:
+        sector = await self.call(self.sector.get_by_id, sector_id)
+        if sector is None:
+            raise HTTPError(404, f"Sector {sector_id} not found")
+        return 200, sector
+    
+    async def create_sector(self, request: Request) -> Tuple[int, Any]:
+        data = _validated(validate_sector_data, request.json_object())
+        if await self.call(self.sector.get_by_id, data['sector_id']) is not None:
+            raise HTTPError(409, f"Sector {data['sector_id']} already exists")
+        if not await self.call(self.sector.create, data):
+            raise HTTPError(500, "Failed to create sector")
+        return 201, await self.call(self.sector.get_by_id, data['sector_id'])
+    
+    async def update_sector(self, request: Request, sector_id: int) -> Tuple[int, Any]:
+        existing = await self.call(self.sector.get_by_id, sector_id)
+        if existing is None:
+            raise HTTPError(404, f"Sector {sector_id} not found")
+        data = _validated(validate_sector_data, dict(existing, **request.json_object()))
+        if not await self.call(self.sector.update, sector_id, data):
+            raise HTTPError(500, f"Failed to update sector {sector_id}")
+        return 200, await self.call(self.sector.get_by_id, data['sector_id'])
+    
+    # Projects
+    
+    async def get_project(self, request: Request, project_number: int) -> Tuple[int, Any]:
+        project = await self.call(self.project.get_by_number, project_number)
+        if project is None:
+            raise HTTPError(404, f"Project {project_number} not found")
+        return 200, project
+    
+    async def get_project_manhours(self, request: Request, project_number: int) -> Tuple[int, Any]:
+        manhours = await self.call(self.project.get_specific_manhours, project_number)
+        if manhours is None:
+            raise HTTPError(404, f"Project {project_number} not found")
+        return 200, manhours
+    
+    async def create_project(self, request: Request) -> Tuple[int, Any]:
+        data = request.json_object()
+        missing = [field for field in PROJECT_FIELDS if data.get(field) is None]
+        if missing:
+            raise HTTPError(400, f"Missing required field: {missing[0]}")
+        if not all(isinstance(data[field], (int, float)) for field in PROJECT_FIELDS):
+            raise HTTPError(400, "Invalid numeric values")
+        if await self.call(self.project.get_by_number, data['project_number']) is not None:
+            raise HTTPError(409, f"Project {data['project_number']} already exists")
+        if not await self.call(self.project.create, data):
+            raise HTTPError(500, "Failed to create project")
+        return 201, await self.call(self.project.get_by_number, data['project_number'])
+    
+    async def update_project_percentage(self, request: Request, project_number: int) -> Tuple[int, Any]:
+        percentage = request.json_object().get('percentage')
+        if not isinstance(percentage, (int, float)) or not 0 <= percentage <= 100:
+            raise HTTPError(400, "percentage must be a number between 0 and 100")
+        if await self.call(self.project.get_by_number, project_number) is None:
+            raise HTTPError(404, f"Project {project_number} not found")
+        if not await self.call(self.project.update_percentage, project_number, percentage):
+            raise HTTPError(500, f"Failed to update project {project_number}")
+        return 200, await self.call(self.project.get_by_number, project_number)
+    
+    # Time entries
+    
+    async def list_time_entries(self, request: Request) -> Tuple[int, Any]:
+        entries = await self.call(
+            self.time_tracking.get_entries, request.int_param('employee_id'),
+            request.int_param('project_number'), request.int_param('limit', 100, MAX_PAGE_SIZE)
+        )
+        return 200, {'entries': entries}
+    
+    async def record_time_entry(self, request: Request) -> Tuple[int, Any]:
+        success, message = await asyncio.wrap_future(
+            self.writer.record_hours(*_entry_tuple(request.json()))
+        )
+        if not success:
+            raise HTTPError(503 if message.startswith("Database error") else 422, message)
+        return 201, {'recorded': True}
+    
+    async def record_time_entries(self, request: Request) -> Tuple[int, Any]:
+        data = request.json_object()
+        entries = data.get('entries')
+        if not isinstance(entries, list):
+            raise HTTPError(400, "entries must be a list of time entries")
+        if len(entries) > MAX_BULK_ENTRIES:
+            raise HTTPError(413, f"At most {MAX_BULK_ENTRIES} entries per request")
+        
+        report: List[Optional[Tuple[bool, str]]] = [None] * len(entries)
+        valid: List[Tuple[int, int, int]] = []
+        positions: List[int] = []
+        for position, entry in enumerate(entries):
+            try:
+                valid.append(_entry_tuple(entry))
+                positions.append(position)
+            except HTTPError as e:
+                report[position] = (False, e.message)
+        if valid:
+            results = await asyncio.wrap_future(self.writer.submit(valid))
+            for position, result in zip(positions, results):
+                report[position] = result
+        recorded = sum(1 for success, _ in report if success)
+        return 200, {
+            'recorded': recorded,
+            'failed': len(report) - recorded,
+            'results': [{'recorded': success, 'error': message or None} for success, message in report],
+        }
+
+async def serve(db_manager: DatabaseManager, host: str, port: int, **options):
+    """Run an ApiServer until cancelled."""
+    server = ApiServer(db_manager, host, port, **options)
+    try:
+        # Shut down cleanly on SIGTERM, committing queued entries
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+    except NotImplementedError:  # Windows
+        pass
+    await server.start()
+    logger.info("Serving the API on http://%s:%s", host, server.port)
+    try:
+        await server.serve_forever()
+    finally:
+        await server.close()
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Serve the project management API over HTTP.")
+    parser.add_argument('--db', default='iscon.db', help="database file (default: iscon.db)")
+    parser.add_argument('--host', default='127.0.0.1', help="address to listen on")
+    parser.add_argument('--port', type=int, default=8080, help="port to listen on")
+    parser.add_argument('--pool-size', type=int, default=8, help="pooled database connections")
+    parser.add_argument('--pragmas', default='default', help="DatabaseManager PRAGMA profile")
+    parser.add_argument('--commit-delay-ms', type=float, default=0.0,
+                        help="how long a time entry may wait for others to share its commit")
+    parser.add_argument('--max-batch', type=int, default=500, help="time entries per transaction")
+    parser.add_argument('--auto-completion', action='store_true',
+                        help="advance percentage_completion as hours are recorded")
+    parser.add_argument('--backup-dir', help="back the database up into this directory")
+    parser.add_argument('--backup-interval', type=float, default=3600.0, help="seconds between backups")
+    parser.add_argument('--backup-keep', type=int, default=7, help="backups to keep")
+    args = parser.parse_args(argv)
+    
+    log_listener = setup_logging(log_file=None, operation_levels={'time.record_hours_bulk': 'DEBUG'})
+    migrate(args.db)
+    db_manager = DatabaseManager(args.db, pool_size=args.pool_size, pragmas=args.pragmas)
+    if args.backup_dir:
+        db_manager.start_backups(args.backup_dir, interval=args.backup_interval, keep=args.backup_keep)
+    try:
+        asyncio.run(serve(
+            db_manager, args.host, args.port, commit_delay=args.commit_delay_ms / 1000,
+            max_batch=args.max_batch, auto_completion=args.auto_completion
+        ))
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        pass
+    finally:
+        db_manager.close()
+        stop_logging(log_listener)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
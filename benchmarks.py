@@ -0,0 +1,289 @@
+"""
+Benchmark harness for the models.py hot paths.
+Generates a synthetic database with the iscon.db schema scaled to N
+employees, M projects and K sectors, times each operation individually and
+writes ops/sec, p50/p99 latency and peak RSS as JSON so runs can be compared.
+
+Usage:
+    python benchmarks.py [--employees 10000] [--projects 1000] [--sectors 20]
+                         [--output results.json] [--compare baseline.json]
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import random
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Optional
+
+from migrations import TRADE_COLUMNS, migrate
+from models import (
+    BackupScheduler, DatabaseManager, Employee, GroupCommitWriter, Project, Sector, TimeTracking
+)
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+# Concurrent callers simulated by the record_hours_group_commit case
+GROUP_COMMIT_CALLERS = 64
+
+# record_hours again, with online backups running back to back in the background
+BACKUP_CASE = 'record_hours_during_backup'
+
+def generate_database(path: str, employees: int, projects: int, sectors: int,
+                      seed: int = 0) -> None:
+    """Create a migrated database at path filled with reproducible synthetic data.
+    
+    The first sectors are the legacy trades so per-trade columns get hours;
+    employees are spread over all sectors and projects at random.
+    """
+    rng = random.Random(seed)
+    migrate(path)
+    names = list(TRADE_COLUMNS) + [f"Sector {n}" for n in range(len(TRADE_COLUMNS) + 1, sectors + 1)]
+    conn = sqlite3.connect(path)
+    try:
+        conn.executemany(
+            "INSERT INTO sector (sector_id, sector_name, sector_wage) VALUES (?, ?, ?)",
+            [(n, name, round(rng.uniform(15, 60), 2)) for n, name in enumerate(names[:sectors], 1)]
+        )
+        conn.executemany("""
+            INSERT INTO projects (price, estimated_man_hours, current_manhours, percentage_completion,
+                project_number, welder_manhours, builder_manhours, painter_manhours,
+                engineer_manhours, manager_manhours, fitter_manhours, wages_payable)
+            VALUES (?, ?, 0, 0, ?, ?, ?, ?, ?, ?, ?, 0)
+        """, [
+            (rng.randint(10, 1000) * 1000.0, 600, number, *(rng.randint(0, 200) for _ in TRADE_COLUMNS))
+            for number in range(1, projects + 1)
+        ])
+        conn.executemany("""
+            INSERT INTO employees (id_number, full_name, hour_per_week, salary, designation,
+                project_number, attendance)
+            VALUES (?, ?, 40, ?, ?, ?, 0)
+        """, [
+            (number, f"Employee {number}", rng.randint(30, 90) * 1000.0,
+             rng.choice(names[:sectors]), rng.randint(1, projects))
+            for number in range(1, employees + 1)
+        ])
+        conn.commit()
+    finally:
+        conn.close()
+
+def peak_rss_kb() -> Optional[int]:
+    """Peak resident set size of this process so far, in KiB (None if unknown)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    index = min(int(fraction * len(sorted_values)), len(sorted_values) - 1)
+    return sorted_values[index]
+
+def measure(name: str, operation: Callable[[int], object], iterations: int,
+            ops_per_call: int = 1) -> Dict:
+    """Call operation(i) for i in range(iterations), timing each call.
+    
+    ops_per_call is the number of logical operations one call performs
+    (entries in a bulk batch), so ops/sec is comparable across cases while
+    latencies stay per call.
+    """
+    latencies: List[float] = []
+    started = time.perf_counter()
+    for i in range(iterations):
+        before = time.perf_counter()
+        operation(i)
+        latencies.append(time.perf_counter() - before)
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        'name': name,
+        'iterations': iterations,
+        'ops_per_call': ops_per_call,
+        'ops_per_sec': iterations * ops_per_call / elapsed if elapsed else None,
+        'p50_ms': percentile(latencies, 0.50) * 1000,
+        'p99_ms': percentile(latencies, 0.99) * 1000,
+        'max_ms': latencies[-1] * 1000,
+        'peak_rss_kb': peak_rss_kb(),
+    }
+
+def run_benchmarks(db_path: str, employees: int, projects: int, sectors: int,
+                   iterations: int = 1000, bulk_size: int = 1000, seed: int = 0,
+                   only: Optional[List[str]] = None, pragmas: str = 'default') -> List[Dict]:
+    """Run every benchmark case (or those named in only) against db_path.
+    
+    Cases that write run after the read-only ones, so reads see the
+    generated data set. Peak RSS is process-wide and only ever grows.
+    """
+    rng = random.Random(seed)
+    db_manager = DatabaseManager(db_path, pragmas=pragmas)
+    employee = Employee(db_manager)
+    sector = Sector(db_manager)
+    project = Project(db_manager)
+    time_tracking = TimeTracking(db_manager)
+    writer = GroupCommitWriter(time_tracking)
+    sector_names = list(sector.by_name())
+    employee_ids = [rng.randint(1, employees) for _ in range(iterations)]
+    
+    def get_by_id_cold(i):
+        employee.cache.clear()
+        return employee.get_by_id(employee_ids[i])
+    
+    def bulk_batch(i):
+        return time_tracking.record_hours_bulk(
+            [(rng.randint(1, employees), rng.randint(1, projects), rng.randint(1, 12))
+             for _ in range(bulk_size)],
+            chunk_size=bulk_size
+        )
+    
+    def group_commit(i):
+        # As if GROUP_COMMIT_CALLERS threads each recorded one entry at once
+        futures = [
+            writer.record_hours(rng.randint(1, employees), rng.randint(1, projects), rng.randint(1, 12))
+            for _ in range(GROUP_COMMIT_CALLERS)
+        ]
+        return [future.result() for future in futures]
+    
+    def create_project(i):
+        return project.create({
+            'price': 100000.0, 'estimated_man_hours': 600, 'project_number': projects + i + 1,
+            'welder_manhours': 100, 'builder_manhours': 100, 'painter_manhours': 100,
+            'engineer_manhours': 100, 'manager_manhours': 100, 'fitter_manhours': 100,
+        })
+    
+    cases = [
+        # A small hot set, so all but the first calls are cache hits
+        ('employee_get_by_id', lambda i: employee.get_by_id(employee_ids[i % 100]), iterations, 1),
+        ('employee_get_by_id_uncached', get_by_id_cold, iterations, 1),
+        ('employee_get_all', lambda i: employee.get_all(), max(iterations // 100, 3), employees),
+        ('employee_iter_all', lambda i: sum(1 for _ in employee.iter_all()),
+         max(iterations // 100, 3), employees),
+        ('employee_get_page', lambda i: employee.get_page(employee_ids[i], 100), iterations, 1),
+        ('sector_get_by_name', lambda i: sector.get_by_name(sector_names[i % len(sector_names)]),
+         iterations, 1),
+        ('record_hours', lambda i: time_tracking.record_hours(
+            employee_ids[i], rng.randint(1, projects), rng.randint(1, 12)), iterations, 1),
+        ('record_hours_bulk', bulk_batch, max(iterations // bulk_size, 3), bulk_size),
+        ('record_hours_group_commit', group_commit, max(iterations // GROUP_COMMIT_CALLERS, 3),
+         GROUP_COMMIT_CALLERS),
+        ('project_create', create_project, iterations, 1),
+    ]
+    
+    results = []
+    try:
+        for name, operation, count, ops_per_call in cases:
+            if only and name not in only:
+                continue
+            logger.info("Running %s x %s", name, count)
+            results.append(measure(name, operation, count, ops_per_call))
+        if not only or BACKUP_CASE in only:
+            logger.info("Running %s x %s", BACKUP_CASE, iterations)
+            backup_dir = tempfile.mkdtemp(prefix='iscon-backup-')
+            scheduler = BackupScheduler(db_manager, backup_dir, interval=0, keep=1)
+            try:
+                result = measure(BACKUP_CASE, lambda i: time_tracking.record_hours(
+                    employee_ids[i], rng.randint(1, projects), rng.randint(1, 12)), iterations)
+            finally:
+                scheduler.close()
+                shutil.rmtree(backup_dir, ignore_errors=True)
+            result['backup'] = scheduler.stats()
+            results.append(result)
+    finally:
+        writer.close()
+        db_manager.close()
+    return results
+
+def compare(baseline: Dict, current: Dict) -> List[str]:
+    """Describe the ops/sec and p99 change of each case present in both runs."""
+    before = {result['name']: result for result in baseline['results']}
+    lines = []
+    for result in current['results']:
+        old = before.get(result['name'])
+        if not old or not old['ops_per_sec'] or not result['ops_per_sec']:
+            continue
+        change = (result['ops_per_sec'] / old['ops_per_sec'] - 1) * 100
+        lines.append(
+            f"{result['name']:<30} {old['ops_per_sec']:>12.0f} -> {result['ops_per_sec']:>12.0f} ops/s "
+            f"({change:+.1f}%)  p99 {old['p99_ms']:.3f} -> {result['p99_ms']:.3f} ms"
+        )
+    return lines
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark the models.py hot paths.")
+    parser.add_argument('--employees', type=int, default=10000, help="synthetic employees (N)")
+    parser.add_argument('--projects', type=int, default=1000, help="synthetic projects (M)")
+    parser.add_argument('--sectors', type=int, default=20, help="synthetic sectors (K)")
+    parser.add_argument('--iterations', type=int, default=1000, help="calls per case")
+    parser.add_argument('--bulk-size', type=int, default=1000, help="entries per bulk call")
+    parser.add_argument('--seed', type=int, default=0, help="random seed for data and inputs")
+    parser.add_argument('--pragmas', default='default', help="DatabaseManager PRAGMA profile")
+    parser.add_argument('--only', help="comma-separated case names to run")
+    parser.add_argument('--output', help="write JSON results to this file")
+    parser.add_argument('--compare', help="JSON results of an earlier run to compare against")
+    parser.add_argument('--keep-db', help="generate the database here and keep it")
+    parser.add_argument('--log-level', default='WARNING', help="log level while benchmarking")
+    args = parser.parse_args(argv)
+    
+    logging.basicConfig()
+    logging.getLogger().setLevel(args.log_level)
+    logger.setLevel(logging.INFO)
+    
+    workdir = None
+    if args.keep_db:
+        db_path = args.keep_db
+    else:
+        workdir = tempfile.mkdtemp(prefix='iscon-bench-')
+        db_path = os.path.join(workdir, 'bench.db')
+    try:
+        generate_database(db_path, args.employees, args.projects, args.sectors, args.seed)
+        results = run_benchmarks(
+            db_path, args.employees, args.projects, args.sectors, args.iterations,
+            args.bulk_size, args.seed, args.only.split(',') if args.only else None, args.pragmas
+        )
+    finally:
+        if workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+    
+    report = {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'python': platform.python_version(),
+            'sqlite': sqlite3.sqlite_version,
+            'platform': platform.platform(),
+            'parameters': {key: value for key, value in vars(args).items()
+                           if key not in ('output', 'compare', 'keep_db', 'log_level')},
+        },
+        'results': results,
+    }
+    for result in results:
+        print(f"{result['name']:<30} {result['ops_per_sec']:>12.0f} ops/s  "
+              f"p50 {result['p50_ms']:.3f} ms  p99 {result['p99_ms']:.3f} ms  "
+              f"peak RSS {result['peak_rss_kb']} KiB")
+        if 'backup' in result and result['backup']['bytes_per_sec']:
+            print(f"{'':<30} {result['backup']['backups']} backups at "
+                  f"{result['backup']['bytes_per_sec'] / 1e6:.1f} MB/s")
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        print(f"\nCompared with {args.compare}:")
+        for line in compare(baseline, report):
+            print(line)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,82 @@
+"""
+Database administration commands for the project management system.
+
+Usage:
+    python db_admin.py [--db iscon.db] migrate
+    python db_admin.py [--db iscon.db] rebuild-aggregates
+    python db_admin.py [--db iscon.db] backup [--directory backups] [--keep 7]
+"""
+
+import argparse
+import logging
+import sys
+from typing import List, Optional
+
+from logging_config import setup_logging, stop_logging
+from migrations import migrate
+from models import BackupScheduler, DatabaseManager, TimeTracking
+
+logger = logging.getLogger(__name__)
+
+def cmd_migrate(db_manager: DatabaseManager, args: argparse.Namespace) -> int:
+    """Apply pending schema migrations."""
+    print(f"{db_manager.db_path} is at schema version {migrate(db_manager.db_path)}")
+    return 0
+
+def cmd_rebuild_aggregates(db_manager: DatabaseManager, args: argparse.Namespace) -> int:
+    """Recompute project, employee and sector totals from the time entry log."""
+    migrate(db_manager.db_path)
+    return 0 if TimeTracking(db_manager).rebuild_aggregates() else 1
+
+def cmd_backup(db_manager: DatabaseManager, args: argparse.Namespace) -> int:
+    """Take an online backup now, keeping the newest --keep in --directory."""
+    scheduler = BackupScheduler(db_manager, args.directory, keep=args.keep,
+                                pages_per_step=args.pages_per_step, step_sleep=args.step_sleep,
+                                start=False)
+    if scheduler.run_now() is None:
+        return 1
+    stats = scheduler.stats()
+    print(f"Backed up {stats['last_bytes']} bytes to {stats['last_path']} "
+          f"in {stats['last_seconds']:.2f} s ({stats['last_steps']} steps)")
+    return 0
+
+COMMANDS = {
+    'migrate': cmd_migrate,
+    'rebuild-aggregates': cmd_rebuild_aggregates,
+    'backup': cmd_backup,
+}
+
+# Options of individual commands: name -> [(flags, add_argument keywords)]
+COMMAND_OPTIONS = {
+    'backup': [
+        (('--directory',), {'default': 'backups', 'help': "backup directory (default: backups)"}),
+        (('--keep',), {'type': int, 'default': 7, 'help': "backups to keep (default: 7)"}),
+        (('--pages-per-step',), {'type': int, 'default': 1024, 'help': "pages copied per step"}),
+        (('--step-sleep',), {'type': float, 'default': 0.005, 'help': "seconds between steps"}),
+    ],
+}
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the command-line parser."""
+    parser = argparse.ArgumentParser(description="Project management database tools.")
+    parser.add_argument('--db', default='iscon.db', help="database file (default: iscon.db)")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    for name, command in COMMANDS.items():
+        subparser = subparsers.add_parser(name, help=command.__doc__)
+        for flags, options in COMMAND_OPTIONS.get(name, []):
+            subparser.add_argument(*flags, **options)
+    return parser
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point."""
+    args = build_parser().parse_args(argv)
+    log_listener = setup_logging(log_file=None)
+    db_manager = DatabaseManager(args.db)
+    try:
+        return COMMANDS[args.command](db_manager, args)
+    finally:
+        db_manager.close()
+        stop_logging(log_listener)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,172 @@
+"""
+Load test for api_server.py.
+Keeps a number of keep-alive connections busy posting time entries, one
+per request or in bulk requests, and reports entries per second and
+request latency percentiles as JSON. With --spawn it first generates a
+synthetic database (see benchmarks.py) and starts a server on it in a
+separate process.
+
+Usage:
+    python loadtest.py --spawn [--employees 10000] [--projects 1000]
+    python loadtest.py --url http://127.0.0.1:8080 --employees 10000 --projects 1000
+                       [--connections 50] [--requests 200] [--bulk 0]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from benchmarks import generate_database, percentile
+
+async def http_request(reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                       method: str, path: str, payload=None) -> Tuple[int, object]:
+    """Send one request on an open keep-alive connection and read its JSON response."""
+    body = json.dumps(payload).encode() if payload is not None else b''
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: loadtest\r\n"
+        f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body
+    )
+    await writer.drain()
+    head = await reader.readuntil(b'\r\n\r\n')
+    lines = head.decode('latin-1').split('\r\n')
+    status = int(lines[0].split(' ')[1])
+    length = 0
+    for line in lines[1:]:
+        name, _, value = line.partition(':')
+        if name.strip().lower() == 'content-length':
+            length = int(value)
+    data = await reader.readexactly(length)
+    return status, json.loads(data) if data else None
+
+async def run_load(host: str, port: int, employees: int, projects: int,
+                   connections: int = 50, requests: int = 200, bulk: int = 0,
+                   seed: int = 0) -> Dict:
+    """Post time entries from concurrent connections and measure the throughput.
+    
+    Each connection sends requests one after another; with bulk > 0 each
+    request carries bulk entries to /time-entries/bulk.
+    """
+    rng = random.Random(seed)
+    latencies: List[float] = []
+    counts = {'entries': 0, 'errors': 0}
+    
+    def entry() -> Dict[str, int]:
+        return {'employee_id': rng.randint(1, employees),
+                'project_number': rng.randint(1, projects), 'hours': rng.randint(1, 12)}
+    
+    async def client():
+        reader, writer = await asyncio.open_connection(host, port)
+        try:
+            for _ in range(requests):
+                if bulk:
+                    path, payload = '/time-entries/bulk', {'entries': [entry() for _ in range(bulk)]}
+                else:
+                    path, payload = '/time-entries', entry()
+                before = time.perf_counter()
+                status, response = await http_request(reader, writer, 'POST', path, payload)
+                latencies.append(time.perf_counter() - before)
+                if bulk and status == 200:
+                    counts['entries'] += response['recorded']
+                    counts['errors'] += response['failed']
+                elif status == 201:
+                    counts['entries'] += 1
+                else:
+                    counts['errors'] += bulk or 1
+        finally:
+            writer.close()
+    
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(connections)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        'connections': connections,
+        'requests': len(latencies),
+        'entries': counts['entries'],
+        'errors': counts['errors'],
+        'elapsed_s': elapsed,
+        'requests_per_sec': len(latencies) / elapsed,
+        'entries_per_sec': counts['entries'] / elapsed,
+        'p50_ms': percentile(latencies, 0.50) * 1000,
+        'p99_ms': percentile(latencies, 0.99) * 1000,
+        'max_ms': latencies[-1] * 1000,
+    }
+
+def _free_port() -> int:
+    """Pick a TCP port that is currently free on localhost."""
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+def _wait_for_port(host: str, port: int, timeout: float = 10.0):
+    """Wait until a server accepts connections on host:port."""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            socket.create_connection((host, port), timeout=0.5).close()
+            return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.05)
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Load test the time entry API.")
+    parser.add_argument('--url', default='http://127.0.0.1:8080', help="server to test")
+    parser.add_argument('--spawn', action='store_true',
+                        help="generate a database and start a server on it for the test")
+    parser.add_argument('--employees', type=int, default=10000, help="employee ids are 1..N")
+    parser.add_argument('--projects', type=int, default=1000, help="project numbers are 1..M")
+    parser.add_argument('--sectors', type=int, default=20, help="sectors to generate with --spawn")
+    parser.add_argument('--pragmas', default='default', help="server PRAGMA profile with --spawn")
+    parser.add_argument('--connections', type=int, default=50, help="concurrent keep-alive connections")
+    parser.add_argument('--requests', type=int, default=200, help="requests per connection")
+    parser.add_argument('--bulk', type=int, default=0, help="entries per bulk request (0: single entries)")
+    parser.add_argument('--seed', type=int, default=0, help="random seed for entries")
+    parser.add_argument('--output', help="write JSON results to this file")
+    args = parser.parse_args(argv)
+    
+    url = urlsplit(args.url)
+    host, port = url.hostname or '127.0.0.1', url.port or 80
+    server = workdir = None
+    try:
+        if args.spawn:
+            workdir = tempfile.mkdtemp(prefix='iscon-load-')
+            db_path = os.path.join(workdir, 'load.db')
+            generate_database(db_path, args.employees, args.projects, args.sectors, args.seed)
+            port = _free_port()
+            server = subprocess.Popen([
+                sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'api_server.py'),
+                '--db', db_path, '--host', host, '--port', str(port), '--pragmas', args.pragmas,
+            ])
+            _wait_for_port(host, port)
+        result = asyncio.run(run_load(
+            host, port, args.employees, args.projects, args.connections,
+            args.requests, args.bulk, args.seed
+        ))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+        if workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+    
+    print(json.dumps(result, indent=2))
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(result, f, indent=2)
+    return 0 if result['errors'] == 0 else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
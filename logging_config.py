@@ -0,0 +1,166 @@
+"""
+Logging setup for the project management system.
+Records are put on an in-memory queue by the thread that logs them and
+written to the console and app.log in batches by a listener thread, so
+database writes never wait on disk or terminal I/O. Messages use %-style
+arguments, which are only formatted on the listener thread.
+
+Model operations log through log_operation(), whose level can be set per
+operation, e.g. to drop per-entry records during a bulk import:
+
+    setup_logging(operation_levels={'time.record_hours': 'DEBUG'})
+"""
+
+import atexit
+import json
+import logging
+import logging.handlers
+import queue
+import threading
+from typing import Dict, Optional, Union
+
+DEFAULT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+# Level each model operation logs its success at; unlisted operations use INFO
+OPERATION_LEVELS: Dict[str, int] = {}
+
+def _level(level: Union[int, str]) -> int:
+    """Resolve a level name such as 'DEBUG' to its number."""
+    if isinstance(level, int):
+        return level
+    resolved = logging.getLevelName(level.upper())
+    if not isinstance(resolved, int):
+        raise ValueError(f"Unknown log level: {level!r}")
+    return resolved
+
+def set_operation_levels(levels: Dict[str, Union[int, str]]):
+    """Set the level of one or more operations, e.g. {'employee.create': 'WARNING'}."""
+    for operation, level in levels.items():
+        OPERATION_LEVELS[operation] = _level(level)
+
+def log_operation(logger: logging.Logger, operation: str, msg: str, *args, **fields):
+    """Log a model operation at its configured level, with structured fields.
+    
+    Returns straight away when that level is disabled; otherwise the record
+    carries the operation name and fields for StructuredFormatter.
+    """
+    level = OPERATION_LEVELS.get(operation, logging.INFO)
+    if logger.isEnabledFor(level):
+        logger.log(level, msg, *args, stacklevel=2,
+                   extra={'operation': operation, 'fields': fields})
+
+class StructuredFormatter(logging.Formatter):
+    """Formats each record as one JSON object per line."""
+    
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'time': self.formatTime(record, '%Y-%m-%dT%H:%M:%S') + f".{int(record.msecs):03d}",
+            'level': record.levelname,
+            'logger': record.name,
+            'function': record.funcName,
+            'message': record.getMessage(),
+        }
+        operation = getattr(record, 'operation', None)
+        if operation:
+            entry['operation'] = operation
+            entry['fields'] = record.fields
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+class LazyQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that leaves all formatting to the listener thread.
+    
+    The stock handler formats every record on the logging thread so it could
+    be pickled; this queue never leaves the process, so records go on it as
+    they are. Log values rather than objects that are mutated afterwards.
+    """
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+class BatchingQueueListener(logging.handlers.QueueListener):
+    """QueueListener that drains the queue every interval seconds.
+    
+    The stock listener wakes up for every record, and under the GIL each
+    wake-up pauses the logging thread; draining in batches keeps the
+    writer running and turns that into one switch per interval.
+    """
+    
+    def __init__(self, log_queue, *handlers, interval: float = 0.2):
+        super().__init__(log_queue, *handlers, respect_handler_level=True)
+        self.interval = interval
+        self._stopping = threading.Event()
+        self._drain_thread: Optional[threading.Thread] = None
+    
+    def start(self):
+        self._stopping.clear()
+        self._drain_thread = threading.Thread(target=self._drain_loop, name="log-listener",
+                                              daemon=True)
+        self._drain_thread.start()
+    
+    def _drain_loop(self):
+        while not self._stopping.wait(self.interval):
+            self.drain()
+        self.drain()
+    
+    def drain(self):
+        """Handle every record currently queued."""
+        while True:
+            try:
+                record = self.queue.get_nowait()
+            except queue.Empty:
+                return
+            self.handle(record)
+    
+    def stop(self):
+        """Handle the remaining records and stop the thread; safe to call twice."""
+        if self._drain_thread is not None:
+            self._stopping.set()
+            self._drain_thread.join()
+            self._drain_thread = None
+
+def setup_logging(log_file: Optional[str] = 'app.log', level: Union[int, str] = logging.INFO,
+                  console: bool = True, structured: bool = True,
+                  operation_levels: Optional[Dict[str, Union[int, str]]] = None,
+                  flush_interval: float = 0.2) -> BatchingQueueListener:
+    """Route all logging through a queue to a background listener thread.
+    
+    Replaces the root logger's handlers, like logging.basicConfig(force=True).
+    log_file gets JSON lines when structured, the console plain text. The
+    queue is unbounded, so logging never blocks; records reach the handlers
+    within flush_interval seconds. Returns the started listener; it is
+    stopped, writing out the queue, by stop_logging() or at interpreter exit.
+    """
+    handlers = []
+    if log_file:
+        file_handler = logging.FileHandler(log_file)
+        file_handler.setFormatter(StructuredFormatter() if structured
+                                  else logging.Formatter(DEFAULT_FORMAT))
+        handlers.append(file_handler)
+    if console:
+        console_handler = logging.StreamHandler()
+        console_handler.setFormatter(logging.Formatter(DEFAULT_FORMAT))
+        handlers.append(console_handler)
+    
+    log_queue: "queue.SimpleQueue" = queue.SimpleQueue()
+    listener = BatchingQueueListener(log_queue, *handlers, interval=flush_interval)
+    
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+        handler.close()
+    root.addHandler(LazyQueueHandler(log_queue))
+    root.setLevel(_level(level))
+    if operation_levels:
+        set_operation_levels(operation_levels)
+    
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
+
+def stop_logging(listener: BatchingQueueListener):
+    """Write out everything still queued and stop the listener thread."""
+    listener.stop()
+    for handler in listener.handlers:
+        handler.close()
@@ -6,18 +6,11 @@ This replaces the old main.py with a cleaner, more maintainable structure.
 import tkinter as tk
 from tkinter import messagebox
 from models import DatabaseManager, TimeTracking, validate_employee_data
-from ui_components import create_management_window
+from migrations import migrate
+from ui_components import BusyIndicator, DatabaseWorker, create_management_window
+from logging_config import setup_logging, stop_logging
 import logging
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('app.log'),
-        logging.StreamHandler()
-    ]
-)
 logger = logging.getLogger(__name__)
 
 class ProjectManagementApp:
@@ -28,9 +21,13 @@ class ProjectManagementApp:
         self.root.title('Project Management System')
         self.root.geometry("500x400")
         
+        # Bring the database schema up to date before anything touches it
+        migrate('iscon.db')
+        
         # Initialize services
         self.db_manager = DatabaseManager('iscon.db')
         self.time_tracking = TimeTracking(self.db_manager)
+        self.worker = DatabaseWorker(self.root)
         
         # Setup UI
         self.setup_main_window()
@@ -84,6 +81,9 @@ class ProjectManagementApp:
         
         # Time tracking section
         self.setup_time_tracking_section()
+        
+        # In-flight database call indicator
+        BusyIndicator(self.root, self.worker).pack(side=tk.BOTTOM, pady=5)
     
     def setup_time_tracking_section(self):
         """Setup the time tracking input section."""
@@ -121,7 +121,7 @@ class ProjectManagementApp:
         self.hours_entry.grid(row=2, column=1, padx=10, pady=5)
         
         # Submit button
-        submit_button = tk.Button(
+        self.submit_button = tk.Button(
             tracking_frame,
             text="Record Hours",
             command=self.record_hours,
@@ -131,33 +131,33 @@ class ProjectManagementApp:
             width=15,
             height=2
         )
-        submit_button.grid(row=3, column=0, columnspan=2, pady=15)
+        self.submit_button.grid(row=3, column=0, columnspan=2, pady=15)
     
     def open_employees(self):
         """Open employee management window."""
         try:
-            create_management_window("employees", self.root, self.db_manager)
+            create_management_window("employees", self.root, self.db_manager, self.worker)
             logger.info("Opened employee management window")
         except Exception as e:
-            logger.error(f"Failed to open employee management: {e}")
+            logger.error("Failed to open employee management: %s", e)
             messagebox.showerror("Error", f"Failed to open employee management: {str(e)}")
     
     def open_designations(self):
         """Open designation/sector management window."""
         try:
-            create_management_window("sectors", self.root, self.db_manager)
+            create_management_window("sectors", self.root, self.db_manager, self.worker)
             logger.info("Opened sector management window")
         except Exception as e:
-            logger.error(f"Failed to open sector management: {e}")
+            logger.error("Failed to open sector management: %s", e)
             messagebox.showerror("Error", f"Failed to open sector management: {str(e)}")
     
     def open_projects(self):
         """Open project management window."""
         try:
-            create_management_window("projects", self.root, self.db_manager)
+            create_management_window("projects", self.root, self.db_manager, self.worker)
             logger.info("Opened project management window")
         except Exception as e:
-            logger.error(f"Failed to open project management: {e}")
+            logger.error("Failed to open project management: %s", e)
             messagebox.showerror("Error", f"Failed to open project management: {str(e)}")
     
     def record_hours(self):
@@ -195,21 +195,37 @@ class ProjectManagementApp:
                 messagebox.showerror("Error", "Hours must be between 1 and 24")
                 return
             
-            # Record the hours
-            success = self.time_tracking.record_hours(employee_id, project_number, hours)
-            
-            if success:
-                messagebox.showinfo("Success", f"Successfully recorded {hours} hours for employee {employee_id} on project {project_number}")
-                # Clear the form
-                self.clear_time_tracking_form()
-                logger.info(f"Recorded {hours} hours for employee {employee_id} on project {project_number}")
-            else:
-                messagebox.showerror("Error", "Failed to record hours. Please check that the employee and project exist.")
+            # Record the hours off the UI thread
+            self.submit_button.config(state=tk.DISABLED)
+            self.worker.submit(
+                self.time_tracking.record_hours, employee_id, project_number, hours,
+                on_success=lambda success: self.on_hours_recorded(
+                    success, employee_id, project_number, hours
+                ),
+                on_error=self.on_record_hours_error
+            )
         
         except Exception as e:
-            logger.error(f"Error recording hours: {e}")
+            logger.error("Error recording hours: %s", e)
             messagebox.showerror("Error", f"An error occurred: {str(e)}")
     
+    def on_hours_recorded(self, success: bool, employee_id: int, project_number: int, hours: int):
+        """Handle the result of a background record_hours call."""
+        self.submit_button.config(state=tk.NORMAL)
+        if success:
+            messagebox.showinfo("Success", f"Successfully recorded {hours} hours for employee {employee_id} on project {project_number}")
+            # Clear the form
+            self.clear_time_tracking_form()
+            logger.info("Recorded %s hours for employee %s on project %s", hours, employee_id, project_number)
+        else:
+            messagebox.showerror("Error", "Failed to record hours. Please check that the employee and project exist.")
+    
+    def on_record_hours_error(self, error: Exception):
+        """Handle an unexpected exception from a background record_hours call."""
+        self.submit_button.config(state=tk.NORMAL)
+        logger.error("Error recording hours: %s", error)
+        messagebox.showerror("Error", f"An error occurred: {str(error)}")
+    
     def clear_time_tracking_form(self):
         """Clear the time tracking form."""
         self.project_number_entry.delete(0, tk.END)
@@ -221,19 +237,25 @@ class ProjectManagementApp:
         try:
             self.root.mainloop()
         except Exception as e:
-            logger.error(f"Application error: {e}")
+            logger.error("Application error: %s", e)
             messagebox.showerror("Critical Error", f"Application encountered an error: {str(e)}")
         finally:
+            self.worker.shutdown()
+            self.db_manager.close()
             logger.info("Application shutting down")
 
 def main():
     """Main entry point."""
+    # Log records are written to app.log and the console off the UI thread
+    log_listener = setup_logging('app.log')
     try:
         app = ProjectManagementApp()
         app.run()
     except Exception as e:
-        logger.critical(f"Failed to start application: {e}")
+        logger.critical("Failed to start application: %s", e)
         print(f"Failed to start application: {e}")
+    finally:
+        stop_logging(log_listener)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,479 @@
+"""
+Versioned schema migrations for the project management database.
+The schema version is tracked with PRAGMA user_version; migrate() applies
+every migration newer than the stored version, each in its own transaction.
+
+Usage:
+    python migrations.py [iscon.db]
+"""
+
+import logging
+import sqlite3
+import sys
+from typing import Callable, List, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# A migration is a list of SQL statements or a callable taking the connection
+MigrationSteps = Union[List[str], Callable[[sqlite3.Connection], None]]
+
+# Baseline schema, identical to the tables of the original iscon.db
+BASELINE_SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS "employees" (
+        "id_number"	INTEGER UNIQUE,
+        "full_name"	TEXT,
+        "hour_per_week"	INTEGER,
+        "salary"	REAL,
+        "designation"	TEXT,
+        "project_number"	INTEGER,
+        "attendance"	INTEGER
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS "projects" (
+        "price"	REAL,
+        "estimated_man_hours"	INTEGER,
+        "current_manhours"	INTEGER,
+        "percentage_completion"	REAL,
+        "project_number"	INTEGER UNIQUE,
+        "welder_manhours"	INTEGER,
+        "builder_manhours"	INTEGER,
+        "painter_manhours"	INTEGER,
+        "engineer_manhours"	INTEGER,
+        "manager_manhours"	INTEGER,
+        "fitter_manhours"	INTEGER,
+        "wages_payable"	REAL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS "sector" (
+        "sector_id"	INTEGER UNIQUE,
+        "sector_name"	TEXT,
+        "sector_wage"	REAL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS "specific_man_hours" (
+        "project_number"	INTEGER UNIQUE,
+        "Welder"	INTEGER,
+        "Builder"	INTEGER,
+        "Painter"	INTEGER,
+        "Engineer"	INTEGER,
+        "Manager"	INTEGER,
+        "Fitter"	INTEGER,
+        PRIMARY KEY("project_number")
+    )
+    """,
+]
+
+# Rebuild every table with an explicit INTEGER PRIMARY KEY (an alias for the
+# rowid, so lookups by key are a single b-tree search; WITHOUT ROWID would
+# not help single integer keys) and foreign keys to projects. Column order
+# is unchanged because the legacy functions.py reads rows by position.
+EXPLICIT_KEYS = [
+    """
+    CREATE TABLE "new_projects" (
+        "price"	REAL,
+        "estimated_man_hours"	INTEGER,
+        "current_manhours"	INTEGER,
+        "percentage_completion"	REAL,
+        "project_number"	INTEGER PRIMARY KEY,
+        "welder_manhours"	INTEGER,
+        "builder_manhours"	INTEGER,
+        "painter_manhours"	INTEGER,
+        "engineer_manhours"	INTEGER,
+        "manager_manhours"	INTEGER,
+        "fitter_manhours"	INTEGER,
+        "wages_payable"	REAL
+    )
+    """,
+    """
+    INSERT INTO new_projects
+    (price, estimated_man_hours, current_manhours, percentage_completion, project_number,
+     welder_manhours, builder_manhours, painter_manhours, engineer_manhours,
+     manager_manhours, fitter_manhours, wages_payable)
+    SELECT price, estimated_man_hours, current_manhours, percentage_completion, project_number,
+           welder_manhours, builder_manhours, painter_manhours, engineer_manhours,
+           manager_manhours, fitter_manhours, wages_payable
+    FROM projects
+    """,
+    'DROP TABLE projects',
+    'ALTER TABLE new_projects RENAME TO projects',
+    """
+    CREATE TABLE "new_sector" (
+        "sector_id"	INTEGER PRIMARY KEY,
+        "sector_name"	TEXT,
+        "sector_wage"	REAL
+    )
+    """,
+    """
+    INSERT INTO new_sector (sector_id, sector_name, sector_wage)
+    SELECT sector_id, sector_name, sector_wage FROM sector
+    """,
+    'DROP TABLE sector',
+    'ALTER TABLE new_sector RENAME TO sector',
+    """
+    CREATE TABLE "new_employees" (
+        "id_number"	INTEGER PRIMARY KEY,
+        "full_name"	TEXT,
+        "hour_per_week"	INTEGER,
+        "salary"	REAL,
+        "designation"	TEXT,
+        "project_number"	INTEGER REFERENCES projects(project_number) ON UPDATE CASCADE,
+        "attendance"	INTEGER
+    )
+    """,
+    """
+    INSERT INTO new_employees
+    (id_number, full_name, hour_per_week, salary, designation, project_number, attendance)
+    SELECT id_number, full_name, hour_per_week, salary, designation, project_number, attendance
+    FROM employees
+    """,
+    'DROP TABLE employees',
+    'ALTER TABLE new_employees RENAME TO employees',
+    """
+    CREATE TABLE "new_specific_man_hours" (
+        "project_number"	INTEGER PRIMARY KEY
+            REFERENCES projects(project_number) ON UPDATE CASCADE ON DELETE CASCADE,
+        "Welder"	INTEGER,
+        "Builder"	INTEGER,
+        "Painter"	INTEGER,
+        "Engineer"	INTEGER,
+        "Manager"	INTEGER,
+        "Fitter"	INTEGER
+    )
+    """,
+    """
+    INSERT INTO new_specific_man_hours
+    (project_number, Welder, Builder, Painter, Engineer, Manager, Fitter)
+    SELECT project_number, Welder, Builder, Painter, Engineer, Manager, Fitter
+    FROM specific_man_hours
+    """,
+    'DROP TABLE specific_man_hours',
+    'ALTER TABLE new_specific_man_hours RENAME TO specific_man_hours',
+]
+
+# Secondary indexes for the columns the models filter on
+LOOKUP_INDEXES = [
+    'CREATE INDEX IF NOT EXISTS idx_employees_designation ON employees (designation)',
+    'CREATE INDEX IF NOT EXISTS idx_employees_project_number ON employees (project_number)',
+    'CREATE INDEX IF NOT EXISTS idx_sector_sector_name ON sector (sector_name)',
+]
+
+# Trade columns of the original wide specific_man_hours table
+TRADE_COLUMNS = ('Welder', 'Builder', 'Painter', 'Engineer', 'Manager', 'Fitter')
+
+def _trade_sector_id(column: str) -> str:
+    """SQL expression for the sector a legacy trade column maps to."""
+    return f"(SELECT MIN(sector_id) FROM sector WHERE sector_name = '{column}' COLLATE NOCASE)"
+
+def _trade_deltas(new: str, old: str = None) -> str:
+    """SELECT of (project, sector, hours) rows for legacy trade column writes."""
+    selects = []
+    for column in TRADE_COLUMNS:
+        delta = f"{new}.{column} - {old}.{column}" if old else f"{new}.{column}"
+        selects.append(
+            f"SELECT {new}.project_number, {_trade_sector_id(column)}, {delta} "
+            f"WHERE COALESCE({delta}, 0) != 0"
+        )
+    return " UNION ALL ".join(selects)
+
+def normalize_specific_man_hours(conn: sqlite3.Connection):
+    """Move the wide per-trade columns into the long project_sector_hours ledger.
+    
+    The old table is replaced by a view of the same name and shape, with
+    INSTEAD OF triggers so legacy inserts and column updates still work.
+    """
+    conn.execute("""
+        CREATE TABLE project_sector_hours (
+            project_number INTEGER NOT NULL
+                REFERENCES projects(project_number) ON UPDATE CASCADE ON DELETE CASCADE,
+            sector_id INTEGER NOT NULL
+                REFERENCES sector(sector_id) ON UPDATE CASCADE,
+            hours INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (project_number, sector_id)
+        ) WITHOUT ROWID
+    """)
+    conn.execute("CREATE INDEX idx_project_sector_hours_sector ON project_sector_hours (sector_id)")
+    
+    for column in TRADE_COLUMNS:
+        has_hours = conn.execute(
+            f"SELECT 1 FROM specific_man_hours WHERE COALESCE({column}, 0) != 0 LIMIT 1"
+        ).fetchone()
+        sector = conn.execute(f"SELECT {_trade_sector_id(column)}").fetchone()[0]
+        if has_hours and sector is None:
+            # Keep the recorded hours; the wage can be set from the UI later
+            conn.execute(
+                "INSERT INTO sector (sector_id, sector_name, sector_wage) "
+                "VALUES ((SELECT COALESCE(MAX(sector_id), 0) + 1 FROM sector), ?, 0)",
+                (column,)
+            )
+            logger.warning("Created sector %s with zero wage for existing hours", column)
+        conn.execute(f"""
+            INSERT INTO project_sector_hours (project_number, sector_id, hours)
+            SELECT project_number, {_trade_sector_id(column)}, {column}
+            FROM specific_man_hours
+            WHERE COALESCE({column}, 0) != 0
+              AND project_number IN (SELECT project_number FROM projects)
+        """)
+    
+    conn.execute("DROP TABLE specific_man_hours")
+    trade_sums = ",\n".join(
+        f"COALESCE(SUM(CASE WHEN s.sector_name = '{column}' COLLATE NOCASE "
+        f"THEN h.hours END), 0) AS {column}"
+        for column in TRADE_COLUMNS
+    )
+    conn.execute(f"""
+        CREATE VIEW specific_man_hours AS
+        SELECT p.project_number,
+        {trade_sums}
+        FROM projects p
+        LEFT JOIN project_sector_hours h ON h.project_number = p.project_number
+        LEFT JOIN sector s ON s.sector_id = h.sector_id
+        GROUP BY p.project_number
+    """)
+    upsert = "ON CONFLICT (project_number, sector_id) DO UPDATE SET hours = hours + excluded.hours"
+    conn.execute(f"""
+        CREATE TRIGGER specific_man_hours_insert INSTEAD OF INSERT ON specific_man_hours
+        BEGIN
+            INSERT INTO project_sector_hours (project_number, sector_id, hours)
+            SELECT * FROM ({_trade_deltas('NEW')}) WHERE true
+            {upsert};
+        END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER specific_man_hours_update INSTEAD OF UPDATE ON specific_man_hours
+        BEGIN
+            INSERT INTO project_sector_hours (project_number, sector_id, hours)
+            SELECT * FROM ({_trade_deltas('NEW', 'OLD')}) WHERE true
+            {upsert};
+        END
+    """)
+
+# Append-only log of every recorded time entry. The counters in projects,
+# employees and project_sector_hours are aggregates of this log. Rows with a
+# NULL employee_id are opening balances carried over from before the log
+# existed, so that rebuilding the aggregates reproduces the current totals.
+TIME_ENTRY_LOG = [
+    """
+    CREATE TABLE time_entries (
+        entry_id INTEGER PRIMARY KEY,
+        recorded_at TEXT NOT NULL DEFAULT (strftime('%Y-%m-%dT%H:%M:%fZ', 'now')),
+        employee_id INTEGER,
+        project_number INTEGER,
+        sector_id INTEGER,
+        hours INTEGER NOT NULL DEFAULT 0,
+        wage_rate REAL,
+        wages REAL NOT NULL DEFAULT 0,
+        attendance INTEGER NOT NULL DEFAULT 1
+    )
+    """,
+    'CREATE INDEX idx_time_entries_project ON time_entries (project_number, sector_id)',
+    'CREATE INDEX idx_time_entries_employee ON time_entries (employee_id)',
+    """
+    CREATE TRIGGER time_entries_no_update BEFORE UPDATE ON time_entries
+    BEGIN
+        SELECT RAISE(ABORT, 'time_entries is append-only');
+    END
+    """,
+    """
+    CREATE TRIGGER time_entries_no_delete BEFORE DELETE ON time_entries
+    BEGIN
+        SELECT RAISE(ABORT, 'time_entries is append-only');
+    END
+    """,
+    # Opening balances: per-sector hours, then whatever is left of each
+    # project's totals, then each employee's attendance
+    """
+    INSERT INTO time_entries (project_number, sector_id, hours, wages, attendance)
+    SELECT project_number, sector_id, hours, 0, 0
+    FROM project_sector_hours
+    WHERE hours != 0
+    """,
+    """
+    INSERT INTO time_entries (project_number, hours, wages, attendance)
+    SELECT p.project_number,
+           COALESCE(p.current_manhours, 0) - COALESCE(
+               (SELECT SUM(h.hours) FROM project_sector_hours h
+                WHERE h.project_number = p.project_number), 0),
+           COALESCE(p.wages_payable, 0),
+           0
+    FROM projects p
+    WHERE COALESCE(p.current_manhours, 0) != COALESCE(
+              (SELECT SUM(h.hours) FROM project_sector_hours h
+               WHERE h.project_number = p.project_number), 0)
+       OR COALESCE(p.wages_payable, 0) != 0
+    """,
+    """
+    INSERT INTO time_entries (employee_id, hours, wages, attendance)
+    SELECT id_number, 0, 0, attendance
+    FROM employees
+    WHERE COALESCE(attendance, 0) != 0
+    """,
+]
+
+# Full-text index over employee names and designations, kept in sync with
+# the employees table by triggers. Only a change to the indexed columns
+# touches the index, so attendance updates from time tracking stay cheap.
+EMPLOYEE_SEARCH_FTS = [
+    """
+    CREATE VIRTUAL TABLE employee_search USING fts5(
+        full_name, designation,
+        content='employees', content_rowid='id_number',
+        tokenize='unicode61 remove_diacritics 2', prefix='1 2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER employees_search_insert AFTER INSERT ON employees
+    BEGIN
+        INSERT INTO employee_search (rowid, full_name, designation)
+        VALUES (new.id_number, new.full_name, new.designation);
+    END
+    """,
+    """
+    CREATE TRIGGER employees_search_delete AFTER DELETE ON employees
+    BEGIN
+        INSERT INTO employee_search (employee_search, rowid, full_name, designation)
+        VALUES ('delete', old.id_number, old.full_name, old.designation);
+    END
+    """,
+    """
+    CREATE TRIGGER employees_search_update
+    AFTER UPDATE OF id_number, full_name, designation ON employees
+    BEGIN
+        INSERT INTO employee_search (employee_search, rowid, full_name, designation)
+        VALUES ('delete', old.id_number, old.full_name, old.designation);
+        INSERT INTO employee_search (rowid, full_name, designation)
+        VALUES (new.id_number, new.full_name, new.designation);
+    END
+    """,
+    "INSERT INTO employee_search (employee_search) VALUES ('rebuild')",
+]
+
+# The keys time_entries refers to. The log is append-only, so it cannot
+# follow an ON UPDATE CASCADE like project_sector_hours and employees do;
+# a key that entries refer to may no longer change, or rebuilding the
+# aggregates would lose the hours logged under the old key.
+LOGGED_KEYS = [
+    """
+    CREATE TRIGGER employees_logged_key BEFORE UPDATE OF id_number ON employees
+    WHEN new.id_number IS NOT old.id_number
+         AND EXISTS (SELECT 1 FROM time_entries WHERE employee_id = old.id_number)
+    BEGIN
+        SELECT RAISE(ABORT, 'employee has time entries; id_number cannot change');
+    END
+    """,
+    """
+    CREATE TRIGGER sector_logged_key BEFORE UPDATE OF sector_id ON sector
+    WHEN new.sector_id IS NOT old.sector_id
+         AND EXISTS (SELECT 1 FROM time_entries WHERE sector_id = old.sector_id)
+    BEGIN
+        SELECT RAISE(ABORT, 'sector has time entries; sector_id cannot change');
+    END
+    """,
+    """
+    CREATE TRIGGER projects_logged_key BEFORE UPDATE OF project_number ON projects
+    WHEN new.project_number IS NOT old.project_number
+         AND EXISTS (SELECT 1 FROM time_entries WHERE project_number = old.project_number)
+    BEGIN
+        SELECT RAISE(ABORT, 'project has time entries; project_number cannot change');
+    END
+    """,
+]
+
+# Resume points of timesheet imports (see timesheet_import.py). The offset
+# after a batch is written in the transaction that records the batch, so a
+# crash cannot leave a batch recorded but its offset unsaved.
+IMPORT_PROGRESS = [
+    """
+    CREATE TABLE import_progress (
+        source TEXT PRIMARY KEY,
+        byte_offset INTEGER NOT NULL,
+        updated_at TEXT NOT NULL DEFAULT (strftime('%Y-%m-%dT%H:%M:%fZ', 'now'))
+    )
+    """,
+]
+
+def employee_search_index(conn: sqlite3.Connection):
+    """Index employees for search-as-you-type.
+    
+    A NOCASE index on full_name serves prefix LIKE queries; the FTS5 index
+    is added on top when this SQLite build has the fts5 module.
+    """
+    conn.execute(
+        'CREATE INDEX IF NOT EXISTS idx_employees_full_name ON employees (full_name COLLATE NOCASE)'
+    )
+    if not conn.execute("SELECT sqlite_compileoption_used('ENABLE_FTS5')").fetchone()[0]:
+        logger.warning("SQLite was built without FTS5; employee search uses prefix matching only")
+        return
+    for statement in EMPLOYEE_SEARCH_FTS:
+        conn.execute(statement)
+
+MIGRATIONS: List[Tuple[int, str, MigrationSteps]] = [
+    (1, "baseline schema", BASELINE_SCHEMA),
+    (2, "explicit primary keys and foreign keys", EXPLICIT_KEYS),
+    (3, "lookup indexes", LOOKUP_INDEXES),
+    (4, "normalize specific_man_hours into project_sector_hours", normalize_specific_man_hours),
+    (5, "append-only time entry log", TIME_ENTRY_LOG),
+    (6, "employee search index", employee_search_index),
+    (7, "keys referenced by time entries are immutable", LOGGED_KEYS),
+    (8, "timesheet import progress", IMPORT_PROGRESS),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+def get_version(conn: sqlite3.Connection) -> int:
+    """Get the schema version stored in the database."""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+def migrate(db_path: str) -> int:
+    """Apply all pending migrations to a database and return its new version.
+    
+    Each migration runs in its own transaction together with the version
+    bump, so a failure leaves the database at the last good version.
+    """
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    try:
+        # Table rebuilds must not cascade or check foreign keys mid-way;
+        # this pragma is a no-op inside a transaction, so set it up front.
+        conn.execute("PRAGMA foreign_keys = OFF")
+        current = get_version(conn)
+        for version, description, steps in MIGRATIONS:
+            if version <= current:
+                continue
+            logger.info("Applying migration %s: %s", version, description)
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                if callable(steps):
+                    steps(conn)
+                else:
+                    for statement in steps:
+                        conn.execute(statement)
+                violations = conn.execute("PRAGMA foreign_key_check").fetchall()
+                if violations:
+                    logger.warning(
+                        "Migration %s left %s rows violating foreign keys", version, len(violations)
+                    )
+                conn.execute(f"PRAGMA user_version = {version}")
+                conn.execute("COMMIT")
+            except sqlite3.Error as e:
+                conn.execute("ROLLBACK")
+                logger.error("Migration %s failed: %s", version, e)
+                raise
+            current = version
+        return current
+    finally:
+        conn.close()
+
+def main(argv: List[str] = None) -> int:
+    """Command-line entry point."""
+    argv = sys.argv[1:] if argv is None else argv
+    db_path = argv[0] if argv else 'iscon.db'
+    logging.basicConfig(level=logging.INFO)
+    version = migrate(db_path)
+    print(f"{db_path} is at schema version {version}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,102 +3,951 @@ Data models and database operations for the project management system.
 Separates database logic from UI code and provides a clean API.
 """
 
+import contextlib
+import functools
+import json
+import os
+import queue
+import re
 import sqlite3
-from typing import List, Dict, Optional, Tuple
+import sys
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future
+from datetime import datetime, timezone
+from itertools import islice
+from typing import Any, Iterable, Iterator, List, Dict, Optional, Tuple, Union
 from contextlib import contextmanager
 import logging
+from logging_config import log_operation
+from records import (
+    EmployeeRecord, ProjectRecord, SectorRecord, SpecificManHoursRecord, record_factory
+)
+from statements import (
+    COMPLETION_INCREMENT, COMPLETION_RECOMPUTE, COMPLETION_RECOMPUTE_ONE, EMPLOYEE_ALL,
+    EMPLOYEE_BY_ID, EMPLOYEE_COUNT, EMPLOYEE_DESIGNATIONS, EMPLOYEE_FIRST_PAGE, EMPLOYEE_INSERT,
+    EMPLOYEE_PAGE_AFTER, EMPLOYEE_PAGE_AT, EMPLOYEE_RECORDS, EMPLOYEE_RECORD_ATTENDANCE,
+    EMPLOYEE_SEARCH_FTS, EMPLOYEE_SEARCH_INDEX_EXISTS, EMPLOYEE_SEARCH_PREFIX, EMPLOYEE_UPDATE,
+    IMPORT_PROGRESS_SAVE, PROJECT_ADD_HOURS, PROJECT_BY_NUMBER, PROJECT_EXISTING,
+    PROJECT_INSERT, PROJECT_RECORDS, PROJECT_SECTOR_HOURS_UPSERT, PROJECT_SPECIFIC_MANHOURS,
+    PROJECT_SPECIFIC_MANHOURS_RECORDS, PROJECT_UPDATE_PERCENTAGE, REBUILD_EMPLOYEES,
+    REBUILD_LEDGER, REBUILD_PROJECTS, REBUILD_RESET_EMPLOYEES, REBUILD_RESET_LEDGER,
+    REBUILD_RESET_PROJECTS, SECTOR_ALL, SECTOR_INSERT, SECTOR_RECORDS, SECTOR_UPDATE,
+    TIME_ENTRIES_BY_FILTER, TIME_ENTRY_INSERT, statement_name
+)
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+# Logging is configured by the application (see logging_config.setup_logging)
 logger = logging.getLogger(__name__)
 
+# PRAGMA profiles applied to every pooled connection, in order. busy_timeout
+# comes first so switching journal_mode waits for other processes' locks.
+# WAL lets readers run alongside the single writer instead of blocking on
+# the rollback journal. "default" keeps the durability of the original
+# setup (synchronous=FULL); "throughput" only syncs the WAL at checkpoints,
+# so a power loss (not an application crash) may lose the last commits.
+PRAGMA_PROFILES: Dict[str, Dict[str, object]] = {
+    'default': {
+        'busy_timeout': 5000,            # milliseconds
+        'journal_mode': 'WAL',
+        'synchronous': 'FULL',
+        'foreign_keys': 'ON',
+        'cache_size': -16000,            # negative means KiB, so ~16 MB
+        'mmap_size': 256 * 1024 * 1024,
+        'temp_store': 'MEMORY',
+        'wal_autocheckpoint': 1000,      # pages
+        'journal_size_limit': 64 * 1024 * 1024,
+    },
+}
+PRAGMA_PROFILES['throughput'] = dict(PRAGMA_PROFILES['default'], synchronous='NORMAL')
+
+# Statements each pooled connection keeps compiled (sqlite3's default is 128).
+# Room for every statement in the statements.py registry, plus ad-hoc SQL.
+STATEMENT_CACHE_SIZE = 256
+
+# Seconds the sector table and employee rows are served from memory before
+# being re-read. Other clerk processes commit to the same file without
+# invalidating this process's caches, so their changes (e.g. a new
+# sector_wage charged by record_hours) show up within this many seconds.
+CACHE_TTL = 5.0
+
+_PRAGMA_NAME = re.compile(r'^[a-z_]+$')
+_PRAGMA_VALUE = re.compile(r'^(-?\d+|[A-Za-z_]+)$')
+
+def _pragma_statement(name: str, value) -> str:
+    """Build a PRAGMA assignment, rejecting anything but simple names and values."""
+    if not _PRAGMA_NAME.match(name) or not _PRAGMA_VALUE.match(str(value)):
+        raise ValueError(f"Invalid pragma {name} = {value!r}")
+    return f"PRAGMA {name} = {value}"
+
+_SQL_LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_SQL_PLACEHOLDER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_SQL_WHITESPACE = re.compile(r"\s+")
+
+@functools.lru_cache(maxsize=1024)
+def fingerprint(sql: str) -> str:
+    """Normalize a statement so executions differing only in literals group together."""
+    sql = _SQL_WHITESPACE.sub(' ', sql).strip()
+    sql = _SQL_LITERAL.sub('?', sql)
+    return _SQL_PLACEHOLDER_LIST.sub('(?, ...)', sql)
+
+# Histogram buckets: bucket i counts durations below 2**i microseconds
+HISTOGRAM_BUCKETS = 32
+
+class StatementStats:
+    """Latency histogram and totals for one statement fingerprint."""
+    
+    def __init__(self, fingerprint: str, name: Optional[str] = None):
+        self.fingerprint = fingerprint
+        self.name = name
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.rows_affected = 0
+        self.rows_returned = 0
+        self.fetch_total = 0.0
+        self.buckets = [0] * HISTOGRAM_BUCKETS
+        self.callers: Dict[str, int] = {}
+    
+    def add(self, duration: float, rows: int, caller: str):
+        self.count += 1
+        self.total += duration
+        self.max = max(self.max, duration)
+        if rows > 0:
+            self.rows_affected += rows
+        self.buckets[min(int(duration * 1e6).bit_length(), HISTOGRAM_BUCKETS - 1)] += 1
+        self.callers[caller] = self.callers.get(caller, 0) + 1
+    
+    def percentile(self, fraction: float) -> float:
+        """Upper bound, in seconds, of the histogram bucket holding the percentile."""
+        target = fraction * self.count
+        seen = 0
+        for bucket, count in enumerate(self.buckets):
+            seen += count
+            if count and seen >= target:
+                return min(2 ** bucket / 1e6, self.max)
+        return self.max
+    
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            'fingerprint': self.fingerprint,
+            'statement': self.name,
+            'count': self.count,
+            'total_ms': self.total * 1000,
+            'mean_ms': self.total / self.count * 1000 if self.count else 0.0,
+            'p50_ms': self.percentile(0.50) * 1000,
+            'p99_ms': self.percentile(0.99) * 1000,
+            'max_ms': self.max * 1000,
+            'rows_affected': self.rows_affected,
+            'rows_returned': self.rows_returned,
+            'fetch_ms': self.fetch_total * 1000,
+            'callers': dict(self.callers),
+        }
+
+# Frames skipped when attributing a statement to the model method that ran it
+_PLUMBING = ('InstrumentedCursor.', 'InstrumentedConnection.', 'QueryStats.',
+             'ConnectionPool.', 'DatabaseManager.')
+
+def _calling_method() -> str:
+    """Name the first public function up the stack outside the database plumbing.
+    
+    Private helpers in this module (Employee._fetch_by_id) are attributed to
+    the public method that called them.
+    """
+    frame = sys._getframe(2)
+    while frame is not None:
+        code = frame.f_code
+        name = getattr(code, 'co_qualname', code.co_name)
+        if code.co_filename == contextlib.__file__ or (
+                code.co_filename == __file__ and (
+                    name.startswith(_PLUMBING) or name.rpartition('.')[2].startswith('_')
+                )):
+            frame = frame.f_back
+            continue
+        return f"{frame.f_globals.get('__name__', '?')}.{name}"
+    return '?'
+
+class QueryStats:
+    """Per-statement latency histograms and a log of slow statements.
+    
+    Filled by connections a DatabaseManager opens with query_stats=True.
+    Execute time covers running a statement up to its first row; time
+    spent in fetchone/fetchmany/fetchall is added to fetch_ms, while
+    iterating the cursor directly is not timed.
+    """
+    
+    def __init__(self, slow_query_ms: float = 100.0, explain_slow: bool = False,
+                 slow_log_size: int = 100):
+        self.enabled = True
+        self.slow_query_ms = slow_query_ms
+        self.explain_slow = explain_slow
+        self.slow_log: deque = deque(maxlen=slow_log_size)
+        self._statements: Dict[str, StatementStats] = {}
+        self._lock = threading.Lock()
+    
+    def record(self, conn: sqlite3.Connection, sql: str, parameters, duration: float,
+               rows: int, many: bool = False) -> StatementStats:
+        """Add one execution to its statement's histogram, logging it if slow."""
+        caller = _calling_method()
+        key = fingerprint(sql)
+        with self._lock:
+            stats = self._statements.get(key)
+            if stats is None:
+                stats = self._statements[key] = StatementStats(key, statement_name(sql))
+            stats.add(duration, rows, caller)
+        if duration * 1000 >= self.slow_query_ms:
+            self._log_slow(conn, sql, parameters, duration, rows, caller, many)
+        return stats
+    
+    def record_fetch(self, stats: StatementStats, duration: float, rows: int):
+        """Add time spent fetching rows of an executed statement."""
+        with self._lock:
+            stats.fetch_total += duration
+            stats.rows_returned += rows
+    
+    def _log_slow(self, conn: sqlite3.Connection, sql: str, parameters, duration: float,
+                  rows: int, caller: str, many: bool):
+        plan = None
+        if self.explain_slow and not many and not sql.lstrip().upper().startswith('EXPLAIN'):
+            try:
+                # The base class method, so the EXPLAIN itself is not recorded
+                plan = [row[-1] for row in sqlite3.Connection.execute(
+                    conn, "EXPLAIN QUERY PLAN " + sql, parameters
+                ).fetchall()]
+            except sqlite3.Error:
+                plan = None
+        entry = {
+            'at': time.time(),
+            'fingerprint': fingerprint(sql),
+            'duration_ms': duration * 1000,
+            'rows_affected': rows,
+            'caller': caller,
+            'plan': plan,
+        }
+        with self._lock:
+            self.slow_log.append(entry)
+        logger.warning("Slow query (%.1f ms) in %s: %s", duration * 1000, caller, entry['fingerprint'])
+    
+    def statements(self) -> List[Dict[str, Any]]:
+        """Get every statement's stats, most total execute time first."""
+        with self._lock:
+            report = [stats.as_dict() for stats in self._statements.values()]
+        return sorted(report, key=lambda stats: stats['total_ms'], reverse=True)
+    
+    def reset(self):
+        """Forget all recorded statements and slow queries."""
+        with self._lock:
+            self._statements.clear()
+            self.slow_log.clear()
+
+class InstrumentedCursor(sqlite3.Cursor):
+    """Cursor that reports every statement it runs to its connection's QueryStats."""
+    
+    _statement: Optional[StatementStats] = None
+    
+    def execute(self, sql: str, parameters=()):
+        query_stats = self.connection.query_stats
+        if query_stats is None or not query_stats.enabled:
+            self._statement = None
+            return super().execute(sql, parameters)
+        started = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            self._statement = query_stats.record(
+                self.connection, sql, parameters, time.perf_counter() - started, self.rowcount
+            )
+    
+    def executemany(self, sql: str, seq_of_parameters):
+        query_stats = self.connection.query_stats
+        if query_stats is None or not query_stats.enabled:
+            self._statement = None
+            return super().executemany(sql, seq_of_parameters)
+        started = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            self._statement = query_stats.record(
+                self.connection, sql, None, time.perf_counter() - started, self.rowcount,
+                many=True
+            )
+    
+    def _timed_fetch(self, fetch, *args):
+        if self._statement is None:
+            return fetch(*args)
+        started = time.perf_counter()
+        rows = fetch(*args)
+        count = len(rows) if isinstance(rows, list) else int(rows is not None)
+        self.connection.query_stats.record_fetch(
+            self._statement, time.perf_counter() - started, count
+        )
+        return rows
+    
+    def fetchone(self):
+        return self._timed_fetch(super().fetchone)
+    
+    def fetchmany(self, size: Optional[int] = None):
+        return self._timed_fetch(super().fetchmany, self.arraysize if size is None else size)
+    
+    def fetchall(self):
+        return self._timed_fetch(super().fetchall)
+
+class InstrumentedConnection(sqlite3.Connection):
+    """Connection whose cursors, including the execute shortcuts, are instrumented."""
+    
+    query_stats: Optional[QueryStats] = None
+    
+    def cursor(self, factory=None):
+        return super().cursor(factory or InstrumentedCursor)
+    
+    def execute(self, sql: str, parameters=()):
+        return self.cursor().execute(sql, parameters)
+    
+    def executemany(self, sql: str, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+class ConnectionPool:
+    """Bounded checkout/return pool of long-lived SQLite connections."""
+    
+    def __init__(self, db_path: str, size: int = 5, timeout: float = 5.0,
+                 pragmas: Optional[Dict[str, object]] = None,
+                 query_stats: Optional[QueryStats] = None,
+                 cached_statements: int = STATEMENT_CACHE_SIZE):
+        if size < 1:
+            raise ValueError("Pool size must be at least 1")
+        self.db_path = db_path
+        self.query_stats = query_stats
+        self.cached_statements = cached_statements
+        self._pragma_statements = [
+            _pragma_statement(name, value) for name, value in (pragmas or {}).items()
+        ]
+        self.size = size
+        self.timeout = timeout
+        self._idle: List[sqlite3.Connection] = []
+        self._file_ids: Dict[int, Optional[Tuple[int, int]]] = {}
+        self._created = 0
+        self._closed = False
+        self._lock = threading.Condition()
+        self._stats = {
+            'checkouts': 0,
+            'hits': 0,
+            'waits': 0,
+            'creations': 0,
+            'health_check_failures': 0,
+            'timeouts': 0,
+        }
+    
+    def _file_id(self) -> Optional[Tuple[int, int]]:
+        """Identify the database file on disk, or None for in-memory databases."""
+        if self.db_path == ':memory:' or self.db_path.startswith('file:'):
+            return None
+        try:
+            st = os.stat(self.db_path)
+        except OSError:
+            return None
+        return (st.st_dev, st.st_ino)
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Open a new pooled connection."""
+        if self.query_stats is None:
+            # Plain connections: no instrumentation cost at all
+            conn = sqlite3.connect(self.db_path, check_same_thread=False,
+                                   cached_statements=self.cached_statements)
+        else:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False,
+                                   cached_statements=self.cached_statements,
+                                   factory=InstrumentedConnection)
+            conn.query_stats = self.query_stats
+        conn.row_factory = sqlite3.Row  # Enable dict-like access
+        try:
+            for statement in self._pragma_statements:
+                conn.execute(statement).fetchall()
+        except sqlite3.Error:
+            conn.close()
+            raise
+        self._file_ids[id(conn)] = self._file_id()
+        return conn
+    
+    def _discard(self, conn: sqlite3.Connection):
+        """Close a connection and free its slot in the pool."""
+        self._file_ids.pop(id(conn), None)
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+        with self._lock:
+            self._created -= 1
+            self._lock.notify()
+    
+    def _is_healthy(self, conn: sqlite3.Connection) -> bool:
+        """Check that an idle connection still works and points at the same file."""
+        expected = self._file_ids.get(id(conn))
+        if expected is not None and self._file_id() != expected:
+            # The database file was deleted or replaced underneath us
+            return False
+        try:
+            conn.execute("SELECT 1").fetchone()
+        except sqlite3.Error:
+            return False
+        return True
+    
+    def acquire(self) -> sqlite3.Connection:
+        """Check a connection out of the pool, waiting if all are in use."""
+        deadline = time.monotonic() + self.timeout
+        with self._lock:
+            if self._closed:
+                raise sqlite3.ProgrammingError("Connection pool is closed")
+            self._stats['checkouts'] += 1
+            waited = False
+            while not self._idle and self._created >= self.size:
+                if not waited:
+                    self._stats['waits'] += 1
+                    waited = True
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._stats['timeouts'] += 1
+                    raise sqlite3.OperationalError(
+                        f"Timed out waiting for a connection after {self.timeout}s"
+                    )
+                self._lock.wait(remaining)
+            if self._idle:
+                conn = self._idle.pop()
+                reused = True
+            else:
+                self._created += 1
+                self._stats['creations'] += 1
+                reused = False
+        
+        if reused:
+            if self._is_healthy(conn):
+                with self._lock:
+                    self._stats['hits'] += 1
+                return conn
+            with self._lock:
+                self._stats['health_check_failures'] += 1
+                self._stats['creations'] += 1
+            self._file_ids.pop(id(conn), None)
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+        
+        try:
+            return self._connect()
+        except sqlite3.Error:
+            with self._lock:
+                self._created -= 1
+                self._lock.notify()
+            raise
+    
+    def release(self, conn: sqlite3.Connection):
+        """Return a connection to the pool, rolling back any open transaction."""
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error:
+            self._discard(conn)
+            return
+        with self._lock:
+            if self._closed:
+                self._created -= 1
+                self._file_ids.pop(id(conn), None)
+                conn.close()
+                return
+            self._idle.append(conn)
+            self._lock.notify()
+    
+    def stats(self) -> Dict[str, int]:
+        """Get a snapshot of the pool statistics."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['size'] = self.size
+            stats['open'] = self._created
+            stats['idle'] = len(self._idle)
+            stats['in_use'] = self._created - len(self._idle)
+        return stats
+    
+    def close(self):
+        """Close all idle connections; checked-out ones are closed on release."""
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._created -= len(idle)
+            self._lock.notify_all()
+        for conn in idle:
+            self._file_ids.pop(id(conn), None)
+            conn.close()
+
+class SectorCache:
+    """Read-through cache of the whole sector table, indexed by id and name.
+    
+    The sector table holds a handful of rows that rarely change, so the first
+    miss loads every row and later lookups (including ones for unknown names)
+    are answered from memory until invalidate() is called or ttl seconds
+    have passed since the load (None keeps the table until invalidated).
+    Writes through this process invalidate it at once; the ttl bounds how
+    long changes committed by other processes go unseen.
+    """
+    
+    INDEXES = ('sector_id', 'sector_name')
+    
+    def __init__(self, ttl: Optional[float] = CACHE_TTL):
+        self.ttl = ttl
+        self._indexes: Optional[Dict[str, Dict]] = None
+        self._expires_at: Optional[float] = None
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'loads': 0, 'expirations': 0, 'invalidations': 0}
+    
+    @property
+    def generation(self) -> int:
+        """Counter bumped by every invalidation, used to discard stale loads."""
+        return self._generation
+    
+    def lookup(self, field: str, key) -> Tuple[bool, Optional[Dict]]:
+        """Look up a sector, returning (cache hit, copy of the sector or None)."""
+        with self._lock:
+            if not self._fresh():
+                self._stats['misses'] += 1
+                return False, None
+            self._stats['hits'] += 1
+            row = self._indexes[field].get(key)
+        return True, dict(row) if row else None
+    
+    def all(self) -> Tuple[bool, List[Dict]]:
+        """Get every cached sector, returning (cache hit, copies of the rows)."""
+        with self._lock:
+            if not self._fresh():
+                self._stats['misses'] += 1
+                return False, []
+            self._stats['hits'] += 1
+            rows = list(self._indexes['sector_id'].values())
+        return True, [dict(row) for row in rows]
+    
+    def fill(self, rows: List[Dict], generation: int) -> Dict[str, Dict]:
+        """Index freshly loaded rows and cache them unless invalidated meanwhile."""
+        indexes = {field: {row[field]: row for row in rows} for field in self.INDEXES}
+        with self._lock:
+            self._stats['loads'] += 1
+            if generation == self._generation:
+                self._indexes = indexes
+                self._expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+        return indexes
+    
+    def invalidate(self):
+        """Drop the cached table; the next lookup reloads it."""
+        with self._lock:
+            self._indexes = None
+            self._generation += 1
+            self._stats['invalidations'] += 1
+    
+    def _fresh(self) -> bool:
+        """Whether the table is cached and unexpired; call with the lock held."""
+        if self._indexes is None:
+            return False
+        if self._expires_at is not None and time.monotonic() >= self._expires_at:
+            self._indexes = None
+            self._stats['expirations'] += 1
+            return False
+        return True
+    
+    def stats(self) -> Dict[str, int]:
+        """Get cache hit/miss counters."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['size'] = len(self._indexes['sector_id']) if self._indexes else 0
+        return stats
+
+class EmployeeCache:
+    """Bounded LRU cache of employee rows keyed by id_number.
+    
+    Entries expire ttl seconds after they were put (None keeps them until
+    evicted), so changes committed by other processes are seen within ttl.
+    """
+    
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = CACHE_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[int, Tuple[Optional[float], Dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'expirations': 0, 'invalidations': 0}
+    
+    def get(self, employee_id: int) -> Optional[Dict]:
+        """Get a copy of a cached employee, or None on a miss."""
+        with self._lock:
+            entry = self._entries.get(employee_id)
+            if entry is None:
+                self._stats['misses'] += 1
+                return None
+            expires_at, row = entry
+            if expires_at is not None and time.monotonic() >= expires_at:
+                del self._entries[employee_id]
+                self._stats['expirations'] += 1
+                self._stats['misses'] += 1
+                return None
+            self._entries.move_to_end(employee_id)
+            self._stats['hits'] += 1
+        return dict(row)
+    
+    def put(self, employee_id: int, row: Dict):
+        """Cache an employee row, evicting the least recently used if full."""
+        if self.maxsize <= 0:
+            return
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self._entries[employee_id] = (expires_at, dict(row))
+            self._entries.move_to_end(employee_id)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self._stats['evictions'] += 1
+    
+    def patch(self, employee_id: int, increments: Optional[Dict[str, int]] = None, **values):
+        """Write a committed change through to a cached employee, if present."""
+        with self._lock:
+            entry = self._entries.get(employee_id)
+            if entry is None:
+                return
+            expires_at, row = entry
+            row = dict(row)
+            for field, delta in (increments or {}).items():
+                row[field] += delta
+            row.update(values)
+            self._entries[employee_id] = (expires_at, row)
+    
+    def invalidate(self, *employee_ids: int):
+        """Drop employees from the cache."""
+        with self._lock:
+            for employee_id in employee_ids:
+                if self._entries.pop(employee_id, None) is not None:
+                    self._stats['invalidations'] += 1
+    
+    def clear(self):
+        """Drop every cached employee."""
+        with self._lock:
+            self._stats['invalidations'] += len(self._entries)
+            self._entries.clear()
+    
+    def stats(self) -> Dict[str, int]:
+        """Get cache hit/miss/eviction counters."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['size'] = len(self._entries)
+            stats['maxsize'] = self.maxsize
+        return stats
+
 class DatabaseManager:
-    """Manages database connections and provides context management."""
+    """Manages database connections and provides context management.
+    
+    With query_stats=True every statement run on a pooled connection is
+    timed per fingerprint (see QueryStats); statements slower than
+    slow_query_ms are logged, with their query plan if explain_slow is set.
+    statement_cache_size is the number of compiled statements each pooled
+    connection keeps for reuse.
+    """
     
-    def __init__(self, db_path: str = 'iscon.db'):
+    def __init__(self, db_path: str = 'iscon.db', pool_size: int = 5,
+                 pool_timeout: float = 5.0, employee_cache_size: int = 1024,
+                 employee_cache_ttl: Optional[float] = CACHE_TTL,
+                 sector_cache_ttl: Optional[float] = CACHE_TTL,
+                 pragmas: Union[str, Dict[str, object]] = 'default',
+                 query_stats: bool = False, slow_query_ms: float = 100.0,
+                 explain_slow: bool = False,
+                 statement_cache_size: int = STATEMENT_CACHE_SIZE):
         self.db_path = db_path
+        if isinstance(pragmas, str):
+            pragmas = PRAGMA_PROFILES[pragmas]
+        self.pragmas = dict(pragmas)
+        self.query_stats = QueryStats(slow_query_ms, explain_slow) if query_stats else None
+        self.pool = ConnectionPool(db_path, size=pool_size, timeout=pool_timeout,
+                                   pragmas=self.pragmas, query_stats=self.query_stats,
+                                   cached_statements=statement_cache_size)
+        self.sector_cache = SectorCache(sector_cache_ttl)
+        self.employee_cache = EmployeeCache(employee_cache_size, employee_cache_ttl)
+        self.backup_scheduler: Optional['BackupScheduler'] = None
     
     @contextmanager
     def get_connection(self):
-        """Context manager for database connections."""
+        """Context manager for pooled database connections."""
         conn = None
         try:
-            conn = sqlite3.connect(self.db_path)
-            conn.row_factory = sqlite3.Row  # Enable dict-like access
+            conn = self.pool.acquire()
             yield conn
         except sqlite3.Error as e:
             if conn:
                 conn.rollback()
-            logger.error(f"Database error: {e}")
+            logger.error("Database error: %s", e)
             raise
         finally:
             if conn:
-                conn.close()
+                self.pool.release(conn)
+    
+    @contextmanager
+    def transaction(self, immediate: bool = True):
+        """Context manager running a block in one transaction on one connection.
+        
+        With immediate=True the write lock is taken up front (BEGIN IMMEDIATE),
+        so the block cannot fail half-way with a lock upgrade error.
+        """
+        with self.get_connection() as conn:
+            conn.execute("BEGIN IMMEDIATE" if immediate else "BEGIN")
+            try:
+                yield conn
+            except BaseException:
+                conn.rollback()
+                raise
+            else:
+                conn.commit()
+    
+    def checkpoint(self, mode: str = 'PASSIVE') -> Tuple[int, int, int]:
+        """Checkpoint the write-ahead log into the database file.
+        
+        PASSIVE never blocks readers or the writer; TRUNCATE waits for them
+        and then resets the WAL file to zero bytes. Returns SQLite's
+        (busy, WAL pages, checkpointed pages) triple.
+        """
+        mode = mode.upper()
+        if mode not in ('PASSIVE', 'FULL', 'RESTART', 'TRUNCATE'):
+            raise ValueError(f"Unknown checkpoint mode: {mode}")
+        with self.get_connection() as conn:
+            busy, log_pages, checkpointed = conn.execute(
+                f"PRAGMA wal_checkpoint({mode})"
+            ).fetchone()
+        if busy:
+            logger.warning("WAL checkpoint (%s) could not complete; database busy", mode)
+        return busy, log_pages, checkpointed
+    
+    def backup(self, target_path: str, pages_per_step: int = -1,
+               step_sleep: float = 0.0) -> Dict[str, float]:
+        """Copy the database to target_path with the SQLite online backup API.
+        
+        Runs on a connection of its own, so no pooled connection is held.
+        In WAL mode the copy is made inside one read transaction: writers
+        carry on undisturbed and the copy is the database as of the start,
+        whereas otherwise every commit from another connection would restart
+        a stepped backup from the first page. With pages_per_step > 0 pages
+        are copied that many at a time with step_sleep seconds between
+        steps, spreading the I/O out. Returns the pages, bytes and steps
+        copied and the seconds it took.
+        """
+        progress = {'pages': 0, 'steps': 0}
+        
+        def step(status, remaining, total):
+            progress['pages'] = total
+            progress['steps'] += 1
+            if step_sleep and remaining:
+                time.sleep(step_sleep)
+        
+        started = time.perf_counter()
+        source = sqlite3.connect(self.db_path)
+        try:
+            target = sqlite3.connect(target_path)
+            try:
+                if source.execute("PRAGMA journal_mode").fetchone()[0].lower() == 'wal':
+                    source.execute("BEGIN")
+                    source.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()
+                page_size = source.execute("PRAGMA page_size").fetchone()[0]
+                source.backup(target, pages=pages_per_step, progress=step)
+            finally:
+                target.close()
+        finally:
+            source.close()
+        return dict(progress, bytes=progress['pages'] * page_size,
+                    seconds=time.perf_counter() - started)
+    
+    def start_backups(self, directory: str, **options) -> 'BackupScheduler':
+        """Start backing up on a schedule; options are passed to BackupScheduler.
+        
+        The scheduler is stopped by close().
+        """
+        if self.backup_scheduler is not None:
+            raise RuntimeError("Backups are already running")
+        self.backup_scheduler = BackupScheduler(self, directory, **options)
+        return self.backup_scheduler
+    
+    def pool_stats(self) -> Dict[str, int]:
+        """Get connection pool statistics."""
+        return self.pool.stats()
+    
+    def query_report(self) -> List[Dict[str, Any]]:
+        """Get per-statement timing stats, most expensive first ([] if not enabled)."""
+        return self.query_stats.statements() if self.query_stats else []
+    
+    def close(self):
+        """Stop scheduled backups and close all pooled connections."""
+        if self.backup_scheduler is not None:
+            self.backup_scheduler.close()
+            self.backup_scheduler = None
+        self.pool.close()
+
+class BackupScheduler:
+    """Background thread keeping a rotating set of online backups of a database.
+    
+    Backs up straight away and then every interval seconds with
+    DatabaseManager.backup, throttled to pages_per_step pages per step with
+    step_sleep seconds in between, so record_hours and other writers keep
+    their latency while a backup runs. Each backup is written under a
+    temporary name and renamed to <prefix>-<timestamp>.db once complete,
+    so every file with that name is a usable standby copy; all but the
+    newest keep are deleted. Timestamps are UTC, so names sort in the
+    order the backups were taken.
+    """
+    
+    def __init__(self, db_manager: DatabaseManager, directory: str, interval: float = 3600.0,
+                 keep: int = 7, pages_per_step: int = 1024, step_sleep: float = 0.005,
+                 prefix: Optional[str] = None, start: bool = True):
+        if keep < 1:
+            raise ValueError("Must keep at least one backup")
+        self.db_manager = db_manager
+        self.directory = directory
+        self.interval = interval
+        self.keep = keep
+        self.pages_per_step = pages_per_step
+        self.step_sleep = step_sleep
+        self.prefix = prefix or os.path.splitext(os.path.basename(db_manager.db_path))[0]
+        self._name = re.compile(rf'^{re.escape(self.prefix)}-\d{{8}}T\d{{12}}\.db$')
+        # _running serializes backups; _lock only guards the statistics
+        self._running = threading.Lock()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._stats = {
+            'backups': 0,
+            'failures': 0,
+            'seconds': 0.0,
+            'bytes': 0,
+            'last_path': None,
+            'last_seconds': None,
+            'last_bytes': None,
+            'last_steps': None,
+        }
+        os.makedirs(directory, exist_ok=True)
+        self._thread = threading.Thread(target=self._run, name='backup', daemon=True)
+        if start:
+            self._thread.start()
+    
+    def _run(self):
+        """Scheduler thread: back up, then wait for the next interval or close()."""
+        while not self._stop.is_set():
+            self.run_now()
+            if self._stop.wait(self.interval):
+                return
+    
+    def run_now(self) -> Optional[str]:
+        """Take one backup now and rotate; returns its path, or None if it failed."""
+        with self._running:
+            timestamp = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%S%f')
+            path = os.path.join(self.directory, f"{self.prefix}-{timestamp}.db")
+            temp_path = os.path.join(self.directory, f".{self.prefix}-{timestamp}.db.tmp")
+            try:
+                result = self.db_manager.backup(temp_path, self.pages_per_step, self.step_sleep)
+                os.replace(temp_path, path)
+            except (sqlite3.Error, OSError) as e:
+                logger.error("Backup of %s failed: %s", self.db_manager.db_path, e)
+                with self._lock:
+                    self._stats['failures'] += 1
+                with contextlib.suppress(OSError):
+                    os.unlink(temp_path)
+                return None
+            with self._lock:
+                self._stats['backups'] += 1
+                self._stats['seconds'] += result['seconds']
+                self._stats['bytes'] += result['bytes']
+                self._stats.update(last_path=path, last_seconds=result['seconds'],
+                                   last_bytes=result['bytes'], last_steps=result['steps'])
+            for old in self.backups()[self.keep:]:
+                with contextlib.suppress(OSError):
+                    os.unlink(old)
+        logger.info("Backed up %s to %s in %.2f s", self.db_manager.db_path, path, result['seconds'])
+        return path
+    
+    def backups(self) -> List[str]:
+        """Paths of the complete backups, newest first."""
+        names = sorted((name for name in os.listdir(self.directory) if self._name.match(name)),
+                       reverse=True)
+        return [os.path.join(self.directory, name) for name in names]
+    
+    def latest(self) -> Optional[str]:
+        """Path of the newest complete backup, if any."""
+        backups = self.backups()
+        return backups[0] if backups else None
+    
+    def stats(self) -> Dict[str, Any]:
+        """Get backup statistics, including the average throughput in bytes per second."""
+        with self._lock:
+            stats = dict(self._stats)
+        stats['bytes_per_sec'] = stats['bytes'] / stats['seconds'] if stats['seconds'] else None
+        return stats
+    
+    def close(self, timeout: Optional[float] = None):
+        """Stop the scheduler, letting a backup in progress finish."""
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join(timeout)
+
+# Words of a search query; anything else, including FTS5 syntax, is dropped
+SEARCH_TERM = re.compile(r'\w+')
 
 class Employee:
     """Employee data model with CRUD operations."""
     
     def __init__(self, db_manager: DatabaseManager):
         self.db = db_manager
+        self.cache = db_manager.employee_cache
+        self._has_search_index: Optional[bool] = None
     
     def create(self, employee_data: Dict) -> bool:
         """Create a new employee."""
         try:
             with self.db.get_connection() as conn:
                 cursor = conn.cursor()
-                cursor.execute("""
-                    INSERT INTO employees 
-                    (id_number, full_name, hour_per_week, salary, designation, project_number, attendance)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                """, (
+                cursor.execute(EMPLOYEE_INSERT, (
                     employee_data['id_number'],
                     employee_data['full_name'],
                     employee_data['hour_per_week'],
                     employee_data['salary'],
                     employee_data['designation'],
-                    employee_data['project_number'],
-                    0  # Default attendance
+                    employee_data['project_number']
                 ))
                 conn.commit()
-                logger.info(f"Created employee {employee_data['id_number']}")
+                self.cache.invalidate(employee_data['id_number'])
+                log_operation(logger, 'employee.create', "Created employee %s",
+                              employee_data['id_number'], employee_id=employee_data['id_number'])
                 return True
         except sqlite3.Error as e:
-            logger.error(f"Failed to create employee: {e}")
+            logger.error("Failed to create employee: %s", e)
             return False
     
     def get_by_id(self, employee_id: int) -> Optional[Dict]:
         """Get employee by ID."""
+        employee = self.cache.get(employee_id)
+        if employee is not None:
+            return employee
         try:
             with self.db.get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute(
-                    "SELECT * FROM employees WHERE id_number = ?", 
-                    (employee_id,)
-                )
-                row = cursor.fetchone()
-                if row:
-                    return dict(row)
-                return None
+                return self._fetch_by_id(conn.cursor(), employee_id)
         except sqlite3.Error as e:
-            logger.error(f"Failed to get employee {employee_id}: {e}")
+            logger.error("Failed to get employee %s: %s", employee_id, e)
             return None
     
+    def _fetch_by_id(self, cursor: sqlite3.Cursor, employee_id: int) -> Optional[Dict]:
+        """Look up an employee on an already checked-out connection."""
+        cursor.execute(EMPLOYEE_BY_ID, (employee_id,))
+        row = cursor.fetchone()
+        if row:
+            employee = dict(row)
+            self.cache.put(employee_id, employee)
+            return employee
+        return None
+    
     def update(self, employee_id: int, employee_data: Dict) -> bool:
-        """Update employee information."""
+        """Update employee information.
+        
+        Changing id_number fails once time entries refer to the employee
+        (see migrations.LOGGED_KEYS).
+        """
         try:
             with self.db.get_connection() as conn:
                 cursor = conn.cursor()
-                cursor.execute("""
-                    UPDATE employees SET
-                        id_number = ?,
-                        full_name = ?,
-                        hour_per_week = ?,
-                        salary = ?,
-                        designation = ?,
-                        project_number = ?,
-                        attendance = ?
-                    WHERE id_number = ?
-                """, (
+                cursor.execute(EMPLOYEE_UPDATE, (
                     employee_data['id_number'],
                     employee_data['full_name'],
                     employee_data['hour_per_week'],
@@ -109,10 +958,12 @@ class Employee:
                     employee_id
                 ))
                 conn.commit()
-                logger.info(f"Updated employee {employee_id}")
+                self.cache.invalidate(employee_id, employee_data['id_number'])
+                log_operation(logger, 'employee.update', "Updated employee %s", employee_id,
+                              employee_id=employee_id)
                 return True
         except sqlite3.Error as e:
-            logger.error(f"Failed to update employee {employee_id}: {e}")
+            logger.error("Failed to update employee %s: %s", employee_id, e)
             return False
     
     def get_all(self) -> List[Dict]:
@@ -120,94 +971,202 @@ class Employee:
         try:
             with self.db.get_connection() as conn:
                 cursor = conn.cursor()
-                cursor.execute("SELECT * FROM employees")
+                cursor.execute(EMPLOYEE_ALL)
+                return [dict(row) for row in cursor.fetchall()]
+        except sqlite3.Error as e:
+            logger.error("Failed to get all employees: %s", e)
+            return []
+    
+    def iter_all(self, batch_size: int = 1000) -> Iterator[EmployeeRecord]:
+        """Iterate over all employees, ordered by ID, as compact records.
+        
+        Unlike get_all, at most batch_size rows are in memory at once.
+        """
+        return _iter_records(self.db, EMPLOYEE_RECORDS, EmployeeRecord, batch_size)
+    
+    def count(self) -> int:
+        """Get the number of employees."""
+        try:
+            with self.db.get_connection() as conn:
+                return conn.execute(EMPLOYEE_COUNT).fetchone()[0]
+        except sqlite3.Error as e:
+            logger.error("Failed to count employees: %s", e)
+            return 0
+    
+    def get_page(self, after_id: Optional[int] = None, limit: int = 100) -> List[Dict]:
+        """Get up to limit employees ordered by ID, starting after after_id.
+        
+        Keyset pagination: pass the id_number of the last row of the previous
+        page to get the next one, which is a primary key seek at any depth.
+        """
+        try:
+            with self.db.get_connection() as conn:
+                cursor = conn.cursor()
+                if after_id is None:
+                    cursor.execute(EMPLOYEE_FIRST_PAGE, (limit,))
+                else:
+                    cursor.execute(EMPLOYEE_PAGE_AFTER, (after_id, limit))
                 return [dict(row) for row in cursor.fetchall()]
         except sqlite3.Error as e:
-            logger.error(f"Failed to get all employees: {e}")
+            logger.error("Failed to get employee page after %s: %s", after_id, e)
             return []
+    
+    def get_page_at(self, position: int, limit: int = 100) -> List[Dict]:
+        """Get up to limit employees ordered by ID, starting at a row position.
+        
+        Used to jump to an arbitrary scroll position; continue from there
+        with get_page, which does not pay for skipping rows.
+        """
+        try:
+            with self.db.get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(EMPLOYEE_PAGE_AT, (limit, max(position, 0)))
+                return [dict(row) for row in cursor.fetchall()]
+        except sqlite3.Error as e:
+            logger.error("Failed to get employee page at %s: %s", position, e)
+            return []
+    
+    def search(self, query: str, limit: int = 50) -> List[Dict]:
+        """Find employees by the starts of words in their name or designation.
+        
+        "jo wel" matches a welder called John. Uses the employee_search FTS5
+        index when the database has one, otherwise a prefix match on the
+        full_name index. An all-digit query also matches that id_number.
+        Matches are not ranked, so LIMIT stops the scan early even for a
+        one-letter query.
+        """
+        terms = SEARCH_TERM.findall(query)
+        if not terms or limit <= 0:
+            return []
+        try:
+            with self.db.get_connection() as conn:
+                cursor = conn.cursor()
+                results: List[Dict] = []
+                if query.strip().isdigit():
+                    exact = self._fetch_by_id(cursor, int(query))
+                    if exact:
+                        results.append(exact)
+                
+                if self._search_index_available(cursor):
+                    # Quoted so the terms are never read as FTS5 operators
+                    match = ' '.join(f'"{term}"*' for term in terms)
+                    cursor.execute(EMPLOYEE_SEARCH_FTS, (match, limit))
+                else:
+                    prefix = query.strip().replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+                    cursor.execute(EMPLOYEE_SEARCH_PREFIX, (prefix + '%', limit))
+                
+                seen = {row['id_number'] for row in results}
+                results.extend(dict(row) for row in cursor.fetchall() if row['id_number'] not in seen)
+                return results[:limit]
+        except sqlite3.Error as e:
+            logger.error("Failed to search employees for %r: %s", query, e)
+            return []
+    
+    def _search_index_available(self, cursor: sqlite3.Cursor) -> bool:
+        """Check once whether the employee_search FTS5 table exists."""
+        if self._has_search_index is None:
+            cursor.execute(EMPLOYEE_SEARCH_INDEX_EXISTS)
+            self._has_search_index = cursor.fetchone() is not None
+        return self._has_search_index
 
 class Sector:
     """Sector/Designation data model with CRUD operations."""
     
     def __init__(self, db_manager: DatabaseManager):
         self.db = db_manager
+        self.cache = db_manager.sector_cache
     
     def create(self, sector_data: Dict) -> bool:
         """Create a new sector."""
         try:
             with self.db.get_connection() as conn:
                 cursor = conn.cursor()
-                cursor.execute("""
-                    INSERT INTO sector (sector_id, sector_name, sector_wage)
-                    VALUES (?, ?, ?)
-                """, (
+                cursor.execute(SECTOR_INSERT, (
                     sector_data['sector_id'],
                     sector_data['sector_name'],
                     sector_data['sector_wage']
                 ))
                 conn.commit()
-                logger.info(f"Created sector {sector_data['sector_name']}")
+                self.cache.invalidate()
+                log_operation(logger, 'sector.create', "Created sector %s", sector_data['sector_name'],
+                              sector_id=sector_data['sector_id'])
                 return True
         except sqlite3.Error as e:
-            logger.error(f"Failed to create sector: {e}")
+            logger.error("Failed to create sector: %s", e)
             return False
     
     def get_by_id(self, sector_id: int) -> Optional[Dict]:
         """Get sector by ID."""
         try:
-            with self.db.get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute(
-                    "SELECT * FROM sector WHERE sector_id = ?", 
-                    (sector_id,)
-                )
-                row = cursor.fetchone()
-                if row:
-                    return dict(row)
-                return None
+            return self._lookup('sector_id', sector_id)
         except sqlite3.Error as e:
-            logger.error(f"Failed to get sector {sector_id}: {e}")
+            logger.error("Failed to get sector %s: %s", sector_id, e)
             return None
     
     def get_by_name(self, sector_name: str) -> Optional[Dict]:
         """Get sector by name."""
         try:
-            with self.db.get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute(
-                    "SELECT * FROM sector WHERE sector_name = ?", 
-                    (sector_name,)
-                )
-                row = cursor.fetchone()
-                if row:
-                    return dict(row)
-                return None
+            return self._lookup('sector_name', sector_name)
         except sqlite3.Error as e:
-            logger.error(f"Failed to get sector {sector_name}: {e}")
+            logger.error("Failed to get sector %s: %s", sector_name, e)
             return None
     
+    def by_name(self, cursor: Optional[sqlite3.Cursor] = None) -> Dict[str, Dict]:
+        """Get every sector, keyed by sector name."""
+        hit, sectors = self.cache.all()
+        if not hit:
+            sectors = [dict(row) for row in self._load(cursor)['sector_id'].values()]
+        return {sector['sector_name']: sector for sector in sectors}
+    
+    def iter_all(self, batch_size: int = 1000) -> Iterator[SectorRecord]:
+        """Iterate over all sectors, ordered by ID, as compact records."""
+        return _iter_records(self.db, SECTOR_RECORDS, SectorRecord, batch_size)
+    
+    def _lookup(self, field: str, key, cursor: Optional[sqlite3.Cursor] = None) -> Optional[Dict]:
+        """Read a sector through the cache, loading the table on a miss.
+        
+        Pass the cursor of an already checked-out connection to load on it
+        instead of borrowing another one from the pool.
+        """
+        hit, sector = self.cache.lookup(field, key)
+        if hit:
+            return sector
+        row = self._load(cursor)[field].get(key)
+        return dict(row) if row else None
+    
+    def _load(self, cursor: Optional[sqlite3.Cursor]) -> Dict[str, Dict]:
+        """Read the whole sector table into the cache."""
+        generation = self.cache.generation
+        if cursor is None:
+            with self.db.get_connection() as conn:
+                rows = [dict(row) for row in conn.execute(SECTOR_ALL)]
+        else:
+            cursor.execute(SECTOR_ALL)
+            rows = [dict(row) for row in cursor.fetchall()]
+        return self.cache.fill(rows, generation)
+    
     def update(self, sector_id: int, sector_data: Dict) -> bool:
-        """Update sector information."""
+        """Update sector information.
+        
+        Changing sector_id fails once time entries refer to the sector
+        (see migrations.LOGGED_KEYS).
+        """
         try:
             with self.db.get_connection() as conn:
                 cursor = conn.cursor()
-                cursor.execute("""
-                    UPDATE sector SET
-                        sector_id = ?,
-                        sector_name = ?,
-                        sector_wage = ?
-                    WHERE sector_id = ?
-                """, (
+                cursor.execute(SECTOR_UPDATE, (
                     sector_data['sector_id'],
                     sector_data['sector_name'],
                     sector_data['sector_wage'],
                     sector_id
                 ))
                 conn.commit()
-                logger.info(f"Updated sector {sector_id}")
+                self.cache.invalidate()
+                log_operation(logger, 'sector.update', "Updated sector %s", sector_id,
+                              sector_id=sector_id)
                 return True
         except sqlite3.Error as e:
-            logger.error(f"Failed to update sector {sector_id}: {e}")
+            logger.error("Failed to update sector %s: %s", sector_id, e)
             return False
 
 class Project:
@@ -222,14 +1181,7 @@ class Project:
             with self.db.get_connection() as conn:
                 cursor = conn.cursor()
                 # Insert into projects table
-                cursor.execute("""
-                    INSERT INTO projects (
-                        price, estimated_man_hours, project_number,
-                        welder_manhours, builder_manhours, painter_manhours,
-                        engineer_manhours, manager_manhours, fitter_manhours,
-                        current_manhours, percentage_completion, wages_payable
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, 0, 0, 0)
-                """, (
+                cursor.execute(PROJECT_INSERT, (
                     project_data['price'],
                     project_data['estimated_man_hours'],
                     project_data['project_number'],
@@ -241,18 +1193,13 @@ class Project:
                     project_data['fitter_manhours']
                 ))
                 
-                # Initialize specific_man_hours table
-                cursor.execute("""
-                    INSERT INTO specific_man_hours 
-                    (project_number, Welder, Builder, Painter, Engineer, Manager, Fitter)
-                    VALUES (?, 0, 0, 0, 0, 0, 0)
-                """, (project_data['project_number'],))
-                
                 conn.commit()
-                logger.info(f"Created project {project_data['project_number']}")
+                log_operation(logger, 'project.create', "Created project %s",
+                              project_data['project_number'],
+                              project_number=project_data['project_number'])
                 return True
         except sqlite3.Error as e:
-            logger.error(f"Failed to create project: {e}")
+            logger.error("Failed to create project: %s", e)
             return False
     
     def get_by_number(self, project_number: int) -> Optional[Dict]:
@@ -260,16 +1207,13 @@ class Project:
         try:
             with self.db.get_connection() as conn:
                 cursor = conn.cursor()
-                cursor.execute(
-                    "SELECT * FROM projects WHERE project_number = ?", 
-                    (project_number,)
-                )
+                cursor.execute(PROJECT_BY_NUMBER, (project_number,))
                 row = cursor.fetchone()
                 if row:
                     return dict(row)
                 return None
         except sqlite3.Error as e:
-            logger.error(f"Failed to get project {project_number}: {e}")
+            logger.error("Failed to get project %s: %s", project_number, e)
             return None
     
     def get_specific_manhours(self, project_number: int) -> Optional[Dict]:
@@ -277,99 +1221,488 @@ class Project:
         try:
             with self.db.get_connection() as conn:
                 cursor = conn.cursor()
-                cursor.execute(
-                    "SELECT * FROM specific_man_hours WHERE project_number = ?", 
-                    (project_number,)
-                )
+                cursor.execute(PROJECT_SPECIFIC_MANHOURS, (project_number,))
                 row = cursor.fetchone()
                 if row:
                     return dict(row)
                 return None
         except sqlite3.Error as e:
-            logger.error(f"Failed to get specific manhours for project {project_number}: {e}")
+            logger.error("Failed to get specific manhours for project %s: %s", project_number, e)
             return None
     
+    def iter_all(self, batch_size: int = 1000) -> Iterator[ProjectRecord]:
+        """Iterate over all projects, ordered by number, as compact records."""
+        return _iter_records(self.db, PROJECT_RECORDS, ProjectRecord, batch_size)
+    
+    def iter_specific_manhours(self, batch_size: int = 1000) -> Iterator[SpecificManHoursRecord]:
+        """Iterate over every project's per-trade hours as compact records.
+        
+        Not sorted: ordering the specific_man_hours view would make SQLite
+        build it in full before returning the first row.
+        """
+        return _iter_records(
+            self.db, PROJECT_SPECIFIC_MANHOURS_RECORDS, SpecificManHoursRecord, batch_size
+        )
+    
     def update_percentage(self, project_number: int, percentage: float) -> bool:
         """Update project completion percentage."""
         try:
             with self.db.get_connection() as conn:
                 cursor = conn.cursor()
-                cursor.execute("""
-                    UPDATE projects 
-                    SET percentage_completion = ?
-                    WHERE project_number = ?
-                """, (percentage, project_number))
+                cursor.execute(PROJECT_UPDATE_PERCENTAGE, (percentage, project_number))
                 conn.commit()
-                logger.info(f"Updated project {project_number} percentage to {percentage}")
+                log_operation(logger, 'project.update_percentage',
+                              "Updated project %s percentage to %s", project_number, percentage,
+                              project_number=project_number, percentage=percentage)
                 return True
         except sqlite3.Error as e:
-            logger.error(f"Failed to update project percentage: {e}")
+            logger.error("Failed to update project percentage: %s", e)
+            return False
+    
+    def recompute_completion(self, project_number: Optional[int] = None) -> bool:
+        """Set percentage_completion from the recorded hours, for one or all projects.
+        
+        Uses the same trade-weighted rule that TimeTracking applies
+        incrementally in auto_completion mode; run it when turning that
+        mode on so the increments start from a consistent value.
+        """
+        sql, params = COMPLETION_RECOMPUTE, ()
+        if project_number is not None:
+            sql, params = COMPLETION_RECOMPUTE_ONE, (project_number,)
+        try:
+            with self.db.transaction() as conn:
+                conn.execute(sql, params)
+            log_operation(logger, 'project.recompute_completion', "Recomputed completion for %s",
+                          project_number or 'all projects', project_number=project_number)
+            return True
+        except sqlite3.Error as e:
+            logger.error("Failed to recompute project completion: %s", e)
             return False
 
 class TimeTracking:
-    """Handles time tracking and wage calculations."""
+    """Handles time tracking and wage calculations.
     
-    def __init__(self, db_manager: DatabaseManager):
+    With auto_completion, recording hours also advances the project's
+    percentage_completion by the trade-weighted share of work they represent.
+    The increments assume percentage_completion already follows the rule, so
+    run Project.recompute_completion() when turning the mode on (the API
+    server and the timesheet importer do).
+    """
+    
+    def __init__(self, db_manager: DatabaseManager, auto_completion: bool = False):
         self.db = db_manager
+        self.auto_completion = auto_completion
         self.employee = Employee(db_manager)
         self.sector = Sector(db_manager)
         self.project = Project(db_manager)
     
     def record_hours(self, employee_id: int, project_number: int, hours: int) -> bool:
-        """Record hours worked by an employee on a project."""
+        """Record hours worked by an employee on a project.
+        
+        The entry is appended to the time_entries log and the project,
+        employee and per-sector counters are updated incrementally, all on a
+        single connection inside one BEGIN IMMEDIATE transaction, so the
+        entry is recorded atomically. Invalid values (see
+        validate_time_entry_data) are rejected before the transaction starts.
+        """
+        entry, error = _time_entry((employee_id, project_number, hours))
+        if entry is None:
+            logger.error("Failed to record hours: %s", error)
+            return False
+        employee_id, project_number, hours = entry
         try:
-            with self.db.get_connection() as conn:
+            with self.db.transaction() as conn:
                 cursor = conn.cursor()
                 
                 # Get employee info
-                employee_data = self.employee.get_by_id(employee_id)
+                employee_data = self.employee.cache.get(employee_id)
+                if employee_data is None:
+                    employee_data = self.employee._fetch_by_id(cursor, employee_id)
                 if not employee_data:
-                    logger.error(f"Employee {employee_id} not found")
+                    logger.error("Employee %s not found", employee_id)
                     return False
                 
                 designation = employee_data['designation']
                 
                 # Get sector wage
-                sector_data = self.sector.get_by_name(designation)
+                sector_data = self.sector._lookup('sector_name', designation, cursor)
                 if not sector_data:
-                    logger.error(f"Sector {designation} not found")
+                    logger.error("Sector %s not found", designation)
                     return False
                 
                 sector_wage = sector_data['sector_wage']
                 calculated_wage = sector_wage * hours
                 
-                # Update employee attendance and project
-                cursor.execute("""
-                    UPDATE employees 
-                    SET attendance = attendance + 1,
-                        project_number = ?
-                    WHERE id_number = ?
-                """, (project_number, employee_id))
-                
                 # Update project manhours and wages
-                cursor.execute("""
-                    UPDATE projects
-                    SET current_manhours = current_manhours + ?,
-                        wages_payable = wages_payable + ?
-                    WHERE project_number = ?
-                """, (hours, calculated_wage, project_number))
+                cursor.execute(PROJECT_ADD_HOURS, (hours, calculated_wage, project_number))
+                if cursor.rowcount == 0:
+                    logger.error("Project %s not found", project_number)
+                    conn.rollback()
+                    return False
                 
-                # Update specific manhours by designation
-                designation_column = designation.capitalize()
-                cursor.execute(f"""
-                    UPDATE specific_man_hours
-                    SET {designation_column} = {designation_column} + ?
-                    WHERE project_number = ?
-                """, (hours, project_number))
+                # Update employee attendance and project
+                cursor.execute(EMPLOYEE_RECORD_ATTENDANCE, (1, project_number, employee_id))
                 
-                conn.commit()
-                logger.info(f"Recorded {hours} hours for employee {employee_id} on project {project_number}")
-                return True
+                # Add the hours to the project's ledger row for this sector
+                cursor.execute(
+                    PROJECT_SECTOR_HOURS_UPSERT,
+                    (project_number, sector_data['sector_id'], hours)
+                )
+                if self.auto_completion:
+                    cursor.execute(COMPLETION_INCREMENT, {
+                        'project_number': project_number,
+                        'sector_id': sector_data['sector_id'],
+                        'hours': hours,
+                    })
                 
+                # Append the entry to the audit log
+                cursor.execute(TIME_ENTRY_INSERT, (
+                    employee_id, project_number, sector_data['sector_id'],
+                    hours, sector_wage, calculated_wage
+                ))
+            
+            self.employee.cache.patch(
+                employee_id, {'attendance': 1}, project_number=project_number
+            )
+            log_operation(logger, 'time.record_hours',
+                          "Recorded %s hours for employee %s on project %s",
+                          hours, employee_id, project_number, employee_id=employee_id,
+                          project_number=project_number, hours=hours, wages=calculated_wage)
+            return True
+        
         except sqlite3.Error as e:
-            logger.error(f"Failed to record hours: {e}")
+            logger.error("Failed to record hours: %s", e)
+            return False
+    
+    def record_hours_bulk(self, entries: Iterable[Tuple[int, int, int]],
+                          chunk_size: int = 1000,
+                          checkpoint: Optional[Tuple[str, int]] = None) -> List[Tuple[bool, str]]:
+        """Record many (employee_id, project_number, hours) entries at once.
+        
+        Entries are applied in chunks of chunk_size, one transaction per chunk.
+        Within a chunk the deltas are aggregated per employee, per project and
+        per project sector and written with executemany. Returns one
+        (success, error message) tuple per entry, in input order.
+        
+        A (source, byte_offset) checkpoint is saved to import_progress in the
+        transaction of the last chunk, so it commits together with it.
+        """
+        report: List[Tuple[bool, str]] = []
+        sectors: Optional[Dict[str, Dict]] = None
+        
+        chunks = _chunked(entries, chunk_size)
+        chunk = next(chunks, None)
+        while chunk is not None:
+            next_chunk = next(chunks, None)
+            try:
+                with self.db.transaction() as conn:
+                    cursor = conn.cursor()
+                    if sectors is None:
+                        # Sector wages are resolved once for the whole batch
+                        sectors = self.sector.by_name(cursor)
+                    chunk_report, employee_deltas = self._apply_chunk(
+                        cursor, chunk, sectors, self.auto_completion
+                    )
+                    if checkpoint is not None and next_chunk is None:
+                        cursor.execute(IMPORT_PROGRESS_SAVE, checkpoint)
+                for employee_id, (count, project_number) in employee_deltas.items():
+                    self.employee.cache.patch(
+                        employee_id, {'attendance': count}, project_number=project_number
+                    )
+            except sqlite3.Error as e:
+                logger.error("Failed to record chunk of %s entries: %s", len(chunk), e)
+                chunk_report = [(False, f"Database error: {e}")] * len(chunk)
+            report.extend(chunk_report)
+            chunk = next_chunk
+        
+        recorded = sum(1 for success, _ in report if success)
+        log_operation(logger, 'time.record_hours_bulk', "Bulk recorded %s of %s time entries",
+                      recorded, len(report), recorded=recorded, entries=len(report))
+        return report
+    
+    @staticmethod
+    def _apply_chunk(cursor: sqlite3.Cursor, chunk: List[Tuple[int, int, int]],
+                     sectors: Dict[str, Dict], auto_completion: bool = False
+                     ) -> Tuple[List[Tuple[bool, str]], Dict[int, List]]:
+        """Aggregate one chunk of entries in memory and write the deltas.
+        
+        Returns the per-entry report and the (attendance, last project) deltas
+        applied to each employee.
+        """
+        checked = [_time_entry(entry) for entry in chunk]
+        entries = [entry for entry, _ in checked]
+        employee_ids = {entry[0] for entry in entries if entry}
+        project_numbers = {entry[1] for entry in entries if entry}
+        designations = _select_in(cursor, EMPLOYEE_DESIGNATIONS, employee_ids)
+        existing_projects = _select_in(cursor, PROJECT_EXISTING, project_numbers)
+        
+        employee_deltas: Dict[int, List] = {}  # id -> [attendance, last project]
+        project_deltas: Dict[int, List] = {}  # project -> [hours, wages]
+        sector_deltas: Dict[Tuple[int, int], int] = {}  # (project, sector) -> hours
+        log_rows: List[Tuple] = []
+        report: List[Tuple[bool, str]] = []
+        
+        for entry, error in checked:
+            if entry is None:
+                report.append((False, error))
+                continue
+            employee_id, project_number, hours = entry
+            
+            designation = designations.get(employee_id)
+            if designation is None:
+                report.append((False, f"Employee {employee_id} not found"))
+                continue
+            sector = sectors.get(designation)
+            if sector is None:
+                report.append((False, f"Sector {designation} not found"))
+                continue
+            if project_number not in existing_projects:
+                report.append((False, f"Project {project_number} not found"))
+                continue
+            
+            employee = employee_deltas.setdefault(employee_id, [0, project_number])
+            employee[0] += 1
+            employee[1] = project_number
+            project = project_deltas.setdefault(project_number, [0, 0.0])
+            project[0] += hours
+            project[1] += sector['sector_wage'] * hours
+            key = (project_number, sector['sector_id'])
+            sector_deltas[key] = sector_deltas.get(key, 0) + hours
+            log_rows.append((
+                employee_id, project_number, sector['sector_id'],
+                hours, sector['sector_wage'], sector['sector_wage'] * hours
+            ))
+            report.append((True, ""))
+        
+        cursor.executemany(PROJECT_ADD_HOURS, [
+            (hours, wage, number) for number, (hours, wage) in project_deltas.items()
+        ])
+        cursor.executemany(EMPLOYEE_RECORD_ATTENDANCE, [
+            (count, number, eid) for eid, (count, number) in employee_deltas.items()
+        ])
+        cursor.executemany(PROJECT_SECTOR_HOURS_UPSERT, [
+            (number, sector_id, hours) for (number, sector_id), hours in sector_deltas.items()
+        ])
+        if auto_completion:
+            # The increment rule is exact for hours summed per project sector
+            cursor.executemany(COMPLETION_INCREMENT, [
+                {'project_number': number, 'sector_id': sector_id, 'hours': hours}
+                for (number, sector_id), hours in sector_deltas.items()
+            ])
+        cursor.executemany(TIME_ENTRY_INSERT, log_rows)
+        return report, employee_deltas
+    
+    def get_entries(self, employee_id: Optional[int] = None,
+                    project_number: Optional[int] = None, limit: int = 100) -> List[Dict]:
+        """Get the most recent logged time entries, optionally filtered."""
+        sql = TIME_ENTRIES_BY_FILTER[employee_id is not None, project_number is not None]
+        params = [value for value in (employee_id, project_number) if value is not None]
+        try:
+            with self.db.get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(sql, params + [limit])
+                return [dict(row) for row in cursor.fetchall()]
+        except sqlite3.Error as e:
+            logger.error("Failed to get time entries: %s", e)
+            return []
+    
+    def rebuild_aggregates(self) -> bool:
+        """Recompute every counter derived from the time_entries log.
+        
+        Resets current_manhours, wages_payable, attendance and the
+        project_sector_hours ledger, then refills them with GROUP BY
+        aggregates that SQLite computes while streaming over the log. With
+        auto_completion, percentage_completion is recomputed from them too.
+        """
+        try:
+            with self.db.transaction() as conn:
+                cursor = conn.cursor()
+                cursor.execute(REBUILD_RESET_PROJECTS)
+                cursor.execute(REBUILD_PROJECTS)
+                cursor.execute(REBUILD_RESET_EMPLOYEES)
+                cursor.execute(REBUILD_EMPLOYEES)
+                cursor.execute(REBUILD_RESET_LEDGER)
+                cursor.execute(REBUILD_LEDGER)
+                if self.auto_completion:
+                    cursor.execute(COMPLETION_RECOMPUTE)
+            self.employee.cache.clear()
+            log_operation(logger, 'time.rebuild_aggregates',
+                          "Rebuilt time tracking aggregates from time_entries")
+            return True
+        except sqlite3.Error as e:
+            logger.error("Failed to rebuild aggregates: %s", e)
             return False
 
+class GroupCommitWriter:
+    """Single writer thread that commits queued time entries in groups.
+    
+    Callers on any thread submit entries and get a Future back. The writer
+    records each group with TimeTracking.record_hours_bulk in one
+    transaction, so one commit, and one fsync, covers the whole group. A
+    group closes max_delay seconds after its first entry or at max_batch
+    entries. With the default max_delay of 0 the writer takes whatever is
+    queued as soon as it is free, and entries arriving during a commit form
+    the next group, so groups grow with load without making a lone caller
+    wait. A future resolves only after its group's commit, so a resolved
+    entry is exactly as durable as one recorded by record_hours. Cancelling
+    a future before its group starts keeps the entry out of the database.
+    """
+    
+    def __init__(self, time_tracking: TimeTracking, max_delay: float = 0.0,
+                 max_batch: int = 500):
+        if max_batch < 1:
+            raise ValueError("Batch size must be at least 1")
+        self.time_tracking = time_tracking
+        self.max_delay = max_delay
+        self.max_batch = max_batch
+        # (entries, future, single entry) submissions; None stops the writer
+        self._queue: queue.Queue = queue.Queue()
+        self._closed = False
+        self._lock = threading.Lock()
+        self._stats = {'entries': 0, 'commits': 0, 'largest_group': 0, 'cancelled': 0}
+        self._thread = threading.Thread(target=self._run, name='group-commit', daemon=True)
+        self._thread.start()
+    
+    def record_hours(self, employee_id: int, project_number: int, hours: int) -> Future:
+        """Queue one entry; the future resolves to its (success, error message)."""
+        return self._put([(employee_id, project_number, hours)], single=True)
+    
+    def submit(self, entries: Iterable[Tuple[int, int, int]]) -> Future:
+        """Queue entries to be committed in the same group.
+        
+        The future resolves to one (success, error message) per entry, in order.
+        """
+        return self._put(list(entries), single=False)
+    
+    def flush(self, timeout: Optional[float] = None):
+        """Wait until every entry submitted so far has been committed."""
+        self.submit([]).result(timeout)
+    
+    def _put(self, entries: List[Tuple[int, int, int]], single: bool) -> Future:
+        future: Future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("GroupCommitWriter is closed")
+            self._queue.put((entries, future, single))
+        return future
+    
+    def _run(self):
+        """Writer thread: collect groups and commit them until closed."""
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            group, size, stop = [item], len(item[0]), False
+            deadline = time.monotonic() + self.max_delay
+            while size < self.max_batch:
+                remaining = deadline - time.monotonic()
+                try:
+                    # Past the deadline, still take whatever is already queued
+                    item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                group.append(item)
+                size += len(item[0])
+            self._commit(group)
+            if stop:
+                return
+    
+    def _commit(self, group: List[Tuple[List[Tuple[int, int, int]], Future, bool]]):
+        """Record one group in a single transaction and resolve its futures."""
+        submitted = len(group)
+        group = [item for item in group if item[1].set_running_or_notify_cancel()]
+        entries = [entry for submission, _, _ in group for entry in submission]
+        try:
+            report = self.time_tracking.record_hours_bulk(entries, max(len(entries), 1)) if entries else []
+        except Exception as e:
+            logger.exception("Group commit of %s entries failed", len(entries))
+            for _, future, _ in group:
+                future.set_exception(e)
+            return
+        with self._lock:
+            self._stats['entries'] += len(entries)
+            self._stats['commits'] += 1 if entries else 0
+            self._stats['cancelled'] += submitted - len(group)
+            self._stats['largest_group'] = max(self._stats['largest_group'], len(entries))
+        start = 0
+        for submission, future, single in group:
+            results = report[start:start + len(submission)]
+            start += len(submission)
+            future.set_result(results[0] if single else results)
+    
+    def stats(self) -> Dict[str, int]:
+        """Get group commit statistics."""
+        with self._lock:
+            return dict(self._stats, pending=self._queue.qsize())
+    
+    def close(self, timeout: Optional[float] = None):
+        """Commit everything already submitted, then stop the writer thread."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(None)
+        self._thread.join(timeout)
+
+def _time_entry(entry) -> Tuple[Optional[Tuple[int, int, int]], str]:
+    """Validate one (employee_id, project_number, hours) entry and convert it to ints.
+    
+    Returns the entry and "", or None and the reason it was rejected.
+    """
+    if not isinstance(entry, (tuple, list)) or len(entry) != 3:
+        return None, f"Invalid entry: {entry!r}"
+    fields = ('employee_id', 'project_number', 'hours')
+    is_valid, error = validate_time_entry_data(dict(zip(fields, entry)))
+    if not is_valid:
+        return None, f"Invalid entry {entry!r}: {error}"
+    return tuple(int(value) for value in entry), ""
+
+def _chunked(iterable: Iterable, size: int) -> Iterator[List]:
+    """Yield successive lists of at most size items from an iterable."""
+    if size < 1:
+        raise ValueError("Chunk size must be at least 1")
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+def _iter_records(db: DatabaseManager, sql: str, record_type, batch_size: int) -> Iterator:
+    """Stream a query's rows as record_type instances, batch_size rows at a time.
+    
+    One query on one pooled connection, held until the iterator is exhausted
+    or closed; a keyset loop would re-run the specific_man_hours view for
+    every batch. On a database error the iteration stops and is logged.
+    """
+    if batch_size < 1:
+        raise ValueError("Batch size must be at least 1")
+    def records():
+        try:
+            with db.get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.row_factory = record_factory(record_type)
+                cursor.execute(sql)
+                while True:
+                    batch = cursor.fetchmany(batch_size)
+                    if not batch:
+                        return
+                    yield from batch
+        except sqlite3.Error as e:
+            logger.error("Failed to iterate %s records: %s", record_type.__name__, e)
+    return records()
+
+def _select_in(cursor: sqlite3.Cursor, sql: str, keys) -> Dict:
+    """Run a two-column SELECT filtered by a json_each(?) key list and return it as a dict."""
+    keys = list(keys)
+    if not keys:
+        return {}
+    cursor.execute(sql, (json.dumps(keys),))
+    return {row[0]: row[1] for row in cursor.fetchall()}
+
 # Validation functions
 def validate_employee_data(data: Dict) -> Tuple[bool, str]:
     """Validate employee data."""
@@ -412,4 +1745,31 @@ def validate_sector_data(data: Dict) -> Tuple[bool, str]:
     if data['sector_wage'] < 0:
         return False, "Wage cannot be negative"
     
-    return True, ""
\ No newline at end of file
+    return True, ""
+
+def validate_time_entry_data(data: Dict) -> Tuple[bool, str]:
+    """Validate a time entry (employee_id, project_number, hours)."""
+    required_fields = ['employee_id', 'project_number', 'hours']
+    
+    for field in required_fields:
+        if field not in data or data[field] in (None, ""):
+            return False, f"Missing required field: {field}"
+    
+    # int() would silently truncate a fractional JSON number such as 1.5
+    if any(isinstance(data[field], float) and not data[field].is_integer() for field in required_fields):
+        return False, "Employee ID, project number and hours must be whole numbers"
+    
+    try:
+        employee_id = int(data['employee_id'])
+        project_number = int(data['project_number'])
+        hours = int(data['hours'])
+    except (TypeError, ValueError):
+        return False, "Invalid numeric values"
+    
+    if employee_id <= 0 or project_number <= 0:
+        return False, "Employee ID and project number must be positive"
+    
+    if hours <= 0 or hours > 24:
+        return False, "Hours must be between 1 and 24"
+    
+    return True, ""
@@ -0,0 +1,181 @@
+"""
+Payroll totals from the time_entries log, computed in parallel.
+Splits the log into partitions and aggregates each one in a separate
+process, on its own read-only connection, into hours and wages per project,
+employee or month and per trade. The partial aggregates are then merged.
+
+Projects and months have few groups, so the log is split into entry_id
+ranges: each worker scans one contiguous stretch of the table and the
+partials are small to merge. Employees have nearly as many groups as a
+range has entries, so there each worker scans the whole log for the
+employees whose id falls in its residue class instead; the partials are
+disjoint and nothing is added up twice. Either way every worker only sees
+entries up to the highest entry_id read at the start, so all of them work
+on the same snapshot while new entries keep arriving.
+
+Usage:
+    python payroll.py [--db iscon.db] [--by project|employee|month] [--workers N]
+"""
+
+import argparse
+import json
+import logging
+import os
+import sqlite3
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import quote
+
+from logging_config import setup_logging, stop_logging
+
+logger = logging.getLogger(__name__)
+
+# Grouping key expressions over time_entries
+GROUP_KEYS = {
+    'project': 'project_number',
+    'employee': 'employee_id',
+    'month': 'substr(recorded_at, 1, 7)',
+}
+
+# Groupings split by key rather than by entry_id range
+SPLIT_BY_KEY = {'employee'}
+
+# Trade name for entries without a sector (opening balances)
+UNASSIGNED = 'Unassigned'
+
+# (key, sector_id) -> [hours, wages, attendance, entries]
+Partial = Dict[Tuple[object, Optional[int]], List]
+
+def connect_readonly(db_path: str) -> sqlite3.Connection:
+    """Open a read-only connection; writes through it fail with OperationalError."""
+    return sqlite3.connect(f"file:{quote(os.path.abspath(db_path))}?mode=ro", uri=True)
+
+def aggregate_range(db_path: str, group_by: str, first_id: int, last_id: int,
+                    modulus: int = 1, remainder: int = 0) -> Partial:
+    """Sum the entries with first_id <= entry_id <= last_id per group and sector.
+    
+    With modulus > 1 only groups whose key % modulus == remainder are
+    summed. Runs in a worker process; entries whose group key is NULL are
+    skipped.
+    """
+    key = GROUP_KEYS[group_by]
+    where, params = f"entry_id BETWEEN ? AND ? AND {key} IS NOT NULL", [first_id, last_id]
+    if modulus > 1:
+        where += f" AND {key} % ? = ?"
+        params += [modulus, remainder]
+    conn = connect_readonly(db_path)
+    try:
+        rows = conn.execute(f"""
+            SELECT {key}, sector_id, SUM(hours), SUM(wages), SUM(attendance), COUNT(*)
+            FROM time_entries
+            WHERE {where}
+            GROUP BY 1, 2
+        """, params).fetchall()
+    finally:
+        conn.close()
+    return {(group, sector_id): list(totals) for group, sector_id, *totals in rows}
+
+def partition(first_id: int, last_id: int, partitions: int) -> List[Tuple[int, int]]:
+    """Split an inclusive id range into at most partitions contiguous ranges."""
+    count = last_id - first_id + 1
+    if count <= 0:
+        return []
+    partitions = max(1, min(partitions, count))
+    bounds = [first_id + count * n // partitions for n in range(partitions + 1)]
+    return [(low, high - 1) for low, high in zip(bounds, bounds[1:])]
+
+def merge(partials) -> Partial:
+    """Add up partial aggregates."""
+    merged: Partial = {}
+    for partial in partials:
+        for group, totals in partial.items():
+            current = merged.get(group)
+            if current is None:
+                merged[group] = totals
+            else:
+                for i, value in enumerate(totals):
+                    current[i] += value
+    return merged
+
+def compute_payroll(db_path: str, group_by: str = 'project', workers: Optional[int] = None,
+                    partitions: Optional[int] = None) -> Dict[object, Dict]:
+    """Compute payroll totals per project, employee or month.
+    
+    Returns {group: {'hours', 'wages', 'attendance', 'entries', 'trades'}}
+    where trades maps each sector name to its hours and wages. workers
+    defaults to the CPU count; workers=1 aggregates in this process.
+    partitions defaults to one per worker, as every extra partition adds
+    partial groups to merge.
+    """
+    if group_by not in GROUP_KEYS:
+        raise ValueError(f"Unknown grouping: {group_by}")
+    workers = workers or os.cpu_count() or 1
+    conn = connect_readonly(db_path)
+    try:
+        first_id, last_id = conn.execute("SELECT MIN(entry_id), MAX(entry_id) FROM time_entries").fetchone()
+        sector_names = dict(conn.execute("SELECT sector_id, sector_name FROM sector"))
+    finally:
+        conn.close()
+    if first_id is None:
+        return {}
+    
+    partitions = partitions or workers
+    if group_by in SPLIT_BY_KEY:
+        tasks = [(db_path, group_by, first_id, last_id, partitions, remainder)
+                 for remainder in range(partitions)]
+    else:
+        tasks = [(db_path, group_by, low, high) for low, high in partition(first_id, last_id, partitions)]
+    if workers == 1:
+        partials = [aggregate_range(*task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            partials = list(executor.map(aggregate_range, *zip(*tasks)))
+    
+    payroll: Dict[object, Dict] = {}
+    for (group, sector_id), (hours, wages, attendance, entries) in merge(partials).items():
+        totals = payroll.setdefault(group, {'hours': 0, 'wages': 0.0, 'attendance': 0,
+                                            'entries': 0, 'trades': {}})
+        totals['hours'] += hours
+        totals['wages'] += wages
+        totals['attendance'] += attendance
+        totals['entries'] += entries
+        trade = sector_names.get(sector_id) or UNASSIGNED
+        trade_totals = totals['trades'].setdefault(trade, {'hours': 0, 'wages': 0.0})
+        trade_totals['hours'] += hours
+        trade_totals['wages'] += wages
+    return payroll
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Compute payroll totals from the time entry log.")
+    parser.add_argument('--db', default='iscon.db', help="database file (default: iscon.db)")
+    parser.add_argument('--by', choices=sorted(GROUP_KEYS), default='project', help="grouping")
+    parser.add_argument('--workers', type=int, help="worker processes (default: CPU count)")
+    parser.add_argument('--partitions', type=int, help="partitions (default: one per worker)")
+    parser.add_argument('--output', help="write the full payroll as JSON to this file")
+    args = parser.parse_args(argv)
+    
+    log_listener = setup_logging(log_file=None)
+    started = time.perf_counter()
+    try:
+        payroll = compute_payroll(args.db, args.by, args.workers, args.partitions)
+        logger.info("Computed payroll for %s groups in %.2f s", len(payroll),
+                    time.perf_counter() - started)
+    except sqlite3.Error as e:
+        logger.error("Failed to compute payroll: %s", e)
+        return 1
+    finally:
+        stop_logging(log_listener)
+    
+    for group in sorted(payroll, key=str):
+        totals = payroll[group]
+        print(f"{args.by} {group}: {totals['hours']} hours, {totals['wages']:.2f} wages")
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({str(group): totals for group, totals in payroll.items()}, f, indent=2)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,65 @@
+"""
+Compact, typed row records for the project management tables.
+Each record is a NamedTuple: a tuple with named fields, so it has no
+per-instance __dict__. record_factory builds one from each result row
+with a single call to the record type's _make, which still runs as Python
+code once per row. Fields are in table column order.
+"""
+
+import sqlite3
+from typing import Callable, NamedTuple, Optional, Type
+
+class EmployeeRecord(NamedTuple):
+    """One row of the employees table."""
+    id_number: int
+    full_name: Optional[str]
+    hour_per_week: Optional[int]
+    salary: Optional[float]
+    designation: Optional[str]
+    project_number: Optional[int]
+    attendance: Optional[int]
+
+class SectorRecord(NamedTuple):
+    """One row of the sector table."""
+    sector_id: int
+    sector_name: Optional[str]
+    sector_wage: Optional[float]
+
+class ProjectRecord(NamedTuple):
+    """One row of the projects table."""
+    price: Optional[float]
+    estimated_man_hours: Optional[int]
+    current_manhours: Optional[int]
+    percentage_completion: Optional[float]
+    project_number: int
+    welder_manhours: Optional[int]
+    builder_manhours: Optional[int]
+    painter_manhours: Optional[int]
+    engineer_manhours: Optional[int]
+    manager_manhours: Optional[int]
+    fitter_manhours: Optional[int]
+    wages_payable: Optional[float]
+
+class SpecificManHoursRecord(NamedTuple):
+    """Per-trade hours of one project (the specific_man_hours view)."""
+    project_number: int
+    Welder: int
+    Builder: int
+    Painter: int
+    Engineer: int
+    Manager: int
+    Fitter: int
+
+def record_columns(record_type: Type[NamedTuple]) -> str:
+    """Column list selecting a table's columns in record_type's field order."""
+    return ", ".join(f'"{field}"' for field in record_type._fields)
+
+def record_factory(record_type: Type[NamedTuple]) -> Callable[[sqlite3.Cursor, tuple], NamedTuple]:
+    """Row factory building record_type instances directly from result tuples.
+    
+    The query must select record_columns(record_type).
+    """
+    make = record_type._make
+    def factory(cursor: sqlite3.Cursor, row: tuple) -> NamedTuple:
+        return make(row)
+    return factory
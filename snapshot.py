@@ -0,0 +1,217 @@
+"""
+Columnar snapshots of iscon.db for reporting.
+Copies the live database with the SQLite online backup API (see
+DatabaseManager.backup), then writes every column of the reporting tables
+as a NumPy .npy file, so reports can memory-map the snapshot instead of
+querying the database that is taking writes. Loading a column maps the
+file read-only without copying it and without touching SQLite at all.
+
+A snapshot is a directory:
+
+    manifest.json             tables, columns, dtypes, row counts, source
+    <table>/<column>.npy      one array per column, rows in key order
+
+Integer columns without NULLs are int64, numeric columns with NULLs are
+float64 with NaN, text columns are fixed-width unicode with '' for NULL.
+Each export is built in a hidden versioned directory next to the target,
+and the target is a symlink that is atomically replaced to point at it, so
+a reader always opens either the old snapshot or the new one. The previous
+version is kept until the next export, so a reader that opened it can
+still map its columns after a newer snapshot is published.
+
+Requires numpy (optional dependency, see requirements.txt).
+
+Usage:
+    python snapshot.py [--db iscon.db] [--output snapshot] [--keep-db]
+"""
+
+import argparse
+import json
+import logging
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from logging_config import setup_logging, stop_logging
+from models import DatabaseManager
+
+logger = logging.getLogger(__name__)
+
+# Reporting tables and the key their rows are ordered by
+SNAPSHOT_TABLES = {
+    'employees': 'id_number',
+    'projects': 'project_number',
+    'specific_man_hours': 'project_number',
+    'sector': 'sector_id',
+    'time_entries': 'entry_id',
+}
+
+# Tables exported with only some of their columns; the time_entries log
+# is the largest table and analytics needs just these for its daily rates
+SNAPSHOT_COLUMNS = {
+    'time_entries': ('entry_id', 'recorded_at', 'employee_id', 'project_number', 'hours', 'wages'),
+}
+
+MANIFEST = 'manifest.json'
+
+# File name of the database copy kept with keep_database=True
+DATABASE_COPY = 'iscon.db'
+
+def column_array(values: List) -> np.ndarray:
+    """Convert one column of SQLite values to a memory-mappable array."""
+    kinds = {type(value) for value in values if value is not None}
+    if kinds <= {int} and kinds and None not in values:
+        return np.array(values, dtype=np.int64)
+    if kinds <= {int, float}:
+        # NULLs become NaN in a float array
+        return np.array(values, dtype=np.float64)
+    return np.array(['' if value is None else str(value) for value in values], dtype=np.str_)
+
+def _write_table(conn: sqlite3.Connection, table: str, key: str, directory: str) -> Dict:
+    """Write the columns of table (see SNAPSHOT_COLUMNS) as <directory>/<table>/<column>.npy."""
+    selected = ', '.join(f'"{name}"' for name in SNAPSHOT_COLUMNS.get(table, ())) or '*'
+    cursor = conn.execute(f'SELECT {selected} FROM "{table}" ORDER BY "{key}"')
+    names = [description[0] for description in cursor.description]
+    rows = cursor.fetchall()
+    os.makedirs(os.path.join(directory, table))
+    columns = {}
+    for name, values in zip(names, zip(*rows) if rows else [()] * len(names)):
+        array = column_array(list(values))
+        np.save(os.path.join(directory, table, f"{name}.npy"), array)
+        columns[name] = array.dtype.str
+    return {'rows': len(rows), 'columns': columns}
+
+def _version_prefix(directory: str) -> str:
+    """Name prefix of the hidden versioned directories behind a snapshot link."""
+    return f".{os.path.basename(directory)}-"
+
+def _publish(staging: str, directory: str):
+    """Point the directory link at a finished snapshot with one atomic rename.
+    
+    Keeps the version the link pointed at before and removes older ones.
+    """
+    parent = os.path.dirname(directory)
+    previous = None
+    if os.path.islink(directory):
+        previous = os.path.realpath(directory)
+    elif os.path.exists(directory):
+        # A snapshot exported before versioned directories; moving it aside
+        # is not atomic, but only happens once
+        previous = f"{staging}-old"
+        os.replace(directory, previous)
+    link = f"{staging}.link"
+    # Relative, so the parent directory can be moved or mounted elsewhere
+    os.symlink(os.path.basename(staging), link)
+    os.replace(link, directory)
+    
+    keep = {os.path.realpath(path) for path in (staging, previous) if path}
+    for name in os.listdir(parent):
+        version = os.path.join(parent, name)
+        # Only finished versions; a concurrent export's staging has no manifest yet
+        if (name.startswith(_version_prefix(directory)) and os.path.realpath(version) not in keep
+                and os.path.isfile(os.path.join(version, MANIFEST))):
+            shutil.rmtree(version, ignore_errors=True)
+
+def export_snapshot(db_manager: DatabaseManager, directory: str,
+                    keep_database: bool = False) -> Optional[Dict]:
+    """Back up the database and write a columnar snapshot to directory.
+    
+    The backup only reads the live database and does not block writers
+    in WAL mode; the columns are then read from the copy. With
+    keep_database the copy is kept in the snapshot as iscon.db for ad-hoc
+    SQL. Returns the manifest, or None if the export failed.
+    """
+    directory = os.path.abspath(directory)
+    parent = os.path.dirname(directory)
+    os.makedirs(parent, exist_ok=True)
+    staging = tempfile.mkdtemp(prefix=_version_prefix(directory), dir=parent)
+    copy_path = os.path.join(staging, DATABASE_COPY)
+    started = time.perf_counter()
+    try:
+        db_manager.backup(copy_path)
+        copy = sqlite3.connect(copy_path)
+        try:
+            manifest = {
+                'created_at': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+                'source': os.path.abspath(db_manager.db_path),
+                'schema_version': copy.execute('PRAGMA user_version').fetchone()[0],
+                'tables': {table: _write_table(copy, table, key, staging)
+                           for table, key in SNAPSHOT_TABLES.items()},
+            }
+        finally:
+            copy.close()
+        if not keep_database:
+            os.unlink(copy_path)
+        with open(os.path.join(staging, MANIFEST), 'w') as f:
+            json.dump(manifest, f, indent=2)
+        _publish(staging, directory)
+    except (sqlite3.Error, OSError) as e:
+        logger.error("Failed to export snapshot to %s: %s", directory, e)
+        shutil.rmtree(staging, ignore_errors=True)
+        return None
+    logger.info("Exported snapshot to %s in %.2f s", directory, time.perf_counter() - started)
+    return manifest
+
+class Snapshot:
+    """Read-only view of an exported snapshot; columns are memory-mapped on access.
+    
+    The snapshot link is resolved once, so columns mapped later still come
+    from the version whose manifest was read.
+    """
+    
+    def __init__(self, directory: str):
+        self.directory = os.path.realpath(directory)
+        with open(os.path.join(directory, MANIFEST)) as f:
+            self.manifest = json.load(f)
+    
+    @property
+    def tables(self) -> List[str]:
+        return list(self.manifest['tables'])
+    
+    def rows(self, table: str) -> int:
+        """Number of rows in table."""
+        return self.manifest['tables'][table]['rows']
+    
+    def columns(self, table: str) -> List[str]:
+        """Column names of table, in database order."""
+        return list(self.manifest['tables'][table]['columns'])
+    
+    def column(self, table: str, name: str) -> np.ndarray:
+        """Map one column without reading it into memory."""
+        if name not in self.manifest['tables'][table]['columns']:
+            raise KeyError(f"{table}.{name}")
+        return np.load(os.path.join(self.directory, table, f"{name}.npy"), mmap_mode='r')
+    
+    def table(self, table: str) -> Dict[str, np.ndarray]:
+        """Map every column of table."""
+        return {name: self.column(table, name) for name in self.columns(table)}
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Export a columnar reporting snapshot.")
+    parser.add_argument('--db', default='iscon.db', help="database file (default: iscon.db)")
+    parser.add_argument('--output', default='snapshot', help="snapshot directory (default: snapshot)")
+    parser.add_argument('--keep-db', action='store_true', help="keep the database copy in the snapshot")
+    args = parser.parse_args(argv)
+    
+    log_listener = setup_logging(log_file=None)
+    db_manager = DatabaseManager(args.db)
+    try:
+        manifest = export_snapshot(db_manager, args.output, args.keep_db)
+    finally:
+        db_manager.close()
+        stop_logging(log_listener)
+    if manifest is None:
+        return 1
+    for table, info in manifest['tables'].items():
+        print(f"{table}: {info['rows']} rows, {len(info['columns'])} columns")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,293 @@
+"""
+Registry of the named, parameterized SQL statements run by models.py.
+Every statement is a constant string, so sqlite3 compiles it once per pooled
+connection and serves later executions from the connection's statement cache
+(see DatabaseManager's statement_cache_size). Values are always bound as
+parameters, never formatted into the SQL.
+"""
+
+from typing import Dict, Optional
+
+from migrations import TRADE_COLUMNS
+from records import (
+    EmployeeRecord, ProjectRecord, SectorRecord, SpecificManHoursRecord, record_columns
+)
+
+# name -> SQL, in registration order
+STATEMENTS: Dict[str, str] = {}
+_NAMES: Dict[str, str] = {}
+
+def register(name: str, sql: str) -> str:
+    """Add a statement to the registry under a unique name and return its SQL."""
+    if name in STATEMENTS:
+        raise ValueError(f"Statement {name} is already registered")
+    STATEMENTS[name] = sql
+    _NAMES[sql] = name
+    return sql
+
+def statement_name(sql: str) -> Optional[str]:
+    """Get the registered name of a statement's SQL, or None if it is not registered."""
+    return _NAMES.get(sql)
+
+# Employees
+EMPLOYEE_INSERT = register('employee.insert', """
+    INSERT INTO employees
+    (id_number, full_name, hour_per_week, salary, designation, project_number, attendance)
+    VALUES (?, ?, ?, ?, ?, ?, 0)
+""")
+EMPLOYEE_BY_ID = register('employee.by_id', "SELECT * FROM employees WHERE id_number = ?")
+EMPLOYEE_UPDATE = register('employee.update', """
+    UPDATE employees SET
+        id_number = ?,
+        full_name = ?,
+        hour_per_week = ?,
+        salary = ?,
+        designation = ?,
+        project_number = ?,
+        attendance = ?
+    WHERE id_number = ?
+""")
+EMPLOYEE_ALL = register('employee.all', "SELECT * FROM employees")
+EMPLOYEE_RECORDS = register(
+    'employee.records',
+    f"SELECT {record_columns(EmployeeRecord)} FROM employees ORDER BY id_number"
+)
+EMPLOYEE_COUNT = register('employee.count', "SELECT COUNT(*) FROM employees")
+EMPLOYEE_FIRST_PAGE = register(
+    'employee.first_page', "SELECT * FROM employees ORDER BY id_number LIMIT ?"
+)
+EMPLOYEE_PAGE_AFTER = register(
+    'employee.page_after',
+    "SELECT * FROM employees WHERE id_number > ? ORDER BY id_number LIMIT ?"
+)
+EMPLOYEE_PAGE_AT = register(
+    'employee.page_at', "SELECT * FROM employees ORDER BY id_number LIMIT ? OFFSET ?"
+)
+EMPLOYEE_SEARCH_INDEX_EXISTS = register(
+    'employee.search_index_exists',
+    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'employee_search'"
+)
+EMPLOYEE_SEARCH_FTS = register('employee.search_fts', """
+    SELECT employees.* FROM employee_search
+    JOIN employees ON employees.id_number = employee_search.rowid
+    WHERE employee_search MATCH ?
+    LIMIT ?
+""")
+EMPLOYEE_SEARCH_PREFIX = register('employee.search_prefix', """
+    SELECT * FROM employees
+    WHERE full_name LIKE ? ESCAPE '\\'
+    ORDER BY full_name COLLATE NOCASE
+    LIMIT ?
+""")
+EMPLOYEE_RECORD_ATTENDANCE = register('employee.record_attendance', """
+    UPDATE employees
+    SET attendance = attendance + ?,
+        project_number = ?
+    WHERE id_number = ?
+""")
+# Designations of a JSON array of ids: one statement whatever the batch size,
+# where an IN (?, ?, ...) list would compile a new statement per length
+EMPLOYEE_DESIGNATIONS = register('employee.designations', """
+    SELECT id_number, designation FROM employees
+    WHERE id_number IN (SELECT value FROM json_each(?))
+""")
+
+# Sectors
+SECTOR_INSERT = register('sector.insert', """
+    INSERT INTO sector (sector_id, sector_name, sector_wage)
+    VALUES (?, ?, ?)
+""")
+SECTOR_ALL = register('sector.all', "SELECT * FROM sector")
+SECTOR_RECORDS = register(
+    'sector.records', f"SELECT {record_columns(SectorRecord)} FROM sector ORDER BY sector_id"
+)
+SECTOR_UPDATE = register('sector.update', """
+    UPDATE sector SET
+        sector_id = ?,
+        sector_name = ?,
+        sector_wage = ?
+    WHERE sector_id = ?
+""")
+
+# Projects
+PROJECT_INSERT = register('project.insert', """
+    INSERT INTO projects (
+        price, estimated_man_hours, project_number,
+        welder_manhours, builder_manhours, painter_manhours,
+        engineer_manhours, manager_manhours, fitter_manhours,
+        current_manhours, percentage_completion, wages_payable
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, 0, 0, 0)
+""")
+PROJECT_BY_NUMBER = register('project.by_number', "SELECT * FROM projects WHERE project_number = ?")
+PROJECT_SPECIFIC_MANHOURS = register(
+    'project.specific_manhours', "SELECT * FROM specific_man_hours WHERE project_number = ?"
+)
+PROJECT_RECORDS = register(
+    'project.records',
+    f"SELECT {record_columns(ProjectRecord)} FROM projects ORDER BY project_number"
+)
+# Not sorted: ordering the view would make SQLite build it in full first
+PROJECT_SPECIFIC_MANHOURS_RECORDS = register(
+    'project.specific_manhours_records',
+    f"SELECT {record_columns(SpecificManHoursRecord)} FROM specific_man_hours"
+)
+PROJECT_UPDATE_PERCENTAGE = register('project.update_percentage', """
+    UPDATE projects
+    SET percentage_completion = ?
+    WHERE project_number = ?
+""")
+PROJECT_ADD_HOURS = register('project.add_hours', """
+    UPDATE projects
+    SET current_manhours = current_manhours + ?,
+        wages_payable = wages_payable + ?
+    WHERE project_number = ?
+""")
+PROJECT_EXISTING = register('project.existing', """
+    SELECT project_number, 1 FROM projects
+    WHERE project_number IN (SELECT value FROM json_each(?))
+""")
+
+# Adds hours to a project's per-sector ledger row, creating it on first use.
+# specific_man_hours is a view over this table (see migrations.py).
+PROJECT_SECTOR_HOURS_UPSERT = register('project_sector_hours.upsert', """
+    INSERT INTO project_sector_hours (project_number, sector_id, hours)
+    VALUES (?, ?, ?)
+    ON CONFLICT (project_number, sector_id) DO UPDATE SET hours = hours + excluded.hours
+""")
+
+# Trade-weighted completion: each trade's hours count towards completion up
+# to that trade's estimate (projects.<trade>_manhours), so completion is
+# sum(min(actual, estimate)) / sum(estimate) over the trades. Projects
+# without per-trade estimates use current_manhours / estimated_man_hours.
+_TRADE_ESTIMATE_TOTAL = " + ".join(
+    f"COALESCE({trade.lower()}_manhours, 0)" for trade in TRADE_COLUMNS
+)
+_SECTOR_TRADE_ESTIMATE = (
+    "CASE (SELECT sector_name FROM sector WHERE sector_id = :sector_id) COLLATE NOCASE "
+    + " ".join(f"WHEN '{trade}' THEN COALESCE({trade.lower()}_manhours, 0)" for trade in TRADE_COLUMNS)
+    + " ELSE 0 END"
+)
+_HOURS_COMPLETION = """
+        WHEN estimated_man_hours > 0
+            THEN MIN(100.0 * current_manhours / estimated_man_hours, 100.0)
+        ELSE percentage_completion"""
+
+# Adds the completion earned by :hours just added to the project's ledger row
+# for :sector_id. Reads one ledger row and one project row, whatever the
+# project's history; run it after the ledger UPSERT and the project update.
+COMPLETION_INCREMENT = register('project.completion_increment', f"""
+    UPDATE projects
+    SET percentage_completion = CASE
+        WHEN {_TRADE_ESTIMATE_TOTAL} > 0 THEN MIN(100.0,
+            COALESCE(percentage_completion, 0) + 100.0 * (
+                MIN(ledger.hours, {_SECTOR_TRADE_ESTIMATE})
+                - MIN(ledger.hours - :hours, {_SECTOR_TRADE_ESTIMATE})
+            ) / ({_TRADE_ESTIMATE_TOTAL})
+        ){_HOURS_COMPLETION}
+    END
+    FROM (
+        SELECT hours FROM project_sector_hours
+        WHERE project_number = :project_number AND sector_id = :sector_id
+    ) AS ledger
+    WHERE projects.project_number = :project_number
+""")
+
+# Recomputes completion from scratch from the per-trade hours
+_COMPLETION_RECOMPUTE = f"""
+    UPDATE projects
+    SET percentage_completion = CASE
+        WHEN {_TRADE_ESTIMATE_TOTAL} > 0 THEN MIN(100.0, 100.0 * ({" + ".join(
+            f"MIN(trades.{trade}, COALESCE({trade.lower()}_manhours, 0))" for trade in TRADE_COLUMNS
+        )}) / ({_TRADE_ESTIMATE_TOTAL})){_HOURS_COMPLETION}
+    END
+    FROM specific_man_hours AS trades
+    WHERE projects.project_number = trades.project_number
+"""
+COMPLETION_RECOMPUTE = register('project.completion_recompute', _COMPLETION_RECOMPUTE)
+COMPLETION_RECOMPUTE_ONE = register(
+    'project.completion_recompute_one',
+    _COMPLETION_RECOMPUTE + "    AND projects.project_number = ?\n"
+)
+
+# Time entries. Appends one entry to the time_entries log (see migrations.py).
+TIME_ENTRY_INSERT = register('time_entry.insert', """
+    INSERT INTO time_entries
+    (employee_id, project_number, sector_id, hours, wage_rate, wages, attendance)
+    VALUES (?, ?, ?, ?, ?, ?, 1)
+""")
+# Most recent entries, one statement per combination of filters
+TIME_ENTRIES = register(
+    'time_entry.latest', "SELECT * FROM time_entries ORDER BY entry_id DESC LIMIT ?"
+)
+TIME_ENTRIES_BY_EMPLOYEE = register('time_entry.latest_by_employee', """
+    SELECT * FROM time_entries WHERE employee_id = ?
+    ORDER BY entry_id DESC LIMIT ?
+""")
+TIME_ENTRIES_BY_PROJECT = register('time_entry.latest_by_project', """
+    SELECT * FROM time_entries WHERE project_number = ?
+    ORDER BY entry_id DESC LIMIT ?
+""")
+TIME_ENTRIES_BY_EMPLOYEE_AND_PROJECT = register('time_entry.latest_by_employee_and_project', """
+    SELECT * FROM time_entries WHERE employee_id = ? AND project_number = ?
+    ORDER BY entry_id DESC LIMIT ?
+""")
+
+# (filter by employee, filter by project) -> statement
+TIME_ENTRIES_BY_FILTER = {
+    (False, False): TIME_ENTRIES,
+    (True, False): TIME_ENTRIES_BY_EMPLOYEE,
+    (False, True): TIME_ENTRIES_BY_PROJECT,
+    (True, True): TIME_ENTRIES_BY_EMPLOYEE_AND_PROJECT,
+}
+
+# Timesheet import resume points (see migrations.IMPORT_PROGRESS)
+IMPORT_PROGRESS_GET = register(
+    'import_progress.get', "SELECT byte_offset FROM import_progress WHERE source = ?"
+)
+IMPORT_PROGRESS_SAVE = register('import_progress.save', """
+    INSERT INTO import_progress (source, byte_offset) VALUES (?, ?)
+    ON CONFLICT (source) DO UPDATE SET
+        byte_offset = excluded.byte_offset,
+        updated_at = strftime('%Y-%m-%dT%H:%M:%fZ', 'now')
+""")
+IMPORT_PROGRESS_CLEAR = register(
+    'import_progress.clear', "DELETE FROM import_progress WHERE source = ?"
+)
+
+# Rebuilding the counters derived from the time_entries log
+REBUILD_RESET_PROJECTS = register(
+    'rebuild.reset_projects', "UPDATE projects SET current_manhours = 0, wages_payable = 0"
+)
+REBUILD_PROJECTS = register('rebuild.projects', """
+    UPDATE projects
+    SET current_manhours = totals.hours,
+        wages_payable = totals.wages
+    FROM (
+        SELECT project_number, SUM(hours) AS hours, SUM(wages) AS wages
+        FROM time_entries
+        WHERE project_number IS NOT NULL
+        GROUP BY project_number
+    ) AS totals
+    WHERE projects.project_number = totals.project_number
+""")
+REBUILD_RESET_EMPLOYEES = register('rebuild.reset_employees', "UPDATE employees SET attendance = 0")
+REBUILD_EMPLOYEES = register('rebuild.employees', """
+    UPDATE employees
+    SET attendance = totals.attendance
+    FROM (
+        SELECT employee_id, SUM(attendance) AS attendance
+        FROM time_entries
+        WHERE employee_id IS NOT NULL
+        GROUP BY employee_id
+    ) AS totals
+    WHERE employees.id_number = totals.employee_id
+""")
+REBUILD_RESET_LEDGER = register('rebuild.reset_ledger', "DELETE FROM project_sector_hours")
+REBUILD_LEDGER = register('rebuild.ledger', """
+    INSERT INTO project_sector_hours (project_number, sector_id, hours)
+    SELECT project_number, sector_id, SUM(hours)
+    FROM time_entries
+    WHERE project_number IN (SELECT project_number FROM projects)
+      AND sector_id IN (SELECT sector_id FROM sector)
+    GROUP BY project_number, sector_id
+""")
@@ -0,0 +1,133 @@
+"""
+Unit tests for the analytics module.
+"""
+
+import math
+import os
+import sqlite3
+import tempfile
+import unittest
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from migrations import migrate
+from models import DatabaseManager
+
+if np is not None:
+    from analytics import compute_metrics, load_portfolio, summarize, top_overruns
+
+# 2026-01-11T00:00:00Z
+AS_OF = 1768089600.0
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestAnalytics(unittest.TestCase):
+    """Test portfolio loading and the vectorized metrics."""
+    
+    def setUp(self):
+        self.temp_db = tempfile.NamedTemporaryFile(delete=False)
+        self.temp_db.close()
+        migrate(self.temp_db.name)
+        
+        conn = sqlite3.connect(self.temp_db.name)
+        conn.executemany("INSERT INTO sector VALUES (?, ?, ?)",
+                         [(1, 'Welder', 20.0), (2, 'Painter', 10.0)])
+        conn.executemany("""
+            INSERT INTO projects (price, estimated_man_hours, current_manhours,
+                percentage_completion, project_number, welder_manhours, builder_manhours,
+                painter_manhours, engineer_manhours, manager_manhours, fitter_manhours,
+                wages_payable)
+            VALUES (?, ?, ?, ?, ?, ?, 0, ?, 0, 0, 0, ?)
+        """, [
+            (10000.0, 500, 300, 50.0, 7, 200, 100, 6000.0),
+            (20000.0, 1000, 100, 25.0, 3, 500, 0, 4000.0),
+            (5000.0, 0, 0, None, 9, 0, 0, 0.0),
+        ])
+        conn.executemany("INSERT INTO project_sector_hours VALUES (?, ?, ?)",
+                         [(7, 1, 250), (7, 2, 50), (3, 1, 100)])
+        # The opening balance of project 7 has no employee and is not a rate
+        conn.executemany("""
+            INSERT INTO time_entries (recorded_at, employee_id, project_number, hours, wages)
+            VALUES (?, ?, ?, ?, ?)
+        """, [
+            ('2025-06-01T00:00:00.000Z', None, 7, 150, 3000.0),
+            ('2026-01-01T00:00:00.000Z', 1, 7, 100, 2000.0),
+            ('2026-01-06T00:00:00.000Z', 2, 7, 50, 1000.0),
+            ('2026-01-10T23:00:00.000Z', 1, 3, 10, 200.0),
+        ])
+        conn.commit()
+        conn.close()
+        
+        self.db_manager = DatabaseManager(self.temp_db.name)
+        self.portfolio = load_portfolio(self.db_manager, as_of=AS_OF)
+        self.metrics = compute_metrics(self.portfolio)
+    
+    def tearDown(self):
+        self.db_manager.close()
+        os.unlink(self.temp_db.name)
+    
+    def test_load_is_columnar_and_ordered(self):
+        """Test that projects load sorted with per-trade hours aligned to them."""
+        self.assertEqual(self.portfolio.project_number.tolist(), [3, 7, 9])
+        self.assertEqual(self.portfolio.trade_actual.shape, (3, 6))
+        self.assertEqual(self.portfolio.trade_actual[1].tolist(), [250, 0, 50, 0, 0, 0])
+        self.assertEqual(self.portfolio.trade_estimated[0, 0], 500)
+        self.assertEqual(self.portfolio.trade_wage[0], 20.0)
+        self.assertTrue(math.isnan(self.portfolio.trade_wage[1]))
+    
+    def test_project_metrics(self):
+        """Test the cost/progress ratio, overrun and at-completion figures for one project."""
+        m = {key: value[1] for key, value in self.metrics.items()}  # project 7
+        self.assertAlmostEqual(m['budget_used'], 0.6)
+        self.assertAlmostEqual(m['cost_progress_ratio'], 1.2)
+        self.assertAlmostEqual(m['wage_overrun'], -4000.0)
+        self.assertAlmostEqual(m['manhours_at_completion'], 600.0)
+        self.assertAlmostEqual(m['cost_at_completion'], 12000.0)
+        self.assertAlmostEqual(m['overrun_at_completion'], 2000.0)
+        self.assertAlmostEqual(m['remaining_manhours'], 300.0)
+        self.assertAlmostEqual(m['hours_completion'], 0.6)
+        self.assertEqual(m['trade_variance'][0], 50)
+        self.assertAlmostEqual(m['trade_ratio'][0], 1.25)
+        self.assertEqual(m['trade_cost'][0], 5000.0)
+    
+    def test_daily_rates_and_projected_completion(self):
+        """Test rates from the time entry log and the completion dates they project."""
+        self.assertEqual(self.portfolio.logged_hours.tolist(), [10, 150, 0])
+        m = {key: value[1] for key, value in self.metrics.items()}  # project 7, 10 days
+        self.assertAlmostEqual(m['hours_per_day'], 15.0)
+        self.assertAlmostEqual(m['burn_rate'], 300.0)
+        self.assertAlmostEqual(m['days_to_completion'], 20.0)
+        self.assertAlmostEqual(m['projected_completion'], AS_OF + 20 * 86400)
+        
+        # Project 3 started an hour ago; its rate is taken over one day
+        self.assertAlmostEqual(self.metrics['hours_per_day'][0], 10.0)
+        self.assertAlmostEqual(self.metrics['days_to_completion'][0], 30.0)
+        self.assertTrue(math.isnan(self.metrics['burn_rate'][2]))
+        self.assertTrue(math.isnan(self.metrics['projected_completion'][2]))
+    
+    def test_missing_denominators_are_nan(self):
+        """Test that projects without progress or estimates yield NaN, not errors."""
+        m = {key: value[2] for key, value in self.metrics.items()}  # project 9
+        self.assertTrue(math.isnan(m['cost_progress_ratio']))
+        self.assertTrue(math.isnan(m['cost_at_completion']))
+        self.assertTrue(math.isnan(m['hours_completion']))
+        self.assertTrue(math.isnan(m['trade_ratio'][0]))
+    
+    def test_summary_and_top_overruns(self):
+        """Test the portfolio aggregates and the overrun ranking."""
+        summary = summarize(self.portfolio, self.metrics)
+        self.assertEqual(summary['projects'], 3)
+        self.assertEqual(summary['total_wages'], 10000.0)
+        self.assertEqual(summary['over_budget_at_completion'], 1)
+        self.assertEqual(summary['trade_hours']['Welder'], 350)
+        self.assertAlmostEqual(summary['burn_rate'], 500.0)
+        self.assertEqual(summary['last_projected_completion'], '2026-02-10')
+        
+        top = top_overruns(self.portfolio, self.metrics, 5)
+        self.assertEqual([row['project_number'] for row in top], [7])
+        self.assertEqual(top[0]['projected_completion'], '2026-01-31')
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
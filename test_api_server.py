@@ -0,0 +1,150 @@
+"""
+Unit tests for the HTTP API server.
+"""
+
+import asyncio
+import os
+import tempfile
+import unittest
+
+from api_server import ApiServer
+from loadtest import http_request
+from migrations import migrate
+from models import DatabaseManager, Employee, Project, Sector, TimeTracking
+
+class TestApiServer(unittest.IsolatedAsyncioTestCase):
+    """Test the API against a fully migrated database over real connections."""
+    
+    async def asyncSetUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        db_path = os.path.join(self.temp_dir.name, 'test.db')
+        migrate(db_path)
+        self.db_manager = DatabaseManager(db_path)
+        Sector(self.db_manager).create({'sector_id': 1, 'sector_name': 'Welder', 'sector_wage': 20.0})
+        Project(self.db_manager).create({
+            'price': 100000.0, 'estimated_man_hours': 600, 'project_number': 1,
+            'welder_manhours': 100, 'builder_manhours': 100, 'painter_manhours': 100,
+            'engineer_manhours': 100, 'manager_manhours': 100, 'fitter_manhours': 100,
+        })
+        Employee(self.db_manager).create({
+            'id_number': 1, 'full_name': 'John Doe', 'hour_per_week': 40, 'salary': 50000.0,
+            'designation': 'Welder', 'project_number': 1,
+        })
+        self.server = ApiServer(self.db_manager, port=0, commit_delay=0.01)
+        await self.server.start()
+        self.reader, self.writer = await self.connect()
+    
+    async def asyncTearDown(self):
+        self.writer.close()
+        await self.server.close()
+        self.db_manager.close()
+        self.temp_dir.cleanup()
+    
+    async def connect(self):
+        return await asyncio.open_connection('127.0.0.1', self.server.port)
+    
+    async def request(self, method, path, payload=None):
+        return await http_request(self.reader, self.writer, method, path, payload)
+    
+    async def test_crud_over_one_keep_alive_connection(self):
+        """Test creating, reading and updating records on a single connection."""
+        status, employee = await self.request('POST', '/employees', {
+            'id_number': 2, 'full_name': 'Jane Roe', 'hour_per_week': 38, 'salary': 42000.0,
+            'designation': 'Welder', 'project_number': 1,
+        })
+        self.assertEqual(status, 201)
+        self.assertEqual(employee['attendance'], 0)
+        
+        status, employee = await self.request('PUT', '/employees/2', {'hour_per_week': 30})
+        self.assertEqual((status, employee['hour_per_week'], employee['full_name']), (200, 30, 'Jane Roe'))
+        
+        status, page = await self.request('GET', '/employees?limit=1')
+        self.assertEqual([row['id_number'] for row in page['employees']], [1])
+        self.assertEqual(page['next_after'], 1)
+        
+        status, sectors = await self.request('GET', '/sectors')
+        self.assertEqual([sector['sector_name'] for sector in sectors['sectors']], ['Welder'])
+        
+        status, project = await self.request('PUT', '/projects/1/percentage', {'percentage': 25})
+        self.assertEqual((status, project['percentage_completion']), (200, 25))
+        
+        status, _ = await self.request('POST', '/employees', {'id_number': 2})
+        self.assertEqual(status, 400)
+        self.assertEqual(self.server.requests, 6)
+    
+    async def test_errors_map_to_status_codes(self):
+        """Test the responses for unknown routes, methods, records and bad bodies."""
+        self.assertEqual((await self.request('GET', '/nowhere'))[0], 404)
+        self.assertEqual((await self.request('DELETE', '/employees/1'))[0], 405)
+        self.assertEqual((await self.request('GET', '/employees/99'))[0], 404)
+        self.assertEqual((await self.request('GET', '/employees?limit=x'))[0], 400)
+        status, body = await self.request('POST', '/employees', {
+            'id_number': 3, 'full_name': 'No Project', 'hour_per_week': 40, 'salary': 1000.0,
+            'designation': 'Welder', 'project_number': 99,
+        })
+        self.assertEqual(status, 400)
+        self.assertIn('99', body['error'])
+        self.assertEqual((await self.request('PUT', '/employees/1', {'project_number': 99}))[0], 400)
+        TimeTracking(self.db_manager).record_hours(1, 1, 2)
+        self.assertEqual((await self.request('PUT', '/employees/1', {'id_number': 5}))[0], 409)
+        
+        self.writer.write(b"POST /time-entries HTTP/1.1\r\nContent-Length: 3\r\n\r\n{x}")
+        await self.writer.drain()
+        head = await self.reader.readuntil(b'\r\n\r\n')
+        self.assertTrue(head.startswith(b'HTTP/1.1 400'))
+    
+    async def test_concurrent_entries_share_a_transaction(self):
+        """Test that single entries posted at once are recorded in one batch."""
+        connections = [await self.connect() for _ in range(5)]
+        try:
+            results = await asyncio.gather(*(
+                http_request(reader, writer, 'POST', '/time-entries',
+                             {'employee_id': 1, 'project_number': 1, 'hours': 2})
+                for reader, writer in connections
+            ))
+        finally:
+            for _, writer in connections:
+                writer.close()
+        self.assertEqual([status for status, _ in results], [201] * 5)
+        self.assertEqual(self.server.writer.stats()['commits'], 1)
+        
+        status, project = await self.request('GET', '/projects/1')
+        self.assertEqual(project['current_manhours'], 10)
+        status, error = await self.request('POST', '/time-entries',
+                                           {'employee_id': 99, 'project_number': 1, 'hours': 2})
+        self.assertEqual((status, error['error']), (422, "Employee 99 not found"))
+    
+    async def test_bulk_reports_each_entry(self):
+        """Test that a bulk request records valid entries and reports the rest."""
+        status, report = await self.request('POST', '/time-entries/bulk', {'entries': [
+            {'employee_id': 1, 'project_number': 1, 'hours': 3},
+            {'employee_id': 1, 'project_number': 1, 'hours': 99},
+            {'employee_id': 1, 'project_number': 7, 'hours': 3},
+        ]})
+        self.assertEqual(status, 200)
+        self.assertEqual((report['recorded'], report['failed']), (1, 2))
+        self.assertEqual([result['error'] for result in report['results']],
+                         [None, "Hours must be between 1 and 24", "Project 7 not found"])
+        self.assertEqual(len(TimeTracking(self.db_manager).get_entries()), 1)
+    
+    async def test_auto_completion_starts_from_recorded_hours(self):
+        """Test that enabling auto-completion first recomputes stale percentages."""
+        self.assertTrue(TimeTracking(self.db_manager).record_hours(1, 1, 24))
+        Project(self.db_manager).update_percentage(1, 50.0)
+        
+        server = ApiServer(self.db_manager, port=0, auto_completion=True)
+        await server.start()
+        try:
+            # 24 of the 600 estimated trade hours
+            self.assertAlmostEqual(Project(self.db_manager).get_by_number(1)['percentage_completion'], 4.0)
+            reader, writer = await asyncio.open_connection('127.0.0.1', server.port)
+            status, _ = await http_request(reader, writer, 'POST', '/time-entries',
+                                           {'employee_id': 1, 'project_number': 1, 'hours': 6})
+            writer.close()
+        finally:
+            await server.close()
+        self.assertEqual(status, 201)
+        self.assertAlmostEqual(Project(self.db_manager).get_by_number(1)['percentage_completion'], 5.0)
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
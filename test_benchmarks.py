@@ -0,0 +1,72 @@
+"""
+Unit tests for the benchmark harness, run at a tiny scale.
+"""
+
+import json
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from benchmarks import compare, generate_database, main, percentile, run_benchmarks
+
+class TestBenchmarks(unittest.TestCase):
+    """Test the synthetic data generator and the benchmark runner."""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.temp_dir.name, 'bench.db')
+    
+    def tearDown(self):
+        self.temp_dir.cleanup()
+    
+    def test_generate_database_scales_schema(self):
+        """Test that the generator creates N employees, M projects and K sectors."""
+        generate_database(self.db_path, employees=50, projects=7, sectors=9, seed=1)
+        conn = sqlite3.connect(self.db_path)
+        try:
+            counts = [conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                      for table in ('employees', 'projects', 'sector')]
+            designations = conn.execute(
+                "SELECT COUNT(*) FROM employees WHERE designation NOT IN (SELECT sector_name FROM sector)"
+            ).fetchone()[0]
+        finally:
+            conn.close()
+        self.assertEqual(counts, [50, 7, 9])
+        self.assertEqual(designations, 0)
+    
+    def test_run_benchmarks_reports_every_case(self):
+        """Test that each case reports throughput, latency percentiles and RSS."""
+        generate_database(self.db_path, employees=50, projects=5, sectors=6)
+        results = run_benchmarks(self.db_path, 50, 5, 6, iterations=20, bulk_size=10)
+        
+        names = [result['name'] for result in results]
+        self.assertIn('record_hours', names)
+        self.assertIn('project_create', names)
+        backup = results[names.index('record_hours_during_backup')]['backup']
+        self.assertGreaterEqual(backup['backups'], 1)
+        for result in results:
+            self.assertGreater(result['ops_per_sec'], 0)
+            self.assertLessEqual(result['p50_ms'], result['p99_ms'])
+    
+    def test_main_writes_json_and_compares(self):
+        """Test the JSON output and the comparison against an earlier run."""
+        output = os.path.join(self.temp_dir.name, 'results.json')
+        args = ['--employees', '30', '--projects', '3', '--sectors', '6',
+                '--iterations', '10', '--only', 'record_hours', '--output', output]
+        self.assertEqual(main(args), 0)
+        with open(output) as f:
+            report = json.load(f)
+        self.assertEqual(report['meta']['parameters']['employees'], 30)
+        self.assertEqual([result['name'] for result in report['results']], ['record_hours'])
+        self.assertEqual(len(compare(report, report)), 1)
+    
+    def test_percentile(self):
+        """Test the nearest-rank percentile."""
+        values = list(range(100))
+        self.assertEqual(percentile(values, 0.5), 50)
+        self.assertEqual(percentile(values, 0.99), 99)
+        self.assertEqual(percentile([3.0], 0.99), 3.0)
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
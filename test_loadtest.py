@@ -0,0 +1,42 @@
+"""
+Unit tests for the API load test, run at a tiny scale.
+"""
+
+import os
+import tempfile
+import unittest
+
+from api_server import ApiServer
+from benchmarks import generate_database
+from loadtest import run_load
+from models import DatabaseManager, TimeTracking
+
+class TestLoadTest(unittest.IsolatedAsyncioTestCase):
+    """Test run_load against an in-process server on a generated database."""
+    
+    async def asyncSetUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        db_path = os.path.join(self.temp_dir.name, 'load.db')
+        generate_database(db_path, employees=20, projects=3, sectors=6)
+        self.db_manager = DatabaseManager(db_path)
+        self.server = ApiServer(self.db_manager, port=0)
+        await self.server.start()
+    
+    async def asyncTearDown(self):
+        await self.server.close()
+        self.db_manager.close()
+        self.temp_dir.cleanup()
+    
+    async def test_single_and_bulk_entries(self):
+        """Test that every posted entry is recorded and counted."""
+        single = await run_load('127.0.0.1', self.server.port, 20, 3, connections=3, requests=4)
+        bulk = await run_load('127.0.0.1', self.server.port, 20, 3, connections=2, requests=2, bulk=5)
+        
+        self.assertEqual((single['requests'], single['entries'], single['errors']), (12, 12, 0))
+        self.assertEqual((bulk['requests'], bulk['entries'], bulk['errors']), (4, 20, 0))
+        self.assertLessEqual(single['p50_ms'], single['max_ms'])
+        entries = TimeTracking(self.db_manager).get_entries(limit=100)
+        self.assertEqual(len(entries), 32)
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,111 @@
+"""
+Unit tests for the logging_config module.
+"""
+
+import json
+import logging
+import os
+import tempfile
+import unittest
+
+from logging_config import (
+    OPERATION_LEVELS, LazyQueueHandler, StructuredFormatter, log_operation,
+    set_operation_levels, setup_logging, stop_logging
+)
+
+class ListHandler(logging.Handler):
+    """Collects records for inspection."""
+    
+    def __init__(self):
+        super().__init__()
+        self.records = []
+    
+    def emit(self, record):
+        self.records.append(record)
+
+class TestOperationLogging(unittest.TestCase):
+    """Test per-operation levels and structured records."""
+    
+    def setUp(self):
+        self.logger = logging.getLogger('test_logging_config.operations')
+        self.logger.setLevel(logging.INFO)
+        self.logger.propagate = False
+        self.handler = ListHandler()
+        self.logger.addHandler(self.handler)
+    
+    def tearDown(self):
+        self.logger.removeHandler(self.handler)
+        OPERATION_LEVELS.clear()
+    
+    def test_operation_record_carries_fields(self):
+        """Test that the record keeps its arguments and structured fields."""
+        log_operation(self.logger, 'employee.create', "Created employee %s", 7, employee_id=7)
+        
+        record = self.handler.records[0]
+        self.assertEqual((record.msg, record.args), ("Created employee %s", (7,)))
+        self.assertEqual(record.operation, 'employee.create')
+        self.assertEqual(record.fields, {'employee_id': 7})
+        self.assertEqual(record.funcName, 'test_operation_record_carries_fields')
+    
+    def test_operation_levels(self):
+        """Test that an operation can be turned down below the logger level."""
+        set_operation_levels({'time.record_hours': 'DEBUG', 'employee.create': logging.WARNING})
+        log_operation(self.logger, 'time.record_hours', "Recorded %s hours", 8)
+        log_operation(self.logger, 'employee.create', "Created employee %s", 7)
+        
+        self.assertEqual([record.levelno for record in self.handler.records], [logging.WARNING])
+        with self.assertRaises(ValueError):
+            set_operation_levels({'employee.create': 'LOUD'})
+    
+    def test_structured_formatter(self):
+        """Test the JSON line format."""
+        log_operation(self.logger, 'sector.create', "Created sector %s", 'Welder', sector_id=1)
+        entry = json.loads(StructuredFormatter().format(self.handler.records[0]))
+        self.assertEqual(entry['message'], "Created sector Welder")
+        self.assertEqual(entry['operation'], 'sector.create')
+        self.assertEqual(entry['fields'], {'sector_id': 1})
+        self.assertEqual(entry['level'], 'INFO')
+
+class TestSetupLogging(unittest.TestCase):
+    """Test the queue-based pipeline."""
+    
+    def setUp(self):
+        self.root = logging.getLogger()
+        self.saved = (self.root.handlers[:], self.root.level)
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.log_file = os.path.join(self.temp_dir.name, 'app.log')
+    
+    def tearDown(self):
+        self.root.handlers[:] = self.saved[0]
+        self.root.setLevel(self.saved[1])
+        OPERATION_LEVELS.clear()
+        self.temp_dir.cleanup()
+    
+    def test_records_written_by_listener(self):
+        """Test that records reach the file through the queue, formatted as JSON."""
+        listener = setup_logging(self.log_file, console=False,
+                                 operation_levels={'employee.update': 'DEBUG'})
+        self.assertIsInstance(self.root.handlers[0], LazyQueueHandler)
+        
+        logger = logging.getLogger('test_logging_config.pipeline')
+        log_operation(logger, 'employee.create', "Created employee %s", 3, employee_id=3)
+        log_operation(logger, 'employee.update', "Updated employee %s", 3)
+        logger.warning("Plain %s", "warning")
+        stop_logging(listener)
+        stop_logging(listener)  # stopping twice is harmless
+        
+        with open(self.log_file) as f:
+            entries = [json.loads(line) for line in f]
+        self.assertEqual([entry['message'] for entry in entries],
+                         ["Created employee 3", "Plain warning"])
+        self.assertEqual(entries[0]['fields'], {'employee_id': 3})
+    
+    def test_prepare_does_not_format(self):
+        """Test that the queue handler leaves formatting to the listener."""
+        record = logging.LogRecord('x', logging.INFO, __file__, 1, "value %s", (1,), None)
+        prepared = LazyQueueHandler(None).prepare(record)
+        self.assertIs(prepared, record)
+        self.assertEqual(prepared.args, (1,))
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
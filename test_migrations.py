@@ -0,0 +1,128 @@
+"""
+Unit tests for the schema migration runner.
+"""
+
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from migrations import BASELINE_SCHEMA, LATEST_VERSION, get_version, migrate
+from models import DatabaseManager, TimeTracking
+
+class TestMigrations(unittest.TestCase):
+    """Test the migrate function."""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.temp_dir.name, 'test.db')
+    
+    def tearDown(self):
+        self.temp_dir.cleanup()
+    
+    def connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path)
+        self.addCleanup(conn.close)
+        return conn
+    
+    def create_legacy_database(self):
+        """Create an unversioned database shaped like the original iscon.db."""
+        conn = self.connect()
+        for statement in BASELINE_SCHEMA:
+            conn.execute(statement)
+        conn.execute("INSERT INTO projects VALUES (60000.0, 600, 72, 5.0, 1, 100, 100, 100, 100, 100, 100, 93.0)")
+        conn.execute("INSERT INTO specific_man_hours VALUES (1, 51, 0, 18, 0, 13, 0)")
+        conn.execute("INSERT INTO sector VALUES (3, 'Welder', 29.5)")
+        conn.execute("INSERT INTO employees VALUES (1, 'Kesav Manoj', 30, 35000.0, 'Welder', 1, 8)")
+        conn.commit()
+    
+    def test_migrate_empty_database(self):
+        """Test that an empty database gets the full schema."""
+        self.assertEqual(migrate(self.db_path), LATEST_VERSION)
+        tables = {row[0] for row in self.connect().execute(
+            "SELECT name FROM sqlite_master WHERE type IN ('table', 'view')"
+        )}
+        self.assertTrue({'employees', 'projects', 'sector', 'specific_man_hours'} <= tables)
+    
+    def test_migrate_legacy_database_preserves_data(self):
+        """Test upgrading an existing database in place."""
+        self.create_legacy_database()
+        migrate(self.db_path)
+        conn = self.connect()
+        
+        self.assertEqual(get_version(conn), LATEST_VERSION)
+        self.assertEqual(
+            conn.execute("SELECT * FROM employees").fetchall(),
+            [(1, 'Kesav Manoj', 30, 35000.0, 'Welder', 1, 8)]
+        )
+        self.assertEqual(
+            conn.execute("SELECT current_manhours, wages_payable FROM projects").fetchall(),
+            [(72, 93.0)]
+        )
+    
+    def test_keys_and_indexes(self):
+        """Test that primary keys, foreign keys and indexes exist."""
+        migrate(self.db_path)
+        conn = self.connect()
+        
+        primary_keys = {row[1] for row in conn.execute("PRAGMA table_info(employees)") if row[5]}
+        self.assertEqual(primary_keys, {'id_number'})
+        foreign_keys = {row[2] for row in conn.execute("PRAGMA foreign_key_list(employees)")}
+        self.assertEqual(foreign_keys, {'projects'})
+        
+        plan = conn.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM sector WHERE sector_name = ?", ('Welder',)
+        ).fetchall()
+        self.assertIn('idx_sector_sector_name', plan[0][3])
+    
+    def test_specific_man_hours_view(self):
+        """Test that the ledger keeps the legacy wide shape readable and writable."""
+        self.create_legacy_database()
+        migrate(self.db_path)
+        conn = self.connect()
+        
+        self.assertEqual(
+            conn.execute("SELECT * FROM specific_man_hours").fetchall(),
+            [(1, 51, 0, 18, 0, 13, 0)]
+        )
+        # Painter has no sector row, so one is created to keep its hours
+        self.assertEqual(
+            conn.execute("SELECT sector_wage FROM sector WHERE sector_name = 'Painter'").fetchall(),
+            [(0,)]
+        )
+        
+        # Legacy column updates from main.py go through the INSTEAD OF trigger
+        conn.execute("UPDATE specific_man_hours SET Welder = Welder + 4 WHERE project_number = 1")
+        self.assertEqual(
+            conn.execute("SELECT Welder FROM specific_man_hours WHERE project_number = 1").fetchone()[0],
+            55
+        )
+    
+    def test_opening_balances_reproduce_legacy_totals(self):
+        """Test that rebuilding from the new log keeps pre-existing totals."""
+        self.create_legacy_database()
+        migrate(self.db_path)
+        db_manager = DatabaseManager(self.db_path)
+        self.addCleanup(db_manager.close)
+        
+        self.assertTrue(TimeTracking(db_manager).rebuild_aggregates())
+        conn = self.connect()
+        self.assertEqual(
+            conn.execute("SELECT current_manhours, wages_payable FROM projects").fetchall(),
+            [(72, 93.0)]
+        )
+        self.assertEqual(conn.execute("SELECT attendance FROM employees").fetchall(), [(8,)])
+        self.assertEqual(
+            conn.execute("SELECT * FROM specific_man_hours").fetchall(),
+            [(1, 51, 0, 18, 0, 13, 0)]
+        )
+    
+    def test_migrate_is_idempotent(self):
+        """Test that running migrations twice is a no-op."""
+        self.create_legacy_database()
+        migrate(self.db_path)
+        self.assertEqual(migrate(self.db_path), LATEST_VERSION)
+        self.assertEqual(self.connect().execute("SELECT COUNT(*) FROM employees").fetchone()[0], 1)
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
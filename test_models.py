@@ -7,10 +7,13 @@ import unittest
 import sqlite3
 import tempfile
 import os
+import threading
 from unittest.mock import patch, MagicMock
+from migrations import migrate
+from records import EmployeeRecord, SpecificManHoursRecord
 from models import (
-    DatabaseManager, Employee, Sector, Project, TimeTracking,
-    validate_employee_data, validate_sector_data
+    CACHE_TTL, BackupScheduler, ConnectionPool, DatabaseManager, Employee, EmployeeCache, GroupCommitWriter,
+    Sector, Project, TimeTracking, validate_employee_data, validate_sector_data
 )
 
 class TestDatabaseManager(unittest.TestCase):
@@ -73,6 +76,7 @@ class TestDatabaseManager(unittest.TestCase):
     
     def tearDown(self):
         # Clean up the temporary database
+        self.db_manager.close()
         os.unlink(self.temp_db.name)
     
     def test_connection_context_manager(self):
@@ -83,6 +87,209 @@ class TestDatabaseManager(unittest.TestCase):
             cursor.execute("SELECT 1")
             result = cursor.fetchone()
             self.assertEqual(result[0], 1)
+    
+    def test_pragma_profile_applied(self):
+        """Test that pooled connections get the default PRAGMA profile."""
+        with self.db_manager.get_connection() as conn:
+            self.assertEqual(conn.execute("PRAGMA journal_mode").fetchone()[0], 'wal')
+            self.assertEqual(conn.execute("PRAGMA busy_timeout").fetchone()[0], 5000)
+            self.assertEqual(conn.execute("PRAGMA foreign_keys").fetchone()[0], 1)
+    
+    def test_custom_pragmas(self):
+        """Test overriding the PRAGMA profile."""
+        db_manager = DatabaseManager(self.temp_db.name, pragmas={'synchronous': 'OFF'})
+        with db_manager.get_connection() as conn:
+            self.assertEqual(conn.execute("PRAGMA synchronous").fetchone()[0], 0)
+        db_manager.close()
+        
+        with self.assertRaises(ValueError):
+            DatabaseManager(self.temp_db.name, pragmas={'synchronous': 'OFF; DROP TABLE x'})
+    
+    def test_readers_do_not_block_writer(self):
+        """Test that a read proceeds while another connection holds the write lock."""
+        with self.db_manager.transaction() as writer:
+            writer.execute("INSERT INTO sector VALUES (1, 'Welder', 29.5)")
+            with self.db_manager.get_connection() as reader:
+                count = reader.execute("SELECT COUNT(*) FROM sector").fetchone()[0]
+                self.assertEqual(count, 0)
+        
+        busy, _, _ = self.db_manager.checkpoint('TRUNCATE')
+        self.assertEqual(busy, 0)
+    
+    def test_backup_in_steps_while_writing(self):
+        """Test that a stepped backup finishes consistently while another connection commits."""
+        with self.db_manager.transaction() as conn:
+            conn.executemany("INSERT INTO sector VALUES (?, ?, ?)",
+                             [(n, 'x' * 500, 1.0) for n in range(200)])
+        stop = threading.Event()
+        
+        def write():
+            while not stop.is_set():
+                with self.db_manager.transaction() as conn:
+                    conn.execute("INSERT INTO sector VALUES (NULL, 'y', 2.0)")
+        
+        writer = threading.Thread(target=write)
+        writer.start()
+        target = self.temp_db.name + '.bak'
+        try:
+            result = self.db_manager.backup(target, pages_per_step=5, step_sleep=0.002)
+        finally:
+            stop.set()
+            writer.join()
+        try:
+            self.assertGreater(result['steps'], 1)
+            self.assertGreater(result['bytes'], 0)
+            copy = sqlite3.connect(target)
+            self.assertEqual(copy.execute("PRAGMA integrity_check").fetchone()[0], 'ok')
+            self.assertGreaterEqual(copy.execute("SELECT COUNT(*) FROM sector").fetchone()[0], 200)
+            copy.close()
+        finally:
+            os.unlink(target)
+    
+    def test_backup_scheduler_rotates(self):
+        """Test that only the newest backups are kept, newest first."""
+        with tempfile.TemporaryDirectory() as directory:
+            scheduler = BackupScheduler(self.db_manager, directory, keep=2, start=False)
+            paths = [scheduler.run_now() for _ in range(3)]
+            self.assertEqual(scheduler.backups(), paths[:0:-1])
+            self.assertEqual(scheduler.latest(), paths[-1])
+            self.assertEqual(sorted(os.listdir(directory)), sorted(os.path.basename(p) for p in paths[1:]))
+            stats = scheduler.stats()
+            self.assertEqual((stats['backups'], stats['failures']), (3, 0))
+            self.assertGreater(stats['bytes_per_sec'], 0)
+    
+    def test_start_backups(self):
+        """Test that scheduled backups start at once and stop with the manager."""
+        with tempfile.TemporaryDirectory() as directory:
+            scheduler = self.db_manager.start_backups(directory, interval=3600)
+            with self.assertRaises(RuntimeError):
+                self.db_manager.start_backups(directory)
+            for _ in range(200):
+                if scheduler.latest():
+                    break
+                threading.Event().wait(0.01)
+            self.assertIsNotNone(scheduler.latest())
+            self.db_manager.close()
+            self.assertFalse(scheduler._thread.is_alive())
+            self.assertIsNone(self.db_manager.backup_scheduler)
+
+class TestQueryStats(unittest.TestCase):
+    """Test statement instrumentation in DatabaseManager."""
+    
+    def setUp(self):
+        self.temp_db = tempfile.NamedTemporaryFile(delete=False)
+        self.temp_db.close()
+        migrate(self.temp_db.name)
+    
+    def tearDown(self):
+        os.unlink(self.temp_db.name)
+    
+    def test_disabled_uses_plain_connections(self):
+        """Test that without query_stats connections are not wrapped at all."""
+        db_manager = DatabaseManager(self.temp_db.name)
+        with db_manager.get_connection() as conn:
+            self.assertIs(type(conn), sqlite3.Connection)
+        self.assertEqual(db_manager.query_report(), [])
+        db_manager.close()
+    
+    def test_statements_grouped_by_fingerprint_and_caller(self):
+        """Test that executions are histogrammed per statement and model method."""
+        db_manager = DatabaseManager(self.temp_db.name, query_stats=True)
+        sector = Sector(db_manager)
+        for sector_id in (1, 2):
+            sector.create({'sector_id': sector_id, 'sector_name': f'S{sector_id}', 'sector_wage': 1.0})
+        employee = Employee(db_manager)
+        employee.get_by_id(1)
+        employee.get_by_id(2)
+        
+        report = {stats['fingerprint']: stats for stats in db_manager.query_report()}
+        insert = report['INSERT INTO sector (sector_id, sector_name, sector_wage) VALUES (?, ...)']
+        self.assertEqual(insert['count'], 2)
+        self.assertEqual(insert['rows_affected'], 2)
+        self.assertEqual(insert['callers'], {'models.Sector.create': 2})
+        self.assertEqual(insert['statement'], 'sector.insert')
+        self.assertLessEqual(insert['p50_ms'], insert['max_ms'])
+        
+        select = report['SELECT * FROM employees WHERE id_number = ?']
+        self.assertEqual(select['callers'], {'models.Employee.get_by_id': 2})
+        db_manager.close()
+    
+    def test_slow_queries_logged_with_plan(self):
+        """Test that statements over the threshold are logged with their query plan."""
+        db_manager = DatabaseManager(self.temp_db.name, query_stats=True,
+                                     slow_query_ms=0, explain_slow=True)
+        with self.assertLogs('models', level='WARNING'):
+            Employee(db_manager).get_page(after_id=5, limit=10)
+        
+        slow = [entry for entry in db_manager.query_stats.slow_log
+                if entry['fingerprint'].startswith('SELECT * FROM employees WHERE id_number >')]
+        self.assertEqual(slow[0]['caller'], 'models.Employee.get_page')
+        self.assertTrue(any('employees' in step for step in slow[0]['plan']))
+        db_manager.close()
+
+class TestConnectionPool(unittest.TestCase):
+    """Test the ConnectionPool class."""
+    
+    def setUp(self):
+        self.temp_db = tempfile.NamedTemporaryFile(delete=False)
+        self.temp_db.close()
+        self.pool = ConnectionPool(self.temp_db.name, size=2, timeout=0.1)
+    
+    def tearDown(self):
+        self.pool.close()
+        os.unlink(self.temp_db.name)
+    
+    def test_connections_are_reused(self):
+        """Test that released connections are handed out again."""
+        conn = self.pool.acquire()
+        self.pool.release(conn)
+        self.assertIs(self.pool.acquire(), conn)
+        
+        stats = self.pool.stats()
+        self.assertEqual(stats['creations'], 1)
+        self.assertEqual(stats['hits'], 1)
+        self.assertEqual(stats['in_use'], 1)
+    
+    def test_pool_is_bounded(self):
+        """Test that checkouts beyond the pool size wait and then time out."""
+        first = self.pool.acquire()
+        self.pool.acquire()
+        
+        with self.assertRaises(sqlite3.OperationalError):
+            self.pool.acquire()
+        
+        stats = self.pool.stats()
+        self.assertEqual(stats['creations'], 2)
+        self.assertEqual(stats['waits'], 1)
+        self.assertEqual(stats['timeouts'], 1)
+        
+        # A release frees a slot for the next checkout
+        self.pool.release(first)
+        self.assertIs(self.pool.acquire(), first)
+    
+    def test_release_rolls_back_open_transaction(self):
+        """Test that uncommitted work does not leak to the next borrower."""
+        conn = self.pool.acquire()
+        conn.execute("CREATE TABLE t (x INTEGER)")
+        conn.commit()
+        conn.execute("INSERT INTO t VALUES (1)")
+        self.pool.release(conn)
+        
+        conn = self.pool.acquire()
+        self.assertFalse(conn.in_transaction)
+        self.assertEqual(conn.execute("SELECT COUNT(*) FROM t").fetchone()[0], 0)
+    
+    def test_health_check_replaces_stale_connection(self):
+        """Test that a connection to a deleted database file is discarded."""
+        conn = self.pool.acquire()
+        self.pool.release(conn)
+        os.unlink(self.temp_db.name)
+        open(self.temp_db.name, 'w').close()
+        
+        self.assertIsNot(self.pool.acquire(), conn)
+        stats = self.pool.stats()
+        self.assertEqual(stats['health_check_failures'], 1)
+        self.assertEqual(stats['open'], 1)
 
 class TestEmployee(unittest.TestCase):
     """Test the Employee model class."""
@@ -110,6 +317,7 @@ class TestEmployee(unittest.TestCase):
             """)
     
     def tearDown(self):
+        self.db_manager.close()
         os.unlink(self.temp_db.name)
     
     def test_create_employee_success(self):
@@ -138,6 +346,35 @@ class TestEmployee(unittest.TestCase):
         result = self.employee.get_by_id(999)
         self.assertIsNone(result)
     
+    def test_iter_all_yields_records_in_batches(self):
+        """Test that iter_all streams every employee as a record, ordered by ID."""
+        for id_number in (3, 1, 2):
+            self.employee.create({
+                'id_number': id_number, 'full_name': f'Employee {id_number}', 'hour_per_week': 40,
+                'salary': 1000.0, 'designation': 'Welder', 'project_number': 1
+            })
+        
+        records = list(self.employee.iter_all(batch_size=2))
+        self.assertEqual([record.id_number for record in records], [1, 2, 3])
+        self.assertIsInstance(records[0], EmployeeRecord)
+        self.assertEqual(records[0].full_name, 'Employee 1')
+        self.assertEqual(self.db_manager.pool_stats()['in_use'], 0)
+        with self.assertRaises(ValueError):
+            self.employee.iter_all(batch_size=0)
+    
+    def test_abandoned_iterator_returns_connection(self):
+        """Test that closing a partly consumed iterator releases its connection."""
+        for id_number in (1, 2):
+            self.employee.create({
+                'id_number': id_number, 'full_name': 'X', 'hour_per_week': 40,
+                'salary': 1000.0, 'designation': 'Welder', 'project_number': 1
+            })
+        records = self.employee.iter_all(batch_size=1)
+        next(records)
+        self.assertEqual(self.db_manager.pool_stats()['in_use'], 1)
+        records.close()
+        self.assertEqual(self.db_manager.pool_stats()['in_use'], 0)
+    
     def test_update_employee(self):
         """Test updating an employee."""
         # First create an employee
@@ -166,6 +403,32 @@ class TestEmployee(unittest.TestCase):
         self.assertEqual(updated_employee['designation'], 'Senior Engineer')
         self.assertEqual(updated_employee['attendance'], 5)
     
+    def test_get_by_id_is_cached(self):
+        """Test that repeat lookups are served from the employee cache."""
+        self.employee.create({
+            'id_number': 1, 'full_name': 'John Doe', 'hour_per_week': 40,
+            'salary': 50000.0, 'designation': 'Engineer', 'project_number': 1
+        })
+        self.employee.get_by_id(1)
+        checkouts = self.db_manager.pool_stats()['checkouts']
+        
+        self.employee.get_by_id(1)['full_name'] = 'Changed'
+        self.assertEqual(self.employee.get_by_id(1)['full_name'], 'John Doe')
+        self.assertEqual(self.db_manager.pool_stats()['checkouts'], checkouts)
+        self.assertEqual(self.db_manager.employee_cache.stats()['hits'], 2)
+    
+    def test_update_invalidates_cache(self):
+        """Test that an update is visible to the next lookup."""
+        employee_data = {
+            'id_number': 1, 'full_name': 'John Doe', 'hour_per_week': 40,
+            'salary': 50000.0, 'designation': 'Engineer', 'project_number': 1
+        }
+        self.employee.create(employee_data)
+        self.employee.get_by_id(1)
+        
+        self.employee.update(1, dict(employee_data, salary=60000.0, attendance=0))
+        self.assertEqual(self.employee.get_by_id(1)['salary'], 60000.0)
+    
     @patch('models.logger')
     def test_create_employee_database_error(self, mock_logger):
         """Test error handling when database operation fails."""
@@ -185,6 +448,94 @@ class TestEmployee(unittest.TestCase):
         self.assertFalse(result)
         mock_logger.error.assert_called()
 
+class TestSector(unittest.TestCase):
+    """Test the Sector model class and its cache."""
+    
+    def setUp(self):
+        self.temp_db = tempfile.NamedTemporaryFile(delete=False)
+        self.temp_db.close()
+        self.db_manager = DatabaseManager(self.temp_db.name)
+        self.sector = Sector(self.db_manager)
+        
+        with self.db_manager.get_connection() as conn:
+            conn.execute("""
+                CREATE TABLE sector (
+                    sector_id INTEGER,
+                    sector_name TEXT,
+                    sector_wage REAL
+                )
+            """)
+        self.sector.create({'sector_id': 1, 'sector_name': 'Welder', 'sector_wage': 29.5})
+    
+    def tearDown(self):
+        self.db_manager.close()
+        os.unlink(self.temp_db.name)
+    
+    def test_lookups_are_cached(self):
+        """Test that repeated lookups are served without database access."""
+        self.assertEqual(self.sector.get_by_name('Welder')['sector_wage'], 29.5)
+        checkouts = self.db_manager.pool_stats()['checkouts']
+        
+        self.assertEqual(self.sector.get_by_id(1)['sector_name'], 'Welder')
+        self.assertIsNone(self.sector.get_by_name('Unknown'))
+        self.assertEqual(self.db_manager.pool_stats()['checkouts'], checkouts)
+        
+        stats = self.db_manager.sector_cache.stats()
+        self.assertEqual(stats['misses'], 1)
+        self.assertEqual(stats['hits'], 2)
+    
+    def test_cached_rows_are_copies(self):
+        """Test that callers cannot modify the cached rows."""
+        self.sector.get_by_name('Welder')['sector_wage'] = 0
+        self.assertEqual(self.sector.get_by_name('Welder')['sector_wage'], 29.5)
+    
+    def test_create_and_update_invalidate(self):
+        """Test that writes are visible to the next lookup."""
+        self.assertIsNone(self.sector.get_by_name('Painter'))
+        self.sector.create({'sector_id': 2, 'sector_name': 'Painter', 'sector_wage': 23.0})
+        self.assertEqual(self.sector.get_by_name('Painter')['sector_wage'], 23.0)
+        
+        self.sector.update(1, {'sector_id': 1, 'sector_name': 'Welder', 'sector_wage': 31.0})
+        self.assertEqual(Sector(self.db_manager).get_by_id(1)['sector_wage'], 31.0)
+        wages = {name: sector['sector_wage'] for name, sector in self.sector.by_name().items()}
+        self.assertEqual(wages, {'Welder': 31.0, 'Painter': 23.0})
+
+class TestEmployeeCache(unittest.TestCase):
+    """Test the EmployeeCache class."""
+    
+    def test_least_recently_used_is_evicted(self):
+        """Test LRU eviction order."""
+        cache = EmployeeCache(maxsize=2)
+        cache.put(1, {'id_number': 1})
+        cache.put(2, {'id_number': 2})
+        cache.get(1)
+        cache.put(3, {'id_number': 3})
+        
+        self.assertIsNone(cache.get(2))
+        self.assertIsNotNone(cache.get(1))
+        self.assertEqual(cache.stats()['evictions'], 1)
+    
+    def test_entries_expire(self):
+        """Test TTL expiry."""
+        cache = EmployeeCache(ttl=10)
+        with patch('models.time.monotonic', return_value=100.0):
+            cache.put(1, {'id_number': 1})
+        with patch('models.time.monotonic', return_value=109.0):
+            self.assertIsNotNone(cache.get(1))
+        with patch('models.time.monotonic', return_value=110.0):
+            self.assertIsNone(cache.get(1))
+        self.assertEqual(cache.stats()['expirations'], 1)
+    
+    def test_patch_writes_through(self):
+        """Test that patches only touch cached employees."""
+        cache = EmployeeCache()
+        cache.put(1, {'attendance': 2, 'project_number': 1})
+        cache.patch(1, {'attendance': 3}, project_number=7)
+        cache.patch(2, {'attendance': 1})
+        
+        self.assertEqual(cache.get(1), {'attendance': 5, 'project_number': 7})
+        self.assertIsNone(cache.get(2))
+
 class TestValidationFunctions(unittest.TestCase):
     """Test validation functions."""
     
@@ -266,6 +617,67 @@ class TestValidationFunctions(unittest.TestCase):
         self.assertFalse(is_valid)
         self.assertIn("negative", error.lower())
 
+class TestEmployeeSearch(unittest.TestCase):
+    """Test Employee.search against a fully migrated database."""
+    
+    def setUp(self):
+        self.temp_db = tempfile.NamedTemporaryFile(delete=False)
+        self.temp_db.close()
+        migrate(self.temp_db.name)
+        self.db_manager = DatabaseManager(self.temp_db.name)
+        self.employee = Employee(self.db_manager)
+        
+        for id_number, full_name, designation in [
+            (1, 'John Smith', 'Welder'),
+            (2, 'Joanna Brown', 'Painter'),
+            (3, 'Peter Jones', 'Welder'),
+            (12, 'Mary_Ann Lee', 'Engineer'),
+        ]:
+            self.employee.create({
+                'id_number': id_number, 'full_name': full_name, 'hour_per_week': 40,
+                'salary': 1000.0, 'designation': designation, 'project_number': None
+            })
+    
+    def tearDown(self):
+        self.db_manager.close()
+        os.unlink(self.temp_db.name)
+    
+    def ids(self, query):
+        return [row['id_number'] for row in self.employee.search(query)]
+    
+    def test_prefix_terms_match_name_and_designation(self):
+        """Test that every query word must start a word of the name or designation."""
+        self.assertEqual(self.ids('jo'), [1, 2, 3])
+        self.assertEqual(self.ids('jo wel'), [1, 3])
+        self.assertEqual(self.ids('smi'), [1])
+        self.assertEqual(self.ids('xyz'), [])
+    
+    def test_index_follows_updates(self):
+        """Test that the search index tracks renamed employees."""
+        data = self.employee.get_by_id(1)
+        data['full_name'] = 'Jack Smith'
+        self.employee.update(1, data)
+        
+        self.assertEqual(self.ids('john'), [])
+        self.assertEqual(self.ids('jack'), [1])
+    
+    def test_id_match_comes_first(self):
+        """Test that a numeric query matches the exact id_number."""
+        self.assertEqual(self.ids('12'), [12])
+    
+    def test_query_syntax_is_not_interpreted(self):
+        """Test that FTS5 operators and quotes in a query are treated as text."""
+        self.assertEqual(self.ids('"john" OR'), [])
+        self.assertEqual(self.ids('john*'), [1])
+        self.assertEqual(self.ids('   '), [])
+    
+    def test_prefix_fallback_without_fts(self):
+        """Test the B-tree prefix search used when there is no FTS5 index."""
+        self.employee._has_search_index = False
+        self.assertEqual(self.ids('jo'), [2, 1])
+        self.assertEqual(self.ids('Mary_'), [12])
+        self.assertEqual(self.ids('Mary%'), [])
+
 class TestTimeTracking(unittest.TestCase):
     """Test the TimeTracking class."""
     
@@ -349,8 +761,13 @@ class TestTimeTracking(unittest.TestCase):
                 (project_number, Welder, Builder, Painter, Engineer, Manager, Fitter)
                 VALUES (1, 0, 0, 0, 0, 0, 0)
             """)
+            conn.commit()
+        
+        # Upgrade the legacy tables the way application startup does
+        migrate(self.temp_db.name)
     
     def tearDown(self):
+        self.db_manager.close()
         os.unlink(self.temp_db.name)
     
     def test_record_hours_success(self):
@@ -390,6 +807,278 @@ class TestTimeTracking(unittest.TestCase):
             hours=8
         )
         self.assertFalse(result)
+    
+    def test_record_hours_rejects_invalid_values(self):
+        """Test that bad hours are rejected with False instead of raising."""
+        before = self.db_manager.pool_stats()['checkouts']
+        for hours in ("x", [8], None, 0, 25, 1.5):
+            with self.subTest(hours=hours):
+                self.assertFalse(self.time_tracking.record_hours(1, 1, hours))
+        self.assertEqual(self.db_manager.pool_stats()['checkouts'], before)
+        self.assertTrue(self.time_tracking.record_hours(1, 1, "8"))
+        self.assertEqual(self.time_tracking.get_entries(1, limit=1)[0]['hours'], 8)
+    
+    def test_record_hours_project_not_found_is_atomic(self):
+        """Test that a missing project leaves no partial updates behind."""
+        result = self.time_tracking.record_hours(
+            employee_id=1,
+            project_number=999,  # Non-existent project
+            hours=8
+        )
+        self.assertFalse(result)
+        
+        with self.db_manager.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT attendance, project_number FROM employees WHERE id_number = 1")
+            self.assertEqual(tuple(cursor.fetchone()), (0, 1))
+    
+    def test_record_hours_bulk(self):
+        """Test bulk recording with a per-row report."""
+        entries = [
+            (1, 1, 8),
+            (999, 1, 8),   # Non-existent employee
+            (1, 999, 8),   # Non-existent project
+            (1, 1, 4),
+            ("bad",),      # Malformed entry
+            (1, 1, 2),
+        ]
+        report = self.time_tracking.record_hours_bulk(entries, chunk_size=2)
+        
+        self.assertEqual([success for success, _ in report],
+                         [True, False, False, True, False, True])
+        self.assertIn("999", report[1][1])
+        self.assertIn("Project", report[2][1])
+        
+        with self.db_manager.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT attendance FROM employees WHERE id_number = 1")
+            self.assertEqual(cursor.fetchone()[0], 3)
+            cursor.execute("SELECT current_manhours, wages_payable FROM projects WHERE project_number = 1")
+            self.assertEqual(tuple(cursor.fetchone()), (14, 350.0))
+            cursor.execute("SELECT Engineer FROM specific_man_hours WHERE project_number = 1")
+            self.assertEqual(cursor.fetchone()[0], 14)
+    
+    def test_record_hours_bulk_matches_single_entries(self):
+        """Test that bulk and one-by-one recording produce the same totals."""
+        self.time_tracking.record_hours_bulk([(1, 1, 3)] * 5)
+        self.time_tracking.record_hours(1, 1, 3)
+        
+        project = self.time_tracking.project.get_by_number(1)
+        self.assertEqual(project['current_manhours'], 18)
+        self.assertEqual(project['wages_payable'], 450.0)
+    
+    def test_record_hours_any_sector(self):
+        """Test recording hours for a sector without a legacy trade column."""
+        self.time_tracking.sector.create({'sector_id': 7, 'sector_name': 'Rigger', 'sector_wage': 20.0})
+        self.time_tracking.employee.create({
+            'id_number': 2, 'full_name': 'Jane Roe', 'hour_per_week': 40,
+            'salary': 40000.0, 'designation': 'Rigger', 'project_number': 1
+        })
+        self.assertTrue(self.time_tracking.record_hours(2, 1, 5))
+        self.assertTrue(self.time_tracking.record_hours(2, 1, 5))
+        
+        with self.db_manager.get_connection() as conn:
+            hours = conn.execute(
+                "SELECT hours FROM project_sector_hours WHERE project_number = 1 AND sector_id = 7"
+            ).fetchone()[0]
+        self.assertEqual(hours, 10)
+        self.assertEqual(self.time_tracking.project.get_by_number(1)['wages_payable'], 200.0)
+    
+    def test_record_hours_appends_to_log(self):
+        """Test that every recorded entry is logged with its wage."""
+        self.time_tracking.record_hours(1, 1, 8)
+        self.time_tracking.record_hours_bulk([(1, 1, 2)])
+        
+        entries = self.time_tracking.get_entries(employee_id=1)
+        self.assertEqual([(e['hours'], e['wage_rate'], e['wages']) for e in entries],
+                         [(2, 25.0, 50.0), (8, 25.0, 200.0)])
+        
+        with self.db_manager.get_connection() as conn:
+            with self.assertRaises(sqlite3.IntegrityError):
+                conn.execute("DELETE FROM time_entries")
+    
+    def test_rebuild_aggregates(self):
+        """Test that the counters can be rebuilt from the log."""
+        self.time_tracking.record_hours(1, 1, 8)
+        self.time_tracking.record_hours_bulk([(1, 1, 4), (1, 1, 2)])
+        with self.db_manager.get_connection() as conn:
+            conn.execute("UPDATE projects SET current_manhours = 0, wages_payable = 0")
+            conn.execute("UPDATE employees SET attendance = 99")
+            conn.execute("DELETE FROM project_sector_hours")
+            conn.commit()
+        
+        self.assertTrue(self.time_tracking.rebuild_aggregates())
+        
+        project = self.time_tracking.project.get_by_number(1)
+        self.assertEqual((project['current_manhours'], project['wages_payable']), (14, 350.0))
+        self.assertEqual(self.time_tracking.employee.get_by_id(1)['attendance'], 3)
+        self.assertEqual(self.time_tracking.project.get_specific_manhours(1)['Engineer'], 14)
+    
+    def test_logged_keys_cannot_change(self):
+        """Test that renaming keys the log refers to is rejected, so rebuilds stay correct."""
+        self.time_tracking.record_hours(1, 1, 5)
+        employee = dict(self.time_tracking.employee.get_by_id(1), id_number=2)
+        self.assertFalse(self.time_tracking.employee.update(1, employee))
+        sector = Sector(self.db_manager)
+        self.assertFalse(sector.update(1, {'sector_id': 7, 'sector_name': 'Engineer', 'sector_wage': 25.0}))
+        
+        self.assertTrue(self.time_tracking.rebuild_aggregates())
+        self.assertEqual(self.time_tracking.employee.get_by_id(1)['attendance'], 1)
+        self.assertEqual(self.time_tracking.project.get_by_number(1)['current_manhours'], 5)
+        self.assertEqual(self.time_tracking.project.get_specific_manhours(1)['Engineer'], 5)
+        
+        # Keys without entries can still change
+        self.assertTrue(self.time_tracking.employee.create({
+            'id_number': 3, 'full_name': 'Jane Roe', 'hour_per_week': 40, 'salary': 1000.0,
+            'designation': 'Engineer', 'project_number': 1,
+        }))
+        employee = dict(self.time_tracking.employee.get_by_id(3), id_number=4)
+        self.assertTrue(self.time_tracking.employee.update(3, employee))
+        self.assertTrue(sector.create({'sector_id': 2, 'sector_name': 'Welder', 'sector_wage': 20.0}))
+        self.assertTrue(sector.update(2, {'sector_id': 8, 'sector_name': 'Welder', 'sector_wage': 20.0}))
+    
+    def test_record_hours_keeps_employee_cache_current(self):
+        """Test that recorded attendance is written through to the cache."""
+        self.time_tracking.employee.get_by_id(1)
+        self.time_tracking.record_hours(1, 1, 8)
+        self.time_tracking.record_hours_bulk([(1, 1, 4), (1, 1, 4)])
+        
+        self.assertEqual(self.time_tracking.employee.get_by_id(1)['attendance'], 3)
+    
+    def test_changes_from_other_processes_are_seen_after_ttl(self):
+        """Test that cached sectors and employees expire after CACHE_TTL."""
+        with patch('models.time.monotonic', return_value=100.0):
+            self.assertTrue(self.time_tracking.record_hours(1, 1, 2))
+        
+        # A second manager stands in for another clerk process
+        other = DatabaseManager(self.temp_db.name)
+        try:
+            Sector(other).update(1, {'sector_id': 1, 'sector_name': 'Engineer', 'sector_wage': 40.0})
+            employee = dict(Employee(other).get_by_id(1), full_name='Renamed')
+            self.assertTrue(Employee(other).update(1, employee))
+        finally:
+            other.close()
+        
+        with patch('models.time.monotonic', return_value=100.0 + CACHE_TTL - 1):
+            self.assertEqual(self.time_tracking.employee.get_by_id(1)['full_name'], 'John Doe')
+            self.assertEqual(self.time_tracking.sector.get_by_id(1)['sector_wage'], 25.0)
+        with patch('models.time.monotonic', return_value=100.0 + CACHE_TTL):
+            self.assertEqual(self.time_tracking.employee.get_by_id(1)['full_name'], 'Renamed')
+            self.assertTrue(self.time_tracking.record_hours(1, 1, 2))
+        self.assertEqual(self.time_tracking.get_entries(1, limit=1)[0]['wages'], 80.0)
+        self.assertEqual(self.db_manager.sector_cache.stats()['expirations'], 1)
+    
+    def test_record_hours_uses_single_connection(self):
+        """Test that recording hours checks out exactly one connection."""
+        before = self.db_manager.pool_stats()['checkouts']
+        self.assertTrue(self.time_tracking.record_hours(1, 1, 8))
+        self.assertEqual(self.db_manager.pool_stats()['checkouts'], before + 1)
+    
+    def test_iter_projects_and_specific_manhours(self):
+        """Test the record iterators over the migrated project tables."""
+        self.time_tracking.record_hours(1, 1, 8)
+        
+        projects = list(self.time_tracking.project.iter_all())
+        self.assertEqual([(p.project_number, p.current_manhours) for p in projects], [(1, 8)])
+        hours = list(self.time_tracking.project.iter_specific_manhours())
+        self.assertEqual(hours, [SpecificManHoursRecord(1, 0, 0, 0, 8, 0, 0)])
+        sectors = list(self.time_tracking.sector.iter_all())
+        self.assertEqual(sectors[0].sector_name, 'Engineer')
+    
+    def test_auto_completion_is_trade_weighted(self):
+        """Test that hours count towards completion up to their trade's estimate."""
+        tracking = TimeTracking(self.db_manager, auto_completion=True)
+        
+        # Six trades estimated at 10 hours each; Engineer hours cap at 10 of 60
+        tracking.record_hours(1, 1, 8)
+        self.assertAlmostEqual(tracking.project.get_by_number(1)['percentage_completion'], 100 * 8 / 60)
+        tracking.record_hours(1, 1, 8)
+        self.assertAlmostEqual(tracking.project.get_by_number(1)['percentage_completion'], 100 * 10 / 60)
+        
+        # Manual mode leaves the percentage alone
+        self.time_tracking.record_hours(1, 1, 8)
+        self.assertAlmostEqual(tracking.project.get_by_number(1)['percentage_completion'], 100 * 10 / 60)
+    
+    def test_auto_completion_bulk_and_recompute_agree(self):
+        """Test that bulk increments match single entries and a full recompute."""
+        tracking = TimeTracking(self.db_manager, auto_completion=True)
+        tracking.record_hours_bulk([(1, 1, 3)] * 3)
+        self.assertAlmostEqual(tracking.project.get_by_number(1)['percentage_completion'], 100 * 9 / 60)
+        
+        tracking.project.update_percentage(1, 0.0)
+        self.assertTrue(tracking.project.recompute_completion(1))
+        self.assertAlmostEqual(tracking.project.get_by_number(1)['percentage_completion'], 100 * 9 / 60)
+    
+    def test_auto_completion_without_trade_estimates(self):
+        """Test the current_manhours / estimated_man_hours fallback."""
+        with self.db_manager.get_connection() as conn:
+            conn.execute("""
+                UPDATE projects SET welder_manhours = 0, builder_manhours = 0, painter_manhours = 0,
+                    engineer_manhours = 0, manager_manhours = 0, fitter_manhours = 0
+            """)
+            conn.commit()
+        tracking = TimeTracking(self.db_manager, auto_completion=True)
+        tracking.record_hours(1, 1, 8)
+        self.assertAlmostEqual(tracking.project.get_by_number(1)['percentage_completion'], 8.0)
+    
+    def test_group_commit_writer_commits_concurrent_entries(self):
+        """Test that entries from many threads are committed in shared groups."""
+        writer = GroupCommitWriter(self.time_tracking, max_delay=0.05)
+        futures = []
+        def submit():
+            futures.extend(writer.record_hours(1, 1, 1) for _ in range(10))
+        threads = [threading.Thread(target=submit) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual([future.result(5) for future in futures], [(True, "")] * 80)
+        writer.close()
+        
+        stats = writer.stats()
+        self.assertEqual(stats['entries'], 80)
+        self.assertLess(stats['commits'], 80)
+        self.assertEqual(Project(self.db_manager).get_by_number(1)['current_manhours'], 80)
+    
+    def test_group_commit_writer_reports_each_entry(self):
+        """Test per-entry results of a submission and flushing."""
+        writer = GroupCommitWriter(self.time_tracking)
+        report = writer.submit([(1, 1, 2), (99, 1, 2), (1, 7, 2)]).result(5)
+        self.assertEqual(report, [(True, ""), (False, "Employee 99 not found"),
+                                  (False, "Project 7 not found")])
+        writer.record_hours(1, 1, 3)
+        writer.flush(5)
+        self.assertEqual(self.time_tracking.get_entries(employee_id=1)[0]['hours'], 3)
+        writer.close()
+    
+    def test_group_commit_writer_isolates_bad_entries(self):
+        """Test that a malformed entry fails alone instead of failing its group."""
+        writer = GroupCommitWriter(self.time_tracking, max_delay=0.05)
+        good = writer.record_hours(1, 1, 2)
+        bad = writer.record_hours(1, 1, "x")
+        mixed = writer.submit([(1, 1, 3), (1, 1, None), (1, 1, 25)])
+        writer.close()
+        
+        self.assertEqual(good.result(0), (True, ""))
+        self.assertFalse(bad.result(0)[0])
+        self.assertIn("Invalid numeric values", bad.result(0)[1])
+        self.assertEqual([success for success, _ in mixed.result(0)], [True, False, False])
+        self.assertEqual(writer.stats()['commits'], 1)
+        self.assertEqual(Project(self.db_manager).get_by_number(1)['current_manhours'], 5)
+    
+    def test_group_commit_writer_close_commits_queued_entries(self):
+        """Test that close commits what is queued and skips cancelled entries."""
+        writer = GroupCommitWriter(self.time_tracking, max_delay=10)
+        first = writer.record_hours(1, 1, 4)
+        second = writer.record_hours(1, 1, 5)
+        self.assertTrue(second.cancel())
+        writer.close()
+        
+        self.assertEqual(first.result(0), (True, ""))
+        self.assertEqual([entry['hours'] for entry in self.time_tracking.get_entries()], [4])
+        self.assertEqual(writer.stats()['cancelled'], 1)
+        with self.assertRaises(RuntimeError):
+            writer.record_hours(1, 1, 1)
 
 if __name__ == '__main__':
     # Run tests with verbose output
@@ -0,0 +1,89 @@
+"""
+Unit tests for the parallel payroll computation.
+"""
+
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from benchmarks import generate_database
+from models import DatabaseManager, TimeTracking
+from payroll import compute_payroll, connect_readonly, merge, partition
+
+class TestPayroll(unittest.TestCase):
+    """Test compute_payroll against direct GROUP BY queries."""
+    
+    @classmethod
+    def setUpClass(cls):
+        cls.temp_dir = tempfile.TemporaryDirectory()
+        cls.db_path = os.path.join(cls.temp_dir.name, 'payroll.db')
+        generate_database(cls.db_path, employees=30, projects=4, sectors=6)
+        db_manager = DatabaseManager(cls.db_path)
+        try:
+            TimeTracking(db_manager).record_hours_bulk(
+                [(1 + n % 30, 1 + n % 4, 1 + n % 9) for n in range(300)]
+            )
+        finally:
+            db_manager.close()
+    
+    @classmethod
+    def tearDownClass(cls):
+        cls.temp_dir.cleanup()
+    
+    def expected(self, key):
+        conn = sqlite3.connect(self.db_path)
+        try:
+            return {group: (hours, round(wages, 6), entries) for group, hours, wages, entries in conn.execute(
+                f"SELECT {key}, SUM(hours), SUM(wages), COUNT(*) FROM time_entries "
+                f"WHERE {key} IS NOT NULL GROUP BY 1"
+            )}
+        finally:
+            conn.close()
+    
+    def summary(self, payroll):
+        return {group: (totals['hours'], round(totals['wages'], 6), totals['entries'])
+                for group, totals in payroll.items()}
+    
+    def test_matches_group_by(self):
+        """Test that every grouping matches SQL in-process and with worker processes."""
+        for group_by, key in (('project', 'project_number'), ('employee', 'employee_id'),
+                              ('month', 'substr(recorded_at, 1, 7)')):
+            expected = self.expected(key)
+            for workers, partitions in ((1, None), (1, 3), (2, None)):
+                with self.subTest(group_by=group_by, workers=workers, partitions=partitions):
+                    payroll = compute_payroll(self.db_path, group_by, workers, partitions)
+                    self.assertEqual(self.summary(payroll), expected)
+    
+    def test_trades(self):
+        """Test that per-trade totals add up to the group totals."""
+        payroll = compute_payroll(self.db_path, 'project', workers=1, partitions=2)
+        for totals in payroll.values():
+            self.assertEqual(sum(trade['hours'] for trade in totals['trades'].values()), totals['hours'])
+            self.assertAlmostEqual(sum(trade['wages'] for trade in totals['trades'].values()),
+                                   totals['wages'])
+    
+    def test_unknown_grouping(self):
+        """Test that an unknown grouping is rejected."""
+        with self.assertRaises(ValueError):
+            compute_payroll(self.db_path, 'sector', workers=1)
+    
+    def test_readonly_connection(self):
+        """Test that the worker connections cannot write."""
+        conn = connect_readonly(self.db_path)
+        try:
+            with self.assertRaises(sqlite3.OperationalError):
+                conn.execute("DELETE FROM sector")
+        finally:
+            conn.close()
+    
+    def test_partition_and_merge(self):
+        """Test that ranges cover the ids exactly once and partials add up."""
+        self.assertEqual(partition(1, 10, 3), [(1, 3), (4, 6), (7, 10)])
+        self.assertEqual(partition(5, 6, 4), [(5, 5), (6, 6)])
+        self.assertEqual(partition(3, 2, 4), [])
+        merged = merge([{('a', 1): [1, 2.0, 0, 1]}, {('a', 1): [3, 4.0, 1, 2], ('b', None): [1, 1.0, 0, 1]}])
+        self.assertEqual(merged, {('a', 1): [4, 6.0, 1, 3], ('b', None): [1, 1.0, 0, 1]})
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
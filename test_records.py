@@ -0,0 +1,37 @@
+"""
+Unit tests for the records module.
+"""
+
+import sqlite3
+import unittest
+
+from records import EmployeeRecord, ProjectRecord, record_columns, record_factory
+
+class TestRecords(unittest.TestCase):
+    """Test the record types and their row factory."""
+    
+    def test_records_have_no_instance_dict(self):
+        """Test that records are compact tuples with named fields."""
+        record = EmployeeRecord(1, 'John Doe', 40, 50000.0, 'Welder', 2, 0)
+        self.assertFalse(hasattr(record, '__dict__'))
+        self.assertEqual(record.designation, 'Welder')
+        self.assertEqual(record._asdict()['project_number'], 2)
+    
+    def test_factory_builds_records_from_rows(self):
+        """Test that the row factory maps selected columns onto the fields."""
+        conn = sqlite3.connect(':memory:')
+        conn.execute("CREATE TABLE employees (attendance, project_number, designation, salary, "
+                     "hour_per_week, full_name, id_number)")
+        conn.execute("INSERT INTO employees VALUES (3, 2, 'Welder', 1.5, 40, 'Jane', 9)")
+        conn.row_factory = record_factory(EmployeeRecord)
+        
+        record = conn.execute(f"SELECT {record_columns(EmployeeRecord)} FROM employees").fetchone()
+        self.assertEqual(record, EmployeeRecord(9, 'Jane', 40, 1.5, 'Welder', 2, 3))
+        conn.close()
+    
+    def test_columns_follow_field_order(self):
+        """Test the generated column list."""
+        self.assertTrue(record_columns(ProjectRecord).startswith('"price", "estimated_man_hours"'))
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,128 @@
+"""
+Unit tests for columnar snapshot export.
+"""
+
+import os
+import sqlite3
+import tempfile
+import unittest
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from benchmarks import generate_database
+from models import DatabaseManager, TimeTracking
+
+if np is not None:
+    from analytics import compute_metrics, load_portfolio, load_portfolio_from_snapshot
+    from snapshot import SNAPSHOT_COLUMNS, SNAPSHOT_TABLES, Snapshot, column_array, export_snapshot
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestSnapshot(unittest.TestCase):
+    """Test exporting, mapping and reporting from snapshots."""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.temp_dir.name, 'live.db')
+        generate_database(self.db_path, employees=25, projects=5, sectors=8)
+        self.db_manager = DatabaseManager(self.db_path)
+        TimeTracking(self.db_manager).record_hours_bulk([(1 + n % 25, 1 + n % 5, 3) for n in range(40)])
+        self.directory = os.path.join(self.temp_dir.name, 'snapshot')
+    
+    def tearDown(self):
+        self.db_manager.close()
+        self.temp_dir.cleanup()
+    
+    def test_columns_match_tables(self):
+        """Test that every column is mapped and equals the table in key order."""
+        manifest = export_snapshot(self.db_manager, self.directory)
+        snapshot = Snapshot(self.directory)
+        self.assertEqual(snapshot.tables, list(SNAPSHOT_TABLES))
+        self.assertEqual(manifest['tables']['employees']['rows'], 25)
+        self.assertFalse(os.path.exists(os.path.join(self.directory, 'iscon.db')))
+        
+        conn = sqlite3.connect(self.db_path)
+        try:
+            for table, key in SNAPSHOT_TABLES.items():
+                columns = ', '.join(SNAPSHOT_COLUMNS.get(table, ())) or '*'
+                cursor = conn.execute(f'SELECT {columns} FROM "{table}" ORDER BY "{key}"')
+                names = [description[0] for description in cursor.description]
+                rows = cursor.fetchall()
+                self.assertEqual(snapshot.columns(table), names)
+                self.assertEqual(snapshot.rows(table), len(rows))
+                for i, name in enumerate(names):
+                    column = snapshot.column(table, name)
+                    self.assertIsInstance(column, np.memmap)
+                    self.assertEqual(column.tolist(), [row[i] for row in rows], f"{table}.{name}")
+        finally:
+            conn.close()
+        with self.assertRaises(KeyError):
+            snapshot.column('sector', 'missing')
+    
+    def test_column_types(self):
+        """Test the dtype chosen for integer, nullable, text and empty columns."""
+        self.assertEqual(column_array([1, 2]).dtype, np.int64)
+        nullable = column_array([1, None, 2.5])
+        self.assertEqual(nullable.dtype, np.float64)
+        self.assertTrue(np.isnan(nullable[1]))
+        self.assertEqual(column_array(['Welder', None]).tolist(), ['Welder', ''])
+        self.assertEqual(column_array([]).shape, (0,))
+    
+    def versions(self):
+        return sorted(name for name in os.listdir(self.temp_dir.name) if name.startswith('.'))
+    
+    def test_replace_and_keep_database(self):
+        """Test that a new export replaces the old one while the old one stays readable."""
+        export_snapshot(self.db_manager, self.directory)
+        old_snapshot = Snapshot(self.directory)
+        old_names = old_snapshot.column('employees', 'full_name')
+        with self.db_manager.transaction() as conn:
+            conn.execute("UPDATE employees SET full_name = 'Renamed' WHERE id_number = 1")
+        
+        export_snapshot(self.db_manager, self.directory, keep_database=True)
+        self.assertTrue(os.path.islink(self.directory))
+        self.assertEqual(old_names[0], 'Employee 1')
+        # Columns of the previous version can still be mapped after the swap
+        self.assertEqual(old_snapshot.column('employees', 'full_name')[0], 'Employee 1')
+        self.assertEqual(Snapshot(self.directory).column('employees', 'full_name')[0], 'Renamed')
+        self.assertTrue(os.path.exists(os.path.join(self.directory, 'iscon.db')))
+        self.assertEqual(len(self.versions()), 2)
+        
+        # Only the current and the previous version are kept
+        export_snapshot(self.db_manager, self.directory)
+        self.assertFalse(os.path.exists(old_snapshot.directory))
+        self.assertEqual(len(self.versions()), 2)
+        self.assertIn(os.path.basename(os.path.realpath(self.directory)), self.versions())
+    
+    def test_publish_over_plain_directory(self):
+        """Test that a snapshot directory from before versioning is replaced by a link."""
+        os.makedirs(self.directory)
+        with open(os.path.join(self.directory, 'manifest.json'), 'w') as f:
+            f.write('{"tables": {}}')
+        
+        export_snapshot(self.db_manager, self.directory)
+        self.assertTrue(os.path.islink(self.directory))
+        self.assertEqual(Snapshot(self.directory).rows('employees'), 25)
+    
+    def test_analytics_from_snapshot(self):
+        """Test that the snapshot portfolio matches the one loaded from the database."""
+        export_snapshot(self.db_manager, self.directory)
+        live = load_portfolio(self.db_manager)
+        mapped = load_portfolio_from_snapshot(Snapshot(self.directory), as_of=live.as_of)
+        for name in ('project_number', 'price', 'estimated_man_hours', 'current_manhours',
+                     'percentage_completion', 'wages_payable', 'trade_estimated',
+                     'trade_actual', 'trade_wage', 'logged_hours'):
+            np.testing.assert_array_equal(getattr(mapped, name), getattr(live, name), name)
+        # Wages are summed in a different order than SUM() does
+        np.testing.assert_allclose(mapped.logged_wages, live.logged_wages)
+        # julianday() in SQLite and datetime64 in numpy agree to the millisecond
+        np.testing.assert_allclose(mapped.first_logged_at, live.first_logged_at, rtol=0, atol=1e-3)
+        self.assertGreater(np.nansum(mapped.trade_actual), 0)
+        self.assertGreater(np.nansum(mapped.logged_hours), 0)
+        np.testing.assert_allclose(compute_metrics(mapped)['burn_rate'],
+                                   compute_metrics(live)['burn_rate'])
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
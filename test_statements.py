@@ -0,0 +1,59 @@
+"""
+Unit tests for the statement registry.
+"""
+
+import os
+import re
+import sqlite3
+import tempfile
+import unittest
+
+from migrations import migrate
+from statements import STATEMENTS, EMPLOYEE_BY_ID, register, statement_name
+
+class NullParameters(dict):
+    """Binds NULL to every named parameter."""
+    
+    def __missing__(self, key):
+        return None
+
+class TestStatements(unittest.TestCase):
+    """Test the registered statements against a fully migrated database."""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.temp_dir.name, 'test.db')
+        migrate(self.db_path)
+    
+    def tearDown(self):
+        self.temp_dir.cleanup()
+    
+    def test_every_statement_compiles(self):
+        """Test that each statement prepares against the current schema."""
+        conn = sqlite3.connect(self.db_path)
+        self.addCleanup(conn.close)
+        for name, sql in STATEMENTS.items():
+            with self.subTest(statement=name):
+                if re.search(r':\w+', sql):
+                    parameters = NullParameters()
+                else:
+                    parameters = (None,) * sql.count('?')
+                # EXPLAIN compiles the statement without running it
+                conn.execute("EXPLAIN " + sql, parameters).fetchall()
+    
+    def test_statements_are_static(self):
+        """Test that no statement is left with a format placeholder."""
+        for name, sql in STATEMENTS.items():
+            with self.subTest(statement=name):
+                self.assertNotIn('{}', sql)
+                self.assertEqual(statement_name(sql), name)
+    
+    def test_names_are_unique(self):
+        """Test that a name cannot be registered twice."""
+        self.assertEqual(statement_name(EMPLOYEE_BY_ID), 'employee.by_id')
+        with self.assertRaises(ValueError):
+            register('employee.by_id', "SELECT 1")
+        self.assertIsNone(statement_name("SELECT 1"))
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
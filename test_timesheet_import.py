@@ -0,0 +1,198 @@
+"""
+Unit tests for the streaming timesheet importer.
+"""
+
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from migrations import migrate
+from models import DatabaseManager
+from timesheet_import import TimesheetImporter, parse_rows
+
+class TestTimesheetImporter(unittest.TestCase):
+    """Test the TimesheetImporter class."""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_manager = DatabaseManager(os.path.join(self.temp_dir.name, 'test.db'))
+        self.importer = TimesheetImporter(self.db_manager, batch_size=2, progress_every=2)
+        
+        with self.db_manager.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                CREATE TABLE employees (
+                    id_number INTEGER, full_name TEXT, hour_per_week INTEGER, salary REAL,
+                    designation TEXT, project_number INTEGER, attendance INTEGER
+                )
+            """)
+            cursor.execute("CREATE TABLE sector (sector_id INTEGER, sector_name TEXT, sector_wage REAL)")
+            cursor.execute("""
+                CREATE TABLE projects (
+                    price REAL, estimated_man_hours INTEGER, current_manhours INTEGER,
+                    percentage_completion REAL, project_number INTEGER,
+                    welder_manhours INTEGER, builder_manhours INTEGER, painter_manhours INTEGER,
+                    engineer_manhours INTEGER, manager_manhours INTEGER, fitter_manhours INTEGER,
+                    wages_payable REAL
+                )
+            """)
+            cursor.execute("""
+                CREATE TABLE specific_man_hours (
+                    project_number INTEGER, Welder INTEGER, Builder INTEGER, Painter INTEGER,
+                    Engineer INTEGER, Manager INTEGER, Fitter INTEGER
+                )
+            """)
+            cursor.execute("INSERT INTO employees VALUES (1, 'John Doe', 40, 50000.0, 'Welder', 1, 0)")
+            cursor.execute("INSERT INTO sector VALUES (1, 'Welder', 10.0)")
+            cursor.execute("""
+                INSERT INTO projects VALUES (10000.0, 100, 0, 0.0, 1, 10, 10, 10, 10, 10, 10, 0.0)
+            """)
+            cursor.execute("INSERT INTO specific_man_hours VALUES (1, 0, 0, 0, 0, 0, 0)")
+            conn.commit()
+        migrate(self.db_manager.db_path)
+    
+    def tearDown(self):
+        self.db_manager.close()
+        self.temp_dir.cleanup()
+    
+    def write_file(self, name: str, content: str) -> str:
+        path = os.path.join(self.temp_dir.name, name)
+        with open(path, 'w') as f:
+            f.write(content)
+        return path
+    
+    def project_totals(self):
+        with self.db_manager.get_connection() as conn:
+            row = conn.execute(
+                "SELECT current_manhours, wages_payable FROM projects WHERE project_number = 1"
+            ).fetchone()
+            return tuple(row)
+    
+    def test_import_csv(self):
+        """Test importing a CSV timesheet with a rejected row."""
+        path = self.write_file('sheet.csv', (
+            "employee_id,project_number,hours\n"
+            "1,1,8\n"
+            "1,1,abc\n"
+            "\n"
+            "1,1,4\n"
+            "2,1,4\n"
+        ))
+        stats = self.importer.run(path)
+        
+        self.assertEqual(stats, {'rows': 4, 'rejected': 1, 'recorded': 2, 'failed': 1})
+        self.assertEqual(self.project_totals(), (12, 120.0))
+        self.assertEqual(self.importer.load_checkpoint(path), 0)
+    
+    def test_import_jsonl(self):
+        """Test importing a JSONL timesheet."""
+        lines = [{'employee_id': 1, 'project_number': 1, 'hours': 3}] * 3
+        path = self.write_file('sheet.jsonl', "".join(json.dumps(line) + "\n" for line in lines))
+        stats = self.importer.run(path)
+        
+        self.assertEqual(stats['recorded'], 3)
+        self.assertEqual(self.project_totals(), (9, 90.0))
+    
+    def test_fractional_hours_rejected(self):
+        """Test that fractional JSON hours are rejected rather than truncated."""
+        lines = [{'employee_id': 1, 'project_number': 1, 'hours': 1.5},
+                 {'employee_id': 1, 'project_number': 1, 'hours': 2.0}]
+        path = self.write_file('sheet.jsonl', "".join(json.dumps(line) + "\n" for line in lines))
+        stats = self.importer.run(path)
+        
+        self.assertEqual((stats['rejected'], stats['recorded']), (1, 1))
+        self.assertEqual(self.project_totals(), (2, 20.0))
+    
+    def test_bad_bytes_reject_only_their_row(self):
+        """Test that a row that is not UTF-8 is rejected without aborting the import."""
+        for name in ('sheet.csv', 'sheet.jsonl'):
+            with self.subTest(name=name):
+                good = ('1,1,2\n' if name.endswith('.csv')
+                        else json.dumps({'employee_id': 1, 'project_number': 1, 'hours': 2}) + '\n')
+                path = os.path.join(self.temp_dir.name, name)
+                with open(path, 'wb') as f:
+                    if name.endswith('.csv'):
+                        f.write(b"employee_id,project_number,hours\n")
+                    f.write(good.encode() + b"1,1,\xff\n" + good.encode())
+                stats = self.importer.run(path)
+                self.assertEqual((stats['rows'], stats['rejected'], stats['recorded']), (3, 1, 2))
+    
+    def test_quoted_fields_spanning_lines(self):
+        """Test that a quoted multi-line field is one record and an unclosed quote is rejected."""
+        path = self.write_file('sheet.csv', (
+            "employee_id,project_number,hours,note\n"
+            '1,1,8,"first line\nsecond line"\n'
+            "1,1,4,plain\n"
+            '1,1,2,"never closed\n'
+            "1,1,1,swallowed\n"
+        ))
+        rows = [row for _, row in parse_rows(path, 'csv')]
+        self.assertEqual(rows[0]['note'], "first line\nsecond line")
+        self.assertEqual(rows[2], {})
+        
+        stats = self.importer.run(path)
+        self.assertEqual((stats['rows'], stats['rejected'], stats['recorded']), (3, 1, 2))
+        self.assertEqual(self.project_totals(), (12, 120.0))
+    
+    def test_auto_completion_recomputes_first(self):
+        """Test that an auto-completion import starts from the recorded hours, not a manual value."""
+        TimesheetImporter(self.db_manager).run(self.write_file('before.csv', (
+            "employee_id,project_number,hours\n"
+            "1,1,4\n"
+        )))
+        with self.db_manager.transaction() as conn:
+            conn.execute("UPDATE projects SET percentage_completion = 90 WHERE project_number = 1")
+        
+        importer = TimesheetImporter(self.db_manager, auto_completion=True)
+        importer.run(self.write_file('after.csv', "employee_id,project_number,hours\n1,1,2\n"))
+        
+        with self.db_manager.get_connection() as conn:
+            percentage = conn.execute(
+                "SELECT percentage_completion FROM projects WHERE project_number = 1"
+            ).fetchone()[0]
+        # 6 Welder hours of the 60 estimated across the six trades
+        self.assertAlmostEqual(percentage, 10.0)
+    
+    def test_resume_from_checkpoint(self):
+        """Test that a resumed import skips rows before the checkpoint."""
+        path = self.write_file('sheet.csv', (
+            "employee_id,project_number,hours\n"
+            "1,1,8\n"
+            "1,1,4\n"
+            "1,1,2\n"
+        ))
+        first_offset = next(parse_rows(path, 'csv'))[0]
+        self.importer.save_checkpoint(path, first_offset)
+        
+        stats = self.importer.run(path, resume=True)
+        
+        self.assertEqual(stats['recorded'], 2)
+        self.assertEqual(self.project_totals(), (6, 60.0))
+    
+    def test_crash_after_batch_is_not_replayed(self):
+        """Test that a batch and its checkpoint commit together."""
+        path = self.write_file('sheet.csv', (
+            "employee_id,project_number,hours\n"
+            "1,1,8\n"
+            "1,1,4\n"
+            "1,1,2\n"
+        ))
+        record_hours_bulk = self.importer.time_tracking.record_hours_bulk
+        
+        def crash_after_commit(*args, **kwargs):
+            record_hours_bulk(*args, **kwargs)
+            raise KeyboardInterrupt
+        
+        with patch.object(self.importer.time_tracking, 'record_hours_bulk', crash_after_commit):
+            with self.assertRaises(KeyboardInterrupt):
+                self.importer.run(path)
+        self.assertEqual(self.project_totals(), (12, 120.0))
+        
+        stats = self.importer.run(path, resume=True)
+        self.assertEqual(stats['recorded'], 1)
+        self.assertEqual(self.project_totals(), (14, 140.0))
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
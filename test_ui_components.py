@@ -0,0 +1,192 @@
+"""
+Unit tests for the ui_components helpers that do not need a display.
+"""
+
+import threading
+import unittest
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from ui_components import (
+    DatabaseWorker, EmployeePager, EmployeeSearchResults, VirtualEmployeeList, save_employee_record
+)
+
+class FakeRoot:
+    """Stands in for the Tk root: collects after() callbacks to run by hand."""
+    
+    def __init__(self):
+        self.scheduled = []
+    
+    def after(self, delay, callback):
+        self.scheduled.append(callback)
+    
+    def run_pending(self):
+        scheduled, self.scheduled = self.scheduled, []
+        for callback in scheduled:
+            callback()
+
+class TestEmployeePager(unittest.TestCase):
+    """Test the EmployeePager class."""
+    
+    def setUp(self):
+        self.employees = [{'id_number': i * 10} for i in range(1, 26)]
+        
+        def get_page(after_id, limit):
+            rows = [e for e in self.employees if after_id is None or e['id_number'] > after_id]
+            return rows[:limit]
+        
+        self.service = MagicMock()
+        self.service.count.return_value = len(self.employees)
+        self.service.get_page.side_effect = get_page
+        self.service.get_page_at.side_effect = lambda position, limit: self.employees[position:position + limit]
+        
+        self.pager = EmployeePager(self.service, page_size=5, prefetch_pages=1)
+        self.pager.reset()
+    
+    def test_rows_in_view(self):
+        """Test that the requested slice is returned across page boundaries."""
+        rows = self.pager.rows(3, 4)
+        self.assertEqual([r['id_number'] for r in rows], [40, 50, 60, 70])
+        # Pages 0 and 1 are in view, page 2 is prefetched
+        self.assertEqual(sorted(self.pager.pages), [0, 1, 2])
+    
+    def test_sequential_pages_use_keyset(self):
+        """Test that scrolling forward continues from the last loaded ID."""
+        self.pager.rows(0, 5)
+        self.pager.rows(10, 5)
+        self.service.get_page.assert_any_call(100, 5)
+        self.service.get_page_at.assert_not_called()
+    
+    def test_jump_and_eviction(self):
+        """Test that a jump loads only nearby pages and drops the rest."""
+        self.pager.rows(0, 5)
+        rows = self.pager.rows(22, 5)
+        
+        self.assertEqual([r['id_number'] for r in rows], [230, 240, 250])
+        self.assertEqual(sorted(self.pager.pages), [3, 4])
+        self.service.get_page_at.assert_called_once_with(15, 5)
+
+class TestEmployeeSearchResults(unittest.TestCase):
+    """Test the EmployeeSearchResults class."""
+    
+    def test_reset_runs_search_and_slices_matches(self):
+        """Test that results are searched once and paged from memory."""
+        service = MagicMock()
+        service.search.return_value = [{'id_number': i} for i in range(10)]
+        results = EmployeeSearchResults(service, "jo", limit=10)
+        
+        results.reset()
+        self.assertEqual(results.total, 10)
+        self.assertEqual([row['id_number'] for row in results.rows(8, 5)], [8, 9])
+        self.assertEqual(results.cached_rows(0, 2), results.rows(0, 2))
+        service.search.assert_called_once_with("jo", 10)
+
+class TestDatabaseWorker(unittest.TestCase):
+    """Test the DatabaseWorker class."""
+    
+    def setUp(self):
+        self.root = FakeRoot()
+        self.worker = DatabaseWorker(self.root, max_workers=1)
+        self.counts = []
+        self.worker.listeners.append(self.counts.append)
+    
+    def tearDown(self):
+        self.worker.shutdown()
+    
+    def wait_and_poll(self, task):
+        task.future.exception(timeout=5)
+        self.root.run_pending()
+    
+    def test_result_delivered_on_poll(self):
+        """Test that results are delivered by the after() poll, not the worker thread."""
+        results = []
+        task = self.worker.submit(lambda x: (x * 2, threading.current_thread().name), 21,
+                                  on_success=results.append)
+        task.future.result(timeout=5)
+        self.assertEqual(results, [])
+        
+        self.root.run_pending()
+        self.assertEqual(results[0][0], 42)
+        self.assertTrue(results[0][1].startswith("db-worker"))
+        self.assertEqual(self.counts, [1, 0])
+    
+    def test_errors_go_to_on_error(self):
+        """Test that exceptions are delivered to on_error."""
+        errors = []
+        task = self.worker.submit(lambda: 1 / 0, on_error=errors.append)
+        self.wait_and_poll(task)
+        self.assertIsInstance(errors[0], ZeroDivisionError)
+    
+    def test_cancelled_task_callbacks_not_run(self):
+        """Test that a cancelled task neither runs nor calls back."""
+        gate = threading.Event()
+        blocker = self.worker.submit(gate.wait)
+        calls = []
+        task = self.worker.submit(calls.append, "ran", on_success=calls.append)
+        
+        self.assertTrue(task.cancel())
+        gate.set()
+        self.wait_and_poll(blocker)
+        self.root.run_pending()
+        
+        self.assertEqual(calls, [])
+        self.assertEqual(len(self.worker.in_flight), 0)
+
+class TestVirtualEmployeeListFetch(unittest.TestCase):
+    """Test how VirtualEmployeeList._fetch supersedes loads, without a display."""
+    
+    def setUp(self):
+        self.list = SimpleNamespace(pending=None, prefetch=None, worker=MagicMock(),
+                                    listbox=MagicMock(), _show=MagicMock())
+        self.list.worker.submit.side_effect = lambda *args, **kwargs: MagicMock()
+    
+    def fetch(self, update_view):
+        VirtualEmployeeList._fetch(self.list, MagicMock(), update_view=update_view)
+    
+    def test_prefetch_keeps_pending_refresh(self):
+        """Test that a prefetch of a cached view does not cancel a pending refresh."""
+        self.fetch(update_view=True)
+        refresh = self.list.pending
+        self.fetch(update_view=False)
+        first_prefetch = self.list.prefetch
+        self.fetch(update_view=False)
+        
+        refresh.cancel.assert_not_called()
+        first_prefetch.cancel.assert_called_once_with()
+        self.assertIs(self.list.pending, refresh)
+    
+    def test_view_update_supersedes_everything(self):
+        """Test that a new view update cancels the pending update and the prefetch."""
+        self.fetch(update_view=True)
+        self.fetch(update_view=False)
+        refresh, prefetch = self.list.pending, self.list.prefetch
+        self.fetch(update_view=True)
+        
+        refresh.cancel.assert_called_once_with()
+        prefetch.cancel.assert_called_once_with()
+
+class TestSaveEmployeeRecord(unittest.TestCase):
+    """Test the save the employee form runs on the worker thread."""
+    
+    def setUp(self):
+        self.service = MagicMock()
+        self.service.get_by_id.side_effect = lambda employee_id: (
+            {'id_number': employee_id} if employee_id in (1, 2) else None
+        )
+    
+    def test_create_rejects_taken_id(self):
+        """Test that a taken ID is reported as None without saving."""
+        self.assertIsNone(save_employee_record(self.service, {'id_number': 1}))
+        self.service.create.assert_not_called()
+        self.service.create.return_value = True
+        self.assertTrue(save_employee_record(self.service, {'id_number': 3}))
+    
+    def test_update_checks_only_a_changed_id(self):
+        """Test that an update may keep its own ID but not take another's."""
+        self.service.update.return_value = True
+        self.assertTrue(save_employee_record(self.service, {'id_number': 1}, original_id=1))
+        self.assertIsNone(save_employee_record(self.service, {'id_number': 2}, original_id=1))
+        self.service.update.assert_called_once_with(1, {'id_number': 1})
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
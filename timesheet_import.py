@@ -0,0 +1,232 @@
+"""
+Streaming timesheet importer.
+Reads CSV or JSONL timesheets row by row, validates each entry, batches the
+valid ones and records them through TimeTracking.record_hours_bulk. Progress
+is checkpointed as a byte offset in the import_progress table, in the same
+transaction as each batch, so an interrupted import resumes exactly where it
+stopped without recording any batch twice.
+
+Usage:
+    python timesheet_import.py timesheet.csv [--db iscon.db] [--resume]
+"""
+
+import argparse
+import csv
+import json
+import logging
+import os
+import sqlite3
+import sys
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from logging_config import setup_logging, stop_logging
+from migrations import migrate
+from models import DatabaseManager, TimeTracking, validate_time_entry_data
+from statements import IMPORT_PROGRESS_CLEAR, IMPORT_PROGRESS_GET, IMPORT_PROGRESS_SAVE
+
+logger = logging.getLogger(__name__)
+
+FIELDS = ('employee_id', 'project_number', 'hours')
+
+# Longest CSV record read while looking for the end of a quoted field
+MAX_RECORD_BYTES = 64 * 1024
+
+def detect_format(path: str) -> str:
+    """Guess the timesheet format from the file extension."""
+    extension = os.path.splitext(path)[1].lower()
+    if extension in ('.jsonl', '.ndjson'):
+        return 'jsonl'
+    return 'csv'
+
+def parse_rows(path: str, file_format: str, start_offset: int = 0) -> Iterator[Tuple[int, Dict]]:
+    """Yield (offset after row, row dict) for each row, starting at start_offset.
+    
+    The file is read in binary mode one line at a time so the byte offset of
+    every row is exact and only one record is held in memory. A CSV record
+    whose quoted fields span lines is read up to its closing quote. Rows that
+    are not valid UTF-8 or cannot be parsed are yielded as {} so that
+    validate_rows rejects them.
+    """
+    with open(path, 'rb') as f:
+        header: Optional[List[str]] = None
+        if file_format == 'csv':
+            header_line = f.readline().decode('utf-8-sig')
+            header = [name.strip() for name in next(csv.reader([header_line]))]
+        if start_offset > f.tell():
+            f.seek(start_offset)
+        
+        while True:
+            line = f.readline()
+            if not line:
+                return
+            if file_format == 'csv':
+                # An odd number of quotes leaves a quoted field open; '"' is a
+                # single byte in UTF-8, so counting bytes is exact
+                while line.count(b'"') % 2 and len(line) <= MAX_RECORD_BYTES:
+                    more = f.readline()
+                    if not more:
+                        break
+                    line += more
+            offset = f.tell()
+            try:
+                text = line.decode('utf-8').strip()
+            except UnicodeDecodeError:
+                yield offset, {}
+                continue
+            if not text:
+                continue
+            if file_format == 'csv':
+                if text.count('"') % 2:
+                    # Unterminated quote at the end of the file or record limit
+                    yield offset, {}
+                    continue
+                try:
+                    values = next(csv.reader(text.splitlines(True)))
+                except csv.Error:
+                    yield offset, {}
+                    continue
+                yield offset, dict(zip(header, values))
+            else:
+                try:
+                    row = json.loads(text)
+                except ValueError:
+                    row = None
+                yield offset, row if isinstance(row, dict) else {}
+
+def validate_rows(rows: Iterable[Tuple[int, Dict]], stats: Dict[str, int]) -> Iterator[Tuple[int, Tuple[int, int, int]]]:
+    """Yield (offset, entry) for valid rows and count the rejected ones."""
+    for offset, row in rows:
+        stats['rows'] += 1
+        is_valid, error = validate_time_entry_data(row)
+        if not is_valid:
+            stats['rejected'] += 1
+            logger.warning("Rejected row ending at byte %s: %s", offset, error)
+            continue
+        yield offset, tuple(int(row[field]) for field in FIELDS)
+
+def batch_entries(entries: Iterable[Tuple[int, Tuple[int, int, int]]],
+                  batch_size: int) -> Iterator[Tuple[int, List[Tuple[int, int, int]]]]:
+    """Group entries into batches, yielding (offset after batch, batch)."""
+    batch: List[Tuple[int, int, int]] = []
+    offset = 0
+    for offset, entry in entries:
+        batch.append(entry)
+        if len(batch) >= batch_size:
+            yield offset, batch
+            batch = []
+    if batch:
+        yield offset, batch
+
+class TimesheetImporter:
+    """Imports a timesheet file through the models layer with checkpoints."""
+    
+    def __init__(self, db_manager: DatabaseManager, batch_size: int = 1000,
+                 progress_every: int = 10000, auto_completion: bool = False):
+        self.db = db_manager
+        self.time_tracking = TimeTracking(db_manager, auto_completion)
+        self.batch_size = batch_size
+        self.progress_every = progress_every
+    
+    @staticmethod
+    def checkpoint_source(path: str) -> str:
+        """Get the import_progress key of a timesheet."""
+        return os.path.abspath(path)
+    
+    def load_checkpoint(self, path: str) -> int:
+        """Get the byte offset to resume from, or 0 if there is no checkpoint."""
+        try:
+            with self.db.get_connection() as conn:
+                row = conn.execute(IMPORT_PROGRESS_GET, (self.checkpoint_source(path),)).fetchone()
+                return row[0] if row else 0
+        except sqlite3.Error as e:
+            logger.error("Failed to load checkpoint of %s: %s", path, e)
+            return 0
+    
+    def save_checkpoint(self, path: str, offset: int):
+        """Record the offset up to which rows have been committed."""
+        with self.db.transaction() as conn:
+            conn.execute(IMPORT_PROGRESS_SAVE, (self.checkpoint_source(path), offset))
+    
+    def clear_checkpoint(self, path: str):
+        """Forget the checkpoint of a finished import."""
+        try:
+            with self.db.transaction() as conn:
+                conn.execute(IMPORT_PROGRESS_CLEAR, (self.checkpoint_source(path),))
+        except sqlite3.Error as e:
+            logger.error("Failed to clear checkpoint of %s: %s", path, e)
+    
+    def run(self, path: str, file_format: Optional[str] = None,
+            resume: bool = False) -> Dict[str, int]:
+        """Import a timesheet and return row counts.
+        
+        Each batch is recorded in one transaction together with the offset
+        after it, so resuming after a crash neither skips nor replays rows.
+        With auto_completion, percentage_completion is recomputed from the
+        recorded hours before the first batch, so manual or stale values do
+        not carry into the increments.
+        """
+        file_format = file_format or detect_format(path)
+        if self.time_tracking.auto_completion and not self.time_tracking.project.recompute_completion():
+            raise RuntimeError("Could not recompute project completion for auto-completion")
+        start_offset = self.load_checkpoint(path) if resume else 0
+        if start_offset:
+            logger.info("Resuming %s from byte %s", path, start_offset)
+        
+        source = self.checkpoint_source(path)
+        stats = {'rows': 0, 'rejected': 0, 'recorded': 0, 'failed': 0}
+        next_progress = self.progress_every
+        rows = parse_rows(path, file_format, start_offset)
+        entries = validate_rows(rows, stats)
+        
+        for offset, batch in batch_entries(entries, self.batch_size):
+            # One chunk per batch, so the whole batch commits with its offset
+            report = self.time_tracking.record_hours_bulk(
+                batch, chunk_size=len(batch), checkpoint=(source, offset)
+            )
+            for success, error in report:
+                if success:
+                    stats['recorded'] += 1
+                else:
+                    stats['failed'] += 1
+                    logger.warning("Failed to record entry: %s", error)
+            
+            if stats['rows'] >= next_progress:
+                logger.info(
+                    "Processed %s rows: %s recorded, %s rejected, %s failed",
+                    stats['rows'], stats['recorded'], stats['rejected'], stats['failed']
+                )
+                next_progress = (stats['rows'] // self.progress_every + 1) * self.progress_every
+        
+        self.clear_checkpoint(path)
+        logger.info("Finished importing %s: %s", path, stats)
+        return stats
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Import a CSV or JSONL timesheet.")
+    parser.add_argument('path', help="timesheet file with employee_id, project_number and hours")
+    parser.add_argument('--db', default='iscon.db', help="database file (default: iscon.db)")
+    parser.add_argument('--format', choices=['csv', 'jsonl'], help="file format (default: from extension)")
+    parser.add_argument('--batch-size', type=int, default=1000, help="entries per transaction")
+    parser.add_argument('--progress-every', type=int, default=10000, help="report progress every N rows")
+    parser.add_argument('--resume', action='store_true', help="continue from the last checkpoint")
+    parser.add_argument('--auto-completion', action='store_true',
+                        help="advance percentage_completion from the imported hours")
+    args = parser.parse_args(argv)
+    
+    # Progress is reported by the importer; per-batch records would only add noise
+    log_listener = setup_logging(log_file=None, operation_levels={'time.record_hours_bulk': 'DEBUG'})
+    migrate(args.db)
+    db_manager = DatabaseManager(args.db)
+    try:
+        importer = TimesheetImporter(db_manager, args.batch_size, args.progress_every,
+                                     args.auto_completion)
+        stats = importer.run(args.path, args.format, args.resume)
+    finally:
+        db_manager.close()
+        stop_logging(log_listener)
+    print(json.dumps(stats))
+    return 0 if stats['failed'] == 0 else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
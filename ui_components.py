@@ -3,12 +3,141 @@ Reusable UI components for the project management system.
 Separates UI logic from business logic and provides clean interfaces.
 """
 
+import queue
+import threading
 import tkinter as tk
+from concurrent.futures import Future, ThreadPoolExecutor
 from tkinter import ttk, messagebox
-from typing import Dict, List, Callable, Optional
+from typing import Dict, List, Callable, Optional, Set
 from models import DatabaseManager, Employee, Sector, Project, TimeTracking
 from models import validate_employee_data, validate_sector_data
 
+class BackgroundTask:
+    """Handle for a call submitted to a DatabaseWorker."""
+    
+    def __init__(self, on_success: Optional[Callable], on_error: Optional[Callable],
+                 owner: Optional[tk.Misc]):
+        self.on_success = on_success
+        self.on_error = on_error
+        self.owner = owner
+        self.cancelled = False
+        self.future: Optional[Future] = None
+    
+    def cancel(self) -> bool:
+        """Cancel the call; returns True if it had not started running.
+        
+        A call that is already running finishes, but its callbacks are not run.
+        """
+        self.cancelled = True
+        return self.future.cancel() if self.future else True
+
+class DatabaseWorker:
+    """Runs model calls off the Tk main loop and delivers results back on it.
+    
+    Worker threads put results on a queue that the Tk thread drains with
+    root.after, since Tk widgets must only be touched from the main thread.
+    """
+    
+    def __init__(self, root: tk.Misc, max_workers: int = 2, poll_interval: int = 25):
+        self.root = root
+        self.poll_interval = poll_interval
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="db-worker")
+        self.in_flight: Set[BackgroundTask] = set()
+        self.listeners: List[Callable[[int], None]] = []
+        self._results: "queue.Queue" = queue.Queue()
+        self._closed = False
+        self.root.after(self.poll_interval, self._poll)
+    
+    def submit(self, func: Callable, *args, on_success: Optional[Callable] = None,
+               on_error: Optional[Callable] = None, owner: Optional[tk.Misc] = None,
+               **kwargs) -> BackgroundTask:
+        """Run func(*args, **kwargs) on a worker thread.
+        
+        on_success(result) or on_error(exception) is then called on the Tk
+        thread, unless the task was cancelled or its owner widget destroyed.
+        """
+        task = BackgroundTask(on_success, on_error, owner)
+        self.in_flight.add(task)
+        task.future = self.executor.submit(self._run, task, func, args, kwargs)
+        task.future.add_done_callback(lambda future: self._on_done(task, future))
+        self._notify()
+        return task
+    
+    def _run(self, task: BackgroundTask, func: Callable, args, kwargs):
+        if task.cancelled:
+            self._results.put((task, None, None))
+            return
+        try:
+            result = func(*args, **kwargs)
+        except Exception as e:
+            self._results.put((task, False, e))
+        else:
+            self._results.put((task, True, result))
+    
+    def _on_done(self, task: BackgroundTask, future: Future):
+        # A call cancelled before it started never reaches _run
+        if future.cancelled():
+            self._results.put((task, None, None))
+    
+    def _poll(self):
+        """Deliver finished results on the Tk thread."""
+        finished = False
+        while True:
+            try:
+                task, succeeded, value = self._results.get_nowait()
+            except queue.Empty:
+                break
+            finished = True
+            self.in_flight.discard(task)
+            if task.cancelled or succeeded is None:
+                continue
+            if task.owner is not None and not task.owner.winfo_exists():
+                continue
+            callback = task.on_success if succeeded else task.on_error
+            if callback:
+                callback(value)
+        if finished:
+            self._notify()
+        if not self._closed:
+            self.root.after(self.poll_interval, self._poll)
+    
+    def _notify(self):
+        for listener in self.listeners:
+            listener(len(self.in_flight))
+    
+    def shutdown(self):
+        """Cancel pending calls and stop the worker threads."""
+        self._closed = True
+        for task in list(self.in_flight):
+            task.cancel()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+class BusyIndicator(tk.Label):
+    """Label showing how many database calls are in flight."""
+    
+    def __init__(self, parent, worker: DatabaseWorker, **kwargs):
+        kwargs.setdefault("fg", "gray")
+        super().__init__(parent, text="", **kwargs)
+        self.worker = worker
+        worker.listeners.append(self.update_count)
+        self.bind("<Destroy>", lambda e: self._detach(), add="+")
+        self.update_count(len(worker.in_flight))
+    
+    def update_count(self, count: int):
+        self.config(text=f"Working... ({count} pending)" if count else "")
+    
+    def _detach(self):
+        if self.update_count in self.worker.listeners:
+            self.worker.listeners.remove(self.update_count)
+
+def owned_worker(window: tk.Misc, worker: Optional[DatabaseWorker]) -> DatabaseWorker:
+    """Use the shared worker, or start one that shuts down with the window."""
+    if worker is not None:
+        return worker
+    worker = DatabaseWorker(window)
+    window.bind("<Destroy>", lambda e: e.widget is window and worker.shutdown(), add="+")
+    return worker
+
 class BaseForm:
     """Base class for forms with common functionality."""
     
@@ -114,10 +243,242 @@ class BaseForm:
                 elif isinstance(widget, ttk.Combobox):
                     widget.set(str(value))
 
+class EmployeePager:
+    """Keeps the employee rows around the visible range, fetched page by page."""
+    
+    def __init__(self, employee_service: Employee, page_size: int = 50, prefetch_pages: int = 1):
+        self.employee_service = employee_service
+        self.page_size = page_size
+        self.prefetch_pages = prefetch_pages
+        self.total = 0
+        self.pages: Dict[int, List[Dict]] = {}
+    
+    def reset(self):
+        """Drop cached pages and re-count the employees."""
+        self.pages.clear()
+        self.total = self.employee_service.count()
+    
+    def rows(self, start: int, count: int) -> List[Dict]:
+        """Get the rows in [start, start + count), loading only the pages needed.
+        
+        Pages next to the requested range are prefetched and everything else
+        is dropped, so memory stays bounded regardless of the table size.
+        """
+        if self.total == 0 or count <= 0:
+            return []
+        last_page = (self.total - 1) // self.page_size
+        first = start // self.page_size
+        last = min((start + count - 1) // self.page_size, last_page)
+        wanted = range(max(first - self.prefetch_pages, 0),
+                       min(last + self.prefetch_pages, last_page) + 1)
+        
+        for page in wanted:
+            self._load(page)
+        for page in list(self.pages):
+            if page not in wanted:
+                del self.pages[page]
+        
+        rows: List[Dict] = []
+        for page in range(first, last + 1):
+            rows.extend(self.pages[page])
+        offset = start - first * self.page_size
+        return rows[offset:offset + count]
+    
+    def cached_rows(self, start: int, count: int) -> Optional[List[Dict]]:
+        """Get the rows in [start, start + count) if every page is cached, else None."""
+        if self.total == 0 or count <= 0:
+            return []
+        first = start // self.page_size
+        last = min((start + count - 1) // self.page_size, (self.total - 1) // self.page_size)
+        pages = [self.pages.get(page) for page in range(first, last + 1)]
+        if any(page is None for page in pages):
+            return None
+        rows = [row for page in pages for row in page]
+        offset = start - first * self.page_size
+        return rows[offset:offset + count]
+    
+    def _load(self, page: int):
+        """Fetch one page, continuing from the previous page's last ID if cached."""
+        if page in self.pages:
+            return
+        previous = self.pages.get(page - 1)
+        if page == 0:
+            rows = self.employee_service.get_page(None, self.page_size)
+        elif previous:
+            rows = self.employee_service.get_page(previous[-1]['id_number'], self.page_size)
+        else:
+            rows = self.employee_service.get_page_at(page * self.page_size, self.page_size)
+        self.pages[page] = rows
+
+class EmployeeSearchResults:
+    """Search matches, readable through the same interface as EmployeePager."""
+    
+    def __init__(self, employee_service: Employee, query: str, limit: int = 500):
+        self.employee_service = employee_service
+        self.query = query
+        self.limit = limit
+        self.total = 0
+        self.matches: List[Dict] = []
+    
+    def reset(self):
+        """Re-run the search."""
+        self.matches = self.employee_service.search(self.query, self.limit)
+        self.total = len(self.matches)
+    
+    def rows(self, start: int, count: int) -> List[Dict]:
+        """Get the matches in [start, start + count)."""
+        return self.matches[start:start + count]
+    
+    def cached_rows(self, start: int, count: int) -> Optional[List[Dict]]:
+        """Get the matches in [start, start + count); they are all in memory."""
+        return self.rows(start, count)
+
+class VirtualEmployeeList(tk.Frame):
+    """Employee listbox that only fetches and renders the rows in view.
+    
+    With a worker, pages are fetched on a background thread; the rows
+    already cached are shown immediately and missing ones as "Loading...".
+    """
+    
+    def __init__(self, parent, employee_service: Employee, height: int = 8,
+                 worker: Optional[DatabaseWorker] = None, **kwargs):
+        super().__init__(parent, **kwargs)
+        self.height = height
+        self.worker = worker
+        self.employee_service = employee_service
+        self.all_employees = EmployeePager(employee_service, page_size=max(height * 4, 50))
+        self.pager = self.all_employees
+        self.pager_lock = threading.Lock()
+        # Loads that update the view, and prefetches of cached views, are
+        # superseded separately so a prefetch never drops a refresh
+        self.pending: Optional[BackgroundTask] = None
+        self.prefetch: Optional[BackgroundTask] = None
+        self.top = 0
+        self.visible_rows: List[Dict] = []
+        
+        self.listbox = tk.Listbox(self, height=height, exportselection=False)
+        self.scrollbar = tk.Scrollbar(self, orient="vertical", command=self.yview)
+        self.listbox.grid(row=0, column=0, sticky="ew")
+        self.scrollbar.grid(row=0, column=1, sticky="ns")
+        self.columnconfigure(0, weight=1)
+        
+        # The listbox never holds more than one screen of rows, so route
+        # wheel and keyboard scrolling through yview
+        self.listbox.bind("<MouseWheel>", lambda e: self._scroll(-1 if e.delta > 0 else 1))
+        self.listbox.bind("<Button-4>", lambda e: self._scroll(-1))
+        self.listbox.bind("<Button-5>", lambda e: self._scroll(1))
+        self.listbox.bind("<Prior>", lambda e: self._scroll(-self.height))
+        self.listbox.bind("<Next>", lambda e: self._scroll(self.height))
+    
+    def refresh(self):
+        """Reload the employee count and re-render the current position."""
+        pager = self.pager
+        def reload():
+            with self.pager_lock:
+                pager.reset()
+                top = min(self.top, max(pager.total - self.height, 0))
+                return top, pager.rows(top, self.height)
+        self._fetch(reload)
+    
+    def search(self, query: str):
+        """Show only the employees matching query, or everyone if it is blank."""
+        if query.strip():
+            self.pager = EmployeeSearchResults(self.employee_service, query)
+        else:
+            self.pager = self.all_employees
+        self.top = 0
+        self.refresh()
+    
+    def yview(self, *args):
+        """Scrollbar callback: ('moveto', fraction) or ('scroll', n, units|pages)."""
+        if not args:
+            return
+        if args[0] == "moveto":
+            top = int(float(args[1]) * self.pager.total)
+        elif args[0] == "scroll":
+            step = self.height if args[2] == "pages" else 1
+            top = self.top + int(args[1]) * step
+        else:
+            return
+        self._move_to(top)
+    
+    def _scroll(self, rows: int):
+        self._move_to(self.top + rows)
+        return "break"
+    
+    def _move_to(self, top: int):
+        top = max(0, min(top, self.pager.total - self.height))
+        if top != self.top:
+            self.top = top
+            self.render()
+    
+    def render(self):
+        """Show the rows from self.top, fetching missing pages."""
+        top, pager = self.top, self.pager
+        cached = pager.cached_rows(top, self.height)
+        if cached is not None:
+            self._show(top, cached)
+        
+        def load():
+            # Also prefetches the neighbouring pages when the view is cached
+            with self.pager_lock:
+                return top, pager.rows(top, self.height)
+        self._fetch(load, update_view=cached is None)
+    
+    def _fetch(self, load: Callable, update_view: bool = True):
+        """Run a page load, superseding any earlier load of the same kind.
+        
+        A load that updates the view also supersedes prefetches, since it
+        prefetches itself; a prefetch leaves a pending view update alone.
+        """
+        if self.prefetch:
+            self.prefetch.cancel()
+        if update_view and self.pending:
+            self.pending.cancel()
+        if self.worker is None:
+            result = load()
+            if update_view:
+                self._show(*result)
+            return
+        if update_view:
+            self.listbox.delete(0, tk.END)
+            self.listbox.insert(tk.END, "Loading...")
+        if update_view:
+            self.pending = self.worker.submit(load, on_success=lambda result: self._show(*result),
+                                              owner=self)
+        else:
+            self.prefetch = self.worker.submit(load, owner=self)
+    
+    def _show(self, top: int, rows: List[Dict]):
+        """Render fetched rows and update the scrollbar."""
+        self.top = top
+        self.visible_rows = rows
+        self.listbox.delete(0, tk.END)
+        for employee in rows:
+            display_text = f"ID: {employee['id_number']} - {employee['full_name']} ({employee['designation']})"
+            self.listbox.insert(tk.END, display_text)
+        
+        total = self.pager.total
+        if total:
+            self.scrollbar.set(top / total, min(top + self.height, total) / total)
+        else:
+            self.scrollbar.set(0, 1)
+    
+    def selected(self) -> Optional[Dict]:
+        """Get the employee row of the current selection, if any."""
+        selection = self.listbox.curselection()
+        if not selection or selection[0] >= len(self.visible_rows):
+            return None
+        return self.visible_rows[selection[0]]
+
 class EmployeeManagementWindow:
     """Employee management interface with proper separation of concerns."""
     
-    def __init__(self, parent, db_manager: DatabaseManager):
+    # Milliseconds to wait after the last keystroke before searching
+    SEARCH_DELAY = 200
+    
+    def __init__(self, parent, db_manager: DatabaseManager,
+                 worker: Optional[DatabaseWorker] = None):
         self.parent = parent
         self.db_manager = db_manager
         self.employee_service = Employee(db_manager)
@@ -125,6 +486,8 @@ class EmployeeManagementWindow:
         self.window = tk.Toplevel(parent)
         self.window.title('Employee Management')
         self.window.geometry("500x600")
+        self.worker = owned_worker(self.window, worker)
+        self.search_job: Optional[str] = None
         
         self.setup_ui()
     
@@ -139,14 +502,22 @@ class EmployeeManagementWindow:
         list_frame = tk.LabelFrame(self.window, text="Employees", padx=10, pady=10)
         list_frame.grid(row=1, column=0, columnspan=3, sticky="ew", padx=10, pady=5)
         
-        # Employee listbox with scrollbar
-        self.employee_listbox = tk.Listbox(list_frame, height=8)
-        scrollbar = tk.Scrollbar(list_frame, orient="vertical")
-        self.employee_listbox.config(yscrollcommand=scrollbar.set)
-        scrollbar.config(command=self.employee_listbox.yview)
+        # Search as you type, by name, designation or ID
+        search_frame = tk.Frame(list_frame)
+        search_frame.grid(row=0, column=0, sticky="ew", pady=(0, 5))
+        tk.Label(search_frame, text="Search:").pack(side=tk.LEFT)
+        self.search_var = tk.StringVar()
+        self.search_var.trace_add("write", lambda *args: self.schedule_search())
+        tk.Entry(search_frame, textvariable=self.search_var).pack(
+            side=tk.LEFT, fill=tk.X, expand=True, padx=5
+        )
         
-        self.employee_listbox.grid(row=0, column=0, sticky="ew")
-        scrollbar.grid(row=0, column=1, sticky="ns")
+        # Virtualized employee list: only the visible page is fetched
+        self.employee_list = VirtualEmployeeList(
+            list_frame, self.employee_service, height=8, worker=self.worker
+        )
+        self.employee_list.grid(row=1, column=0, sticky="ew")
+        list_frame.columnconfigure(0, weight=1)
         
         # Buttons frame
         buttons_frame = tk.Frame(self.window)
@@ -159,44 +530,78 @@ class EmployeeManagementWindow:
         tk.Button(buttons_frame, text="Refresh", 
                  command=self.refresh_employee_list, width=15).pack(side=tk.LEFT, padx=5)
         
+        BusyIndicator(self.window, self.worker).grid(row=3, column=0, columnspan=3)
+        
         # Load initial data
         self.refresh_employee_list()
     
     def refresh_employee_list(self):
         """Refresh the employee list."""
-        self.employee_listbox.delete(0, tk.END)
-        employees = self.employee_service.get_all()
-        for employee in employees:
-            display_text = f"ID: {employee['id_number']} - {employee['full_name']} ({employee['designation']})"
-            self.employee_listbox.insert(tk.END, display_text)
+        self.employee_list.refresh()
+    
+    def schedule_search(self):
+        """Debounce typing: search once the query has been still for SEARCH_DELAY."""
+        if self.search_job is not None:
+            self.window.after_cancel(self.search_job)
+        self.search_job = self.window.after(self.SEARCH_DELAY, self.run_search)
+    
+    def run_search(self):
+        """Filter the employee list by the current query."""
+        self.search_job = None
+        self.employee_list.search(self.search_var.get())
     
     def show_add_form(self):
         """Show form to add new employee."""
-        form = EmployeeForm(self.window, "Add Employee", self.employee_service)
+        form = EmployeeForm(self.window, "Add Employee", self.employee_service,
+                            worker=self.worker)
         form.on_success = lambda: self.refresh_employee_list()
     
     def show_edit_form(self):
         """Show form to edit selected employee."""
-        selection = self.employee_listbox.curselection()
-        if not selection:
+        selected = self.employee_list.selected()
+        if not selected:
             messagebox.showwarning("No Selection", "Please select an employee to edit")
             return
         
-        # Extract employee ID from the selected text
-        selected_text = self.employee_listbox.get(selection[0])
-        employee_id = int(selected_text.split(" - ")[0].replace("ID: ", ""))
-        
-        employee_data = self.employee_service.get_by_id(employee_id)
-        if employee_data:
-            form = EmployeeForm(self.window, "Edit Employee", self.employee_service, employee_data)
-            form.on_success = lambda: self.refresh_employee_list()
+        # Fetch the full, current row off the UI thread
+        self.worker.submit(
+            self.employee_service.get_by_id, selected['id_number'],
+            on_success=self.open_edit_form,
+            on_error=lambda error: messagebox.showerror("Error", f"An error occurred: {error}"),
+            owner=self.window
+        )
+    
+    def open_edit_form(self, employee_data: Optional[Dict]):
+        """Open the edit form once the employee has been fetched."""
+        if not employee_data:
+            messagebox.showwarning("Not Found", "The selected employee no longer exists")
+            self.refresh_employee_list()
+            return
+        form = EmployeeForm(self.window, "Edit Employee", self.employee_service,
+                            employee_data, worker=self.worker)
+        form.on_success = lambda: self.refresh_employee_list()
+
+def save_employee_record(employee_service: Employee, data: Dict,
+                         original_id: Optional[int] = None) -> Optional[bool]:
+    """Create (original_id None) or update an employee; runs on the worker thread.
+    
+    Returns None without saving if the ID belongs to another employee,
+    otherwise whether the save succeeded.
+    """
+    if data['id_number'] != original_id and employee_service.get_by_id(data['id_number']) is not None:
+        return None
+    if original_id is None:
+        return employee_service.create(data)
+    return employee_service.update(original_id, data)
 
 class EmployeeForm(BaseForm):
     """Form for adding/editing employees."""
     
     def __init__(self, parent, title: str, employee_service: Employee, 
-                 employee_data: Optional[Dict] = None):
+                 employee_data: Optional[Dict] = None,
+                 worker: Optional[DatabaseWorker] = None):
         super().__init__(parent, title, "400x500")
+        self.worker = owned_worker(self.window, worker)
         self.employee_service = employee_service
         self.employee_data = employee_data
         self.is_edit_mode = employee_data is not None
@@ -225,7 +630,7 @@ class EmployeeForm(BaseForm):
         
         # Buttons
         button_text = "Update Employee" if self.is_edit_mode else "Add Employee"
-        self.add_button(button_text, self.save_employee)
+        self.save_button = self.add_button(button_text, self.save_employee)
         self.add_button("Cancel", self.window.destroy)
     
     def validate_required(self, value: str) -> tuple[bool, str]:
@@ -242,12 +647,7 @@ class EmployeeForm(BaseForm):
             employee_id = int(value)
             if employee_id <= 0:
                 return False, "Employee ID must be positive"
-            
-            # Check for duplicates in add mode
-            if not self.is_edit_mode:
-                existing = self.employee_service.get_by_id(employee_id)
-                if existing:
-                    return False, "Employee ID already exists"
+            # Uniqueness is checked on the worker thread when saving
         except ValueError:
             return False, "Employee ID must be a number"
         return True, ""
@@ -309,31 +709,45 @@ class EmployeeForm(BaseForm):
             messagebox.showerror("Validation Error", error_msg)
             return
         
-        # Save to database
-        try:
-            if self.is_edit_mode:
-                original_id = self.employee_data['id_number']
-                success = self.employee_service.update(original_id, data)
-                action = "updated"
-            else:
-                success = self.employee_service.create(data)
-                action = "created"
-            
-            if success:
-                messagebox.showinfo("Success", f"Employee {action} successfully!")
-                if self.on_success:
-                    self.on_success()
-                self.window.destroy()
-            else:
-                messagebox.showerror("Error", f"Failed to {action.replace('d', '')} employee")
-                
-        except Exception as e:
-            messagebox.showerror("Error", f"An error occurred: {str(e)}")
+        # Save to database off the UI thread
+        if self.is_edit_mode:
+            # The form does not edit attendance, so keep the stored value
+            data['attendance'] = self.employee_data.get('attendance', 0)
+            original_id, action = self.employee_data['id_number'], "update"
+        else:
+            original_id, action = None, "create"
+        
+        self.save_button.config(state=tk.DISABLED)
+        self.worker.submit(
+            save_employee_record, self.employee_service, data, original_id,
+            on_success=lambda success: self.on_saved(success, action),
+            on_error=self.on_save_error,
+            owner=self.window
+        )
+    
+    def on_saved(self, success: Optional[bool], action: str):
+        """Handle the result of a background save (None: the ID is taken)."""
+        self.save_button.config(state=tk.NORMAL)
+        if success is None:
+            messagebox.showerror("Validation Error", "Employee ID already exists")
+        elif success:
+            messagebox.showinfo("Success", f"Employee {action}d successfully!")
+            if self.on_success:
+                self.on_success()
+            self.window.destroy()
+        else:
+            messagebox.showerror("Error", f"Failed to {action} employee")
+    
+    def on_save_error(self, error: Exception):
+        """Handle an unexpected exception from a background save."""
+        self.save_button.config(state=tk.NORMAL)
+        messagebox.showerror("Error", f"An error occurred: {str(error)}")
 
 class SectorManagementWindow:
     """Sector/Designation management interface."""
     
-    def __init__(self, parent, db_manager: DatabaseManager):
+    def __init__(self, parent, db_manager: DatabaseManager,
+                 worker: Optional[DatabaseWorker] = None):
         self.parent = parent
         self.db_manager = db_manager
         self.sector_service = Sector(db_manager)
@@ -341,6 +755,7 @@ class SectorManagementWindow:
         self.window = tk.Toplevel(parent)
         self.window.title('Sector Management')
         self.window.geometry("450x500")
+        self.worker = owned_worker(self.window, worker)
         
         self.setup_ui()
     
@@ -391,8 +806,10 @@ class SectorManagementWindow:
         self.sector_wage_entry = tk.Entry(form_frame)
         self.sector_wage_entry.grid(row=2, column=1, sticky="ew", padx=5, pady=5)
         
-        tk.Button(form_frame, text="Add", command=self.quick_add_sector).grid(
-            row=3, column=0, columnspan=2, pady=10)
+        self.quick_add_button = tk.Button(form_frame, text="Add", command=self.quick_add_sector)
+        self.quick_add_button.grid(row=3, column=0, columnspan=2, pady=10)
+        
+        BusyIndicator(self.window, self.worker).grid(row=4, column=0, columnspan=3)
         
         # Load initial data
         self.refresh_sector_list()
@@ -442,14 +859,30 @@ class SectorManagementWindow:
             messagebox.showerror("Error", "Invalid numeric values")
             return
         
-        # Save
-        if self.sector_service.create(data):
+        # Save off the UI thread
+        self.quick_add_button.config(state=tk.DISABLED)
+        self.worker.submit(
+            self.sector_service.create, data,
+            on_success=self.on_sector_created,
+            on_error=self.on_sector_error,
+            owner=self.window
+        )
+    
+    def on_sector_created(self, success: bool):
+        """Handle the result of a background sector create."""
+        self.quick_add_button.config(state=tk.NORMAL)
+        if success:
             messagebox.showinfo("Success", "Sector created successfully!")
             self.clear_quick_form()
             self.refresh_sector_list()
         else:
             messagebox.showerror("Error", "Failed to create sector")
     
+    def on_sector_error(self, error: Exception):
+        """Handle an unexpected exception from a background sector create."""
+        self.quick_add_button.config(state=tk.NORMAL)
+        messagebox.showerror("Error", f"An error occurred: {str(error)}")
+    
     def clear_quick_form(self):
         """Clear the quick add form."""
         self.sector_id_entry.delete(0, tk.END)
@@ -459,7 +892,8 @@ class SectorManagementWindow:
 class ProjectManagementWindow:
     """Project management interface."""
     
-    def __init__(self, parent, db_manager: DatabaseManager):
+    def __init__(self, parent, db_manager: DatabaseManager,
+                 worker: Optional[DatabaseWorker] = None):
         self.parent = parent
         self.db_manager = db_manager
         self.project_service = Project(db_manager)
@@ -467,6 +901,7 @@ class ProjectManagementWindow:
         self.window = tk.Toplevel(parent)
         self.window.title('Project Management')
         self.window.geometry("600x700")
+        self.worker = owned_worker(self.window, worker)
         
         self.setup_ui()
     
@@ -482,13 +917,14 @@ class ProjectManagementWindow:
         tk.Label(self.window, text="Project management functionality will be implemented here").pack()
 
 # Factory function to create management windows
-def create_management_window(window_type: str, parent, db_manager: DatabaseManager):
+def create_management_window(window_type: str, parent, db_manager: DatabaseManager,
+                             worker: Optional[DatabaseWorker] = None):
     """Factory function to create management windows."""
     if window_type == "employees":
-        return EmployeeManagementWindow(parent, db_manager)
+        return EmployeeManagementWindow(parent, db_manager, worker)
     elif window_type == "sectors":
-        return SectorManagementWindow(parent, db_manager)
+        return SectorManagementWindow(parent, db_manager, worker)
     elif window_type == "projects":
-        return ProjectManagementWindow(parent, db_manager)
+        return ProjectManagementWindow(parent, db_manager, worker)
     else:
         raise ValueError(f"Unknown window type: {window_type}")
\ No newline at end of file